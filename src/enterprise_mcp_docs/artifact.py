@@ -0,0 +1,389 @@
+"""Portable index artifacts.
+
+An artifact packages a saved :class:`~enterprise_mcp_docs.index.DocumentIndex`
+so that it can be built once (where the documentation sites are
+reachable) and installed anywhere, including air-gapped hosts and
+container images.
+
+An artifact is a tar file named ``enterprise-mcp-docs-index-<version>.tar``
+containing:
+
+* ``artifact.json`` - format, version, creation time, per-tool statistics
+  and text store codecs, and the SHA-256 of every file,
+* the index files themselves (``manifest.json``, gzip-compressed
+  ``shards/<tool>.<gen>.json.gz`` and compressed text stores
+  ``shards/<tool>.<gen>.text``).
+
+A ``.sha256`` sidecar in ``sha256sum`` format covers the whole tar file.
+Installation verifies both levels of checksums and extracts the complete
+index before moving it into place, so a running deployment never sees a
+partial index (see :func:`install_artifact` for how an interrupted swap is
+recovered).
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from urllib.parse import urlparse
+
+import httpx
+
+from . import __version__
+from .index import INDEX_FORMAT, READABLE_INDEX_FORMATS, DocumentIndex, lock_index
+from .textstore import MISSING_ZSTD, codec_available
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 1
+ARTIFACT_METADATA = "artifact.json"
+ARTIFACT_PREFIX = "enterprise-mcp-docs-index-"
+ARTIFACT_SUFFIX = ".tar"
+CHECKSUM_SUFFIX = ".sha256"
+
+_CHUNK_SIZE = 1 << 20
+
+
+class ArtifactError(Exception):
+    """Raised for missing, corrupt or incompatible index artifacts."""
+
+
+def artifact_name(version: str) -> str:
+    return f"{ARTIFACT_PREFIX}{version}{ARTIFACT_SUFFIX}"
+
+
+def default_version() -> str:
+    """Version label for a new artifact (UTC build timestamp)."""
+    return datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_artifact(
+    index: DocumentIndex,
+    output_dir: Union[str, Path],
+    version: Optional[str] = None,
+    codec: Optional[str] = None,
+) -> Path:
+    """Package ``index`` as an artifact in ``output_dir``.
+
+    Args:
+        index: The index to package
+        output_dir: Directory receiving the artifact and its checksum
+        version: Version label (defaults to the UTC build timestamp)
+        codec: Text store codec; the default (zlib) loads on every host
+
+    Returns:
+        Path of the artifact
+    """
+    version = version or default_version()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / artifact_name(version)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A subdirectory, so that the index lock file is cleaned up too
+        staging = Path(tmp) / "index"
+        index.save(staging, codec)
+        files = {
+            file.relative_to(staging).as_posix(): {
+                "sha256": _sha256_file(file),
+                "size": file.stat().st_size,
+            }
+            for file in sorted(staging.rglob("*"))
+            if file.is_file()
+        }
+        metadata = {
+            "format": ARTIFACT_FORMAT,
+            "index_format": INDEX_FORMAT,
+            "version": version,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "package_version": __version__,
+            "tools": index.stats(),
+            "text_codecs": DocumentIndex.text_codecs(staging),
+            "files": files,
+        }
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tarfile.open(tmp_path, "w") as tar:
+            data = json.dumps(metadata, indent=2).encode("utf-8")
+            info = tarfile.TarInfo(ARTIFACT_METADATA)
+            info.size = len(data)
+            info.mtime = int(datetime.now(timezone.utc).timestamp())
+            tar.addfile(info, io.BytesIO(data))
+            for name in files:
+                tar.add(staging / name, arcname=name, recursive=False)
+        os.replace(tmp_path, path)
+
+    checksum = _sha256_file(path)
+    Path(str(path) + CHECKSUM_SUFFIX).write_text(f"{checksum}  {path.name}\n")
+    logger.info("Built index artifact %s (%d tools)", path, len(index.shards))
+    return path
+
+
+def read_metadata(path: Union[str, Path]) -> Dict[str, Any]:
+    """Read ``artifact.json`` from an artifact without extracting it."""
+    try:
+        with tarfile.open(path, "r") as tar:
+            member = tar.extractfile(ARTIFACT_METADATA)
+            if member is None:
+                raise KeyError(ARTIFACT_METADATA)
+            metadata = json.load(member)
+    except (OSError, KeyError, tarfile.TarError, ValueError) as e:
+        raise ArtifactError(f"Not a valid index artifact: {path} ({e})") from e
+
+    if metadata.get("format") != ARTIFACT_FORMAT:
+        raise ArtifactError(f"Unsupported artifact format {metadata.get('format')}")
+    if metadata.get("index_format") not in READABLE_INDEX_FORMATS:
+        raise ArtifactError(
+            f"Artifact index format {metadata.get('index_format')} is not "
+            f"supported (expected {INDEX_FORMAT})"
+        )
+    unreadable = sorted(
+        name
+        for name, codec in metadata.get("text_codecs", {}).items()
+        if not codec_available(codec)
+    )
+    if unreadable:
+        raise ArtifactError(
+            f"Artifact {metadata.get('version')} cannot be installed here: "
+            f"shards {', '.join(unreadable)} use the {MISSING_ZSTD}"
+        )
+    return metadata
+
+
+def _check_sidecar(path: Path) -> None:
+    sidecar = Path(str(path) + CHECKSUM_SUFFIX)
+    if not sidecar.exists():
+        logger.warning("No checksum file for %s, relying on file checksums", path)
+        return
+    expected = sidecar.read_text().split()[0]
+    if _sha256_file(path) != expected:
+        raise ArtifactError(f"Checksum mismatch for {path}")
+
+
+def _extract_verified(path: Path, metadata: Dict[str, Any], target: Path) -> None:
+    """Extract the files listed in ``metadata``, checking their digests."""
+    files = metadata.get("files", {})
+    seen = set()
+    with tarfile.open(path, "r") as tar:
+        for member in tar:
+            if member.name == ARTIFACT_METADATA:
+                continue
+            expected = files.get(member.name)
+            parts = Path(member.name).parts
+            if (
+                expected is None
+                or not member.isfile()
+                or Path(member.name).is_absolute()
+                or ".." in parts
+            ):
+                raise ArtifactError(f"Unexpected entry in artifact: {member.name}")
+
+            destination = target / member.name
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            digest = hashlib.sha256()
+            source = tar.extractfile(member)
+            with open(destination, "wb") as out:
+                for block in iter(lambda: source.read(_CHUNK_SIZE), b""):
+                    digest.update(block)
+                    out.write(block)
+            if digest.hexdigest() != expected["sha256"]:
+                raise ArtifactError(f"Checksum mismatch for {member.name}")
+            seen.add(member.name)
+
+    missing = set(files) - seen
+    if missing:
+        raise ArtifactError(f"Artifact is missing files: {sorted(missing)}")
+
+
+def verify_artifact(path: Union[str, Path]) -> Dict[str, Any]:
+    """Verify an artifact's checksums and format.
+
+    Returns:
+        The artifact metadata
+
+    Raises:
+        ArtifactError: If the artifact is corrupt or incompatible
+    """
+    path = Path(path)
+    _check_sidecar(path)
+    metadata = read_metadata(path)
+    with tempfile.TemporaryDirectory() as tmp:
+        _extract_verified(path, metadata, Path(tmp))
+    return metadata
+
+
+def install_artifact(
+    path: Union[str, Path], index_path: Union[str, Path]
+) -> Dict[str, Any]:
+    """Install an artifact as the index at ``index_path``.
+
+    The artifact is extracted and verified next to ``index_path`` and then
+    swapped in with two renames: the existing index is moved aside to
+    ``<index_path>.previous``, then the new one takes its place. Between
+    the renames ``index_path`` briefly does not exist; a running server
+    keeps serving the index it has loaded. If the process dies in that
+    gap, the next install (or :func:`recover_index`) restores the previous
+    index first. Recovery and the swap run under the index lock (see
+    :func:`~enterprise_mcp_docs.index.lock_index`), which index saves take
+    as well; servers only read.
+
+    Returns:
+        The artifact metadata
+    """
+    path = Path(path)
+    index_path = Path(index_path)
+    _check_sidecar(path)
+    metadata = read_metadata(path)
+
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".incoming-", dir=index_path.parent))
+    try:
+        _extract_verified(path, metadata, staging)
+        try:
+            # Artifacts from before codecs were recorded in the metadata
+            DocumentIndex.check_codecs(staging)
+        except ValueError as e:
+            raise ArtifactError(str(e)) from e
+        (staging / ARTIFACT_METADATA).write_text(json.dumps(metadata, indent=2))
+
+        with lock_index(index_path):
+            _restore_previous(index_path)
+            previous = _previous_path(index_path)
+            if previous.exists():
+                shutil.rmtree(previous)
+            if index_path.exists():
+                os.replace(index_path, previous)
+            os.replace(staging, index_path)
+            shutil.rmtree(previous, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    logger.info("Installed index artifact %s into %s", metadata["version"], index_path)
+    return metadata
+
+
+def _previous_path(index_path: Path) -> Path:
+    return index_path.with_name(index_path.name + ".previous")
+
+
+def recover_index(index_path: Union[str, Path]) -> bool:
+    """Restore the index moved aside by an interrupted :func:`install_artifact`.
+
+    Takes the index lock, so it never interferes with an install in
+    progress.
+
+    Returns:
+        True if ``<index_path>.previous`` was moved back into place
+    """
+    index_path = Path(index_path)
+    with lock_index(index_path):
+        return _restore_previous(index_path)
+
+
+def _restore_previous(index_path: Path) -> bool:
+    """Move ``<index_path>.previous`` back; the index lock must be held."""
+    previous = _previous_path(index_path)
+    if index_path.exists() or not previous.is_dir():
+        return False
+    os.replace(previous, index_path)
+    logger.warning("Restored %s after an interrupted index install", index_path)
+    return True
+
+
+def installed_artifact(index_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """Metadata of the artifact the index at ``index_path`` came from, if any."""
+    metadata_path = Path(index_path) / ARTIFACT_METADATA
+    if not metadata_path.exists():
+        return None
+    return json.loads(metadata_path.read_text())
+
+
+def _download(url: str, destination: Path) -> None:
+    with httpx.stream("GET", url, follow_redirects=True, timeout=60) as response:
+        response.raise_for_status()
+        with open(destination, "wb") as out:
+            for block in response.iter_bytes(_CHUNK_SIZE):
+                out.write(block)
+
+
+def pull_artifact(source: str, store_dir: Union[str, Path]) -> Path:
+    """Copy an artifact into the local artifact store and verify it.
+
+    Args:
+        source: Local path, ``file://`` URL or HTTP(S) URL of the artifact
+        store_dir: Local artifact store
+
+    Returns:
+        Path of the verified artifact in ``store_dir``
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    parsed = urlparse(source)
+    name = Path(parsed.path).name
+    if not name.endswith(ARTIFACT_SUFFIX):
+        raise ArtifactError(f"Not an index artifact: {source}")
+    destination = store_dir / name
+    sidecar = Path(str(destination) + CHECKSUM_SUFFIX)
+
+    copied = False
+    try:
+        if parsed.scheme in ("http", "https"):
+            copied = True
+            _download(source, destination)
+            try:
+                _download(source + CHECKSUM_SUFFIX, sidecar)
+            except httpx.HTTPError:
+                logger.warning("No checksum file published for %s", source)
+        else:
+            local = Path(parsed.path if parsed.scheme == "file" else source)
+            if not local.is_file():
+                raise ArtifactError(f"Artifact not found: {source}")
+            if local.resolve() != destination.resolve():
+                copied = True
+                shutil.copyfile(local, destination)
+                local_sidecar = Path(str(local) + CHECKSUM_SUFFIX)
+                if local_sidecar.exists():
+                    shutil.copyfile(local_sidecar, sidecar)
+        verify_artifact(destination)
+    except (ArtifactError, OSError, httpx.HTTPError):
+        if copied:
+            for path in (destination, sidecar):
+                if path.exists():
+                    path.unlink()
+        raise
+    return destination
+
+
+def find_artifact(reference: Union[str, Path], store_dir: Union[str, Path]) -> Path:
+    """Resolve an artifact path, version label or ``latest`` in the store."""
+    path = Path(reference)
+    if path.is_file():
+        return path
+
+    store_dir = Path(store_dir)
+    if str(reference) == "latest":
+        candidates = sorted(store_dir.glob(f"{ARTIFACT_PREFIX}*{ARTIFACT_SUFFIX}"))
+        if not candidates:
+            raise ArtifactError(f"No artifacts in {store_dir}")
+        return max(candidates, key=lambda p: p.stat().st_mtime)
+
+    path = store_dir / artifact_name(str(reference))
+    if not path.is_file():
+        raise ArtifactError(f"Artifact not found: {reference}")
+    return path
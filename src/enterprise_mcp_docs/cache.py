@@ -0,0 +1,287 @@
+"""Result cache backed by a shared Redis pool with a local fallback.
+
+Every entry is kept in a small in-process LRU and, when Redis is
+reachable, in Redis so that several server processes share results.
+Redis is strictly an accelerator:
+
+* each Redis operation is bounded by a short timeout,
+* writes are sent in the background so tool calls never wait for them,
+* batches (multi-key lookups, bulk writes) use a single pipelined
+  round trip,
+* when Redis fails the cache switches to local-only mode immediately
+  and reconnects in the background with exponential backoff.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # pragma: no cover - redis is optional at runtime
+    aioredis = None
+
+    class RedisError(Exception):  # type: ignore[no-redef]
+        """Placeholder when the redis package is not installed."""
+
+
+logger = logging.getLogger(__name__)
+
+# Errors that switch the cache to local-only mode
+REDIS_ERRORS = (RedisError, OSError, asyncio.TimeoutError)
+
+
+class LocalCache:
+    """In-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def resize(self, max_entries: int) -> None:
+        """Change the capacity, evicting least recently used entries."""
+        self.max_entries = max_entries
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class ResultCache:
+    """Two-level (local LRU + Redis) cache for JSON-serializable values."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, client: Any = None):
+        """Initialize the cache.
+
+        Args:
+            config: The ``cache`` configuration section
+            client: Redis client to use instead of creating a pool from
+                ``redis_url`` (mainly for tests)
+        """
+        self.config = config or {}
+        self.prefix = self.config.get("prefix", "mcp_docs:")
+        self.ttl = self.config.get("ttl", 3600)
+        self.operation_timeout = self.config.get("operation_timeout", 0.05)
+        self.reconnect_interval = self.config.get("reconnect_interval", 1.0)
+        self.max_reconnect_interval = self.config.get("max_reconnect_interval", 60.0)
+
+        self.local = LocalCache(self.config.get("local_max_entries", 1024))
+        self.client = client
+        self.available = client is not None
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+        self._retry_at = 0.0
+        self._backoff = self.reconnect_interval
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        """True if a Redis backend is configured at all."""
+        return self.client is not None
+
+    def _create_client(self) -> Any:
+        if aioredis is None:
+            logger.info("redis package not installed, using local cache only")
+            return None
+        url = self.config.get("redis_url")
+        if not url or not self.config.get("enabled", True):
+            return None
+        return aioredis.Redis.from_url(
+            url,
+            db=self.config.get("db", 0),
+            password=self.config.get("password") or None,
+            max_connections=self.config.get("max_connections", 10),
+            socket_connect_timeout=self.config.get("connect_timeout", 1.0),
+            socket_timeout=self.config.get("socket_timeout", 1.0),
+            health_check_interval=30,
+        )
+
+    async def connect(self) -> bool:
+        """Create the connection pool and check that Redis answers.
+
+        Never raises: an unreachable Redis leaves the cache in local-only
+        mode with a background reconnect scheduled for the next access.
+
+        Returns:
+            True if Redis is available
+        """
+        if self.client is None:
+            self.client = self._create_client()
+        if self.client is None:
+            return False
+        await self._ping()
+        if self.available:
+            logger.info("🗄️  Connected to Redis cache")
+        else:
+            logger.warning("⚠️  Redis unavailable, using local cache only")
+        return self.available
+
+    async def close(self) -> None:
+        """Flush pending writes and release the pool."""
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self.client is not None:
+            # redis>=5.0.1 renamed close() to aclose()
+            closer = getattr(self.client, "aclose", None) or self.client.close
+            try:
+                await closer()
+            except REDIS_ERRORS:
+                pass
+        self.available = False
+
+    def key(self, *parts: Any) -> str:
+        """Build a namespaced cache key."""
+        return self.prefix + ":".join(str(part) for part in parts)
+
+    async def _ping(self) -> None:
+        try:
+            await asyncio.wait_for(
+                self.client.ping(), self.config.get("connect_timeout", 1.0)
+            )
+        except REDIS_ERRORS as e:
+            self._mark_down(e)
+        else:
+            if not self.available:
+                logger.info("Redis cache reconnected")
+            self.available = True
+            self._backoff = self.reconnect_interval
+
+    def _mark_down(self, error: BaseException) -> None:
+        self.errors += 1
+        if self.available:
+            logger.warning("Redis cache error, switching to local cache: %s", error)
+        self.available = False
+        self._retry_at = time.monotonic() + self._backoff
+        self._backoff = min(self._backoff * 2, self.max_reconnect_interval)
+
+    def _use_redis(self) -> bool:
+        """Return True if Redis should be queried now.
+
+        While Redis is down this schedules at most one background
+        reconnect attempt per backoff interval and returns False, so
+        callers never wait for a reconnect.
+        """
+        if self.available:
+            return True
+        if (
+            self.client is not None
+            and time.monotonic() >= self._retry_at
+            and (self._reconnect_task is None or self._reconnect_task.done())
+        ):
+            self._retry_at = time.monotonic() + self._backoff
+            self._reconnect_task = asyncio.create_task(self._ping())
+        return False
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Look up a single value."""
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Look up several values with a single Redis round trip.
+
+        Returns:
+            Mapping of found keys to values (missing keys are omitted)
+        """
+        keys = list(keys)
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for key in keys:
+            value = self.local.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        if missing and self._use_redis():
+            try:
+                raw_values = await asyncio.wait_for(
+                    self.client.mget(missing), self.operation_timeout
+                )
+            except REDIS_ERRORS as e:
+                self._mark_down(e)
+            else:
+                for key, raw in zip(missing, raw_values):
+                    if raw is None:
+                        continue
+                    try:
+                        value = json.loads(raw)
+                    except ValueError:
+                        continue
+                    found[key] = value
+                    self.local.set(key, value, self.ttl)
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a single value (Redis write happens in the background)."""
+        await self.set_many({key: value}, ttl)
+
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Store several values; the Redis write is one background pipeline."""
+        if not items:
+            return
+        ttl = ttl or self.ttl
+        for key, value in items.items():
+            self.local.set(key, value, ttl)
+        if self._use_redis():
+            self._spawn(self._write(items, ttl))
+
+    async def _write(self, items: Dict[str, Any], ttl: int) -> None:
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(key, json.dumps(value), ex=int(ttl))
+                await asyncio.wait_for(pipe.execute(), max(self.operation_timeout, 1.0))
+        except REDIS_ERRORS as e:
+            self._mark_down(e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics, for status output."""
+        if not self.enabled:
+            backend = "local"
+        else:
+            backend = "redis" if self.available else "local (redis unavailable)"
+        return {
+            "backend": backend,
+            "local_entries": len(self.local),
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
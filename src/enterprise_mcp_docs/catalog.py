@@ -0,0 +1,130 @@
+"""Documentation tool catalog.
+
+The catalog combines the configured tools with live statistics from the
+documentation index (documents, chunks, last crawl, index size and
+versions). It is served by the ``list_available_tools`` MCP tool and
+shown by ``enterprise-mcp-docs status``.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from .dedup import version_key
+
+# Shown when a tool's configuration has no ``description``
+TOOL_DESCRIPTIONS: Dict[str, str] = {
+    "elasticsearch": "Search & Analytics - Elasticsearch documentation",
+    "docker": "Containerization - Docker and Docker Compose",
+    "python": "Programming - Python 3.x documentation",
+    "proxmox": "Virtualization - Proxmox VE management",
+    "nessus": "Security - Nessus vulnerability scanning",
+    "topdesk": "Service Management - TopDesk workflows",
+    "confluence": "Collaboration - Confluence documentation",
+    "n8n": "Automation - n8n workflow automation",
+    "ollama": "AI/ML - Ollama model management",
+}
+
+# Versions listed per tool before the list is abbreviated
+MAX_LISTED_VERSIONS = 5
+
+
+def build_catalog(
+    tool_names: Iterable[str],
+    tools_config: Dict[str, Dict[str, Any]],
+    index_stats: Dict[str, Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Build catalog entries for the given tools.
+
+    Args:
+        tool_names: Tools to list, in display order
+        tools_config: The ``tools`` configuration section
+        index_stats: Per-tool index statistics (see
+            :meth:`DocumentIndex.stats` or the index manifest)
+
+    Returns:
+        One entry per tool; indexed tools not in ``tool_names`` are
+        appended
+    """
+    names = list(dict.fromkeys(tool_names))
+    names.extend(name for name in sorted(index_stats) if name not in names)
+
+    entries = []
+    for name in names:
+        tool_config = tools_config.get(name, {})
+        stats = index_stats.get(name, {})
+        entries.append(
+            {
+                "name": name,
+                "description": tool_config.get(
+                    "description", TOOL_DESCRIPTIONS.get(name, name)
+                ),
+                "provider": tool_config.get("provider"),
+                "indexed": bool(stats.get("documents")),
+                "documents": stats.get("documents", 0),
+                "chunks": stats.get("chunks", 0),
+                "duplicates": stats.get("duplicates", 0),
+                "last_crawled": stats.get("last_crawled"),
+                "built_at": stats.get("built_at"),
+                "size_bytes": stats.get("size_bytes"),
+                "versions": stats.get("versions", []),
+            }
+        )
+    return entries
+
+
+def format_size(size: Optional[int]) -> str:
+    """Human-readable byte count."""
+    if size is None:
+        return "unknown size"
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def format_timestamp(timestamp: Optional[float]) -> str:
+    if not timestamp:
+        return "unknown"
+    moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return moment.strftime("%Y-%m-%d %H:%M UTC")
+
+
+def describe_entry(entry: Dict[str, Any]) -> str:
+    """One-line index summary for a catalog entry."""
+    if not entry["indexed"]:
+        return (
+            f"Not crawled yet - run `enterprise-mcp-docs crawl --tool {entry['name']}`"
+        )
+
+    parts = [
+        f"{entry['documents']} documents",
+        f"{entry['chunks']} chunks",
+        f"crawled {format_timestamp(entry['last_crawled'])}",
+        format_size(entry["size_bytes"]),
+    ]
+    versions = sorted(entry["versions"], key=version_key, reverse=True)
+    if versions:
+        listed = ", ".join(versions[:MAX_LISTED_VERSIONS])
+        if len(versions) > MAX_LISTED_VERSIONS:
+            listed += f" (+{len(versions) - MAX_LISTED_VERSIONS} more)"
+        parts.append(f"versions {listed}")
+    return " · ".join(parts)
+
+
+def render_catalog(entries: List[Dict[str, Any]]) -> str:
+    """Render the catalog as the ``list_available_tools`` response."""
+    lines = ["🛠️  Available Documentation Tools:", ""]
+    for entry in entries:
+        icon = "✅" if entry["indexed"] else "⚠️ "
+        lines.append(f"• **{entry['name']}**: {icon} {entry['description']}")
+        lines.append(f"   {describe_entry(entry)}")
+
+    indexed = sum(1 for entry in entries if entry["indexed"])
+    lines.extend(["", f"📚 {indexed} of {len(entries)} tools indexed"])
+    if indexed < len(entries):
+        lines.append(
+            "   Run `enterprise-mcp-docs crawl --all` to index the remaining tools."
+        )
+    return "\n".join(lines)
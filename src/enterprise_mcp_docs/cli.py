@@ -6,10 +6,24 @@ import sys
 from typing import Optional
 
 import click
+import httpx
 
 from . import __version__
-from .server import MCPServer  # HTTP health server
+from .artifact import (
+    ArtifactError,
+    build_artifact,
+    find_artifact,
+    install_artifact,
+    installed_artifact,
+    pull_artifact,
+)
+from .catalog import build_catalog, describe_entry
+from .config import load_config
+from .crawl import DocumentationCrawler, echo_crawl_result
+from .index import DocumentIndex
+from .loadtest import parse_mix, run_loadtest
 from .mcp_server import EnterpriseMCPServer  # Actual MCP server
+from .server import MCPServer  # HTTP health server
 
 
 @click.group()
@@ -29,12 +43,17 @@ def cli(ctx, config: Optional[str], verbose: bool):
     ctx.obj["verbose"] = verbose
 
     if verbose:
-        click.echo(f"Enterprise MCP Documentation Server v{__version__}")
+        # stderr: stdout may be the MCP stdio transport (serve --mode mcp)
+        click.echo(f"Enterprise MCP Documentation Server v{__version__}", err=True)
 
 
 @cli.command()
-@click.option("--mode", type=click.Choice(["mcp", "http"]), default="mcp", 
-              help="Server mode: 'mcp' for MCP protocol, 'http' for health server")
+@click.option(
+    "--mode",
+    type=click.Choice(["mcp", "http"]),
+    default="mcp",
+    help="Server mode: 'mcp' for MCP protocol, 'http' for health server",
+)
 @click.option("--host", default="0.0.0.0", help="Host to bind to (HTTP mode only)")
 @click.option("--port", default=8000, type=int, help="Port to bind to (HTTP mode only)")
 @click.option("--config", type=click.Path(exists=True), help="Configuration file")
@@ -42,12 +61,12 @@ def cli(ctx, config: Optional[str], verbose: bool):
 @click.pass_context
 def serve(ctx, mode: str, host: str, port: int, config: Optional[str], test_mode: bool):
     """Start the MCP server.
-    
+
     By default starts the MCP protocol server for Claude Code integration.
     Use --mode http for Docker health server mode.
     """
     if ctx.obj["verbose"]:
-        click.echo(f"Starting {mode.upper()} server...")
+        click.echo(f"Starting {mode.upper()} server...", err=True)
 
     if test_mode:
         click.echo("🧪 Running in test mode")
@@ -58,33 +77,27 @@ def serve(ctx, mode: str, host: str, port: int, config: Optional[str], test_mode
         if mode == "mcp":
             # Start the actual MCP protocol server
             import asyncio
-            
-            click.echo("🚀 Starting MCP protocol server...")
-            click.echo("📡 Listening for stdio connections from Claude Code")
-            
-            # TODO: Load config from file if provided
-            server_config = {
-                "tools": {
-                    "elasticsearch": {"provider": "Elasticsearch", "enabled": True},
-                    "docker": {"provider": "Docker", "enabled": True}, 
-                    "python": {"provider": "Python", "enabled": True}
-                }
-            }
-            
+
+            # stdout carries the MCP protocol, so status goes to stderr
+            click.echo("🚀 Starting MCP protocol server...", err=True)
+            click.echo("📡 Listening for stdio connections from Claude Code", err=True)
+
+            server_config = load_config(config or ctx.obj.get("config_file"))
             server = EnterpriseMCPServer(server_config)
             asyncio.run(server.start())
-            
+
         elif mode == "http":
             # Start HTTP health server (for Docker)
             os.environ["HOST"] = host
             os.environ["PORT"] = str(port)
-            
+
             click.echo(f"🚀 Starting HTTP health server on {host}:{port}")
-            server = MCPServer()
+            # The scheduler and memory governor run in this process too
+            server = MCPServer(load_config(config or ctx.obj.get("config_file")))
             server.start()
 
     except KeyboardInterrupt:
-        click.echo("\n🛑 Server stopped by user")
+        click.echo("\n🛑 Server stopped by user", err=True)
         sys.exit(0)
     except Exception as e:
         click.echo(f"❌ Error starting server: {e}", err=True)
@@ -100,36 +113,211 @@ def serve(ctx, mode: str, host: str, port: int, config: Optional[str], test_mode
 def crawl(ctx, tool: Optional[str], crawl_all: bool, verbose: bool, force: bool):
     """Crawl documentation sources.
 
-    NOTE: This is a placeholder implementation.
-    The actual crawling functionality will be implemented in future phases.
+    Pages are discovered from each tool's sitemaps and limited to the
+    configured sections before anything is fetched. Fetched pages are kept
+    in the raw-page cache and the index is rebuilt afterwards.
     """
-    if ctx.obj["verbose"] or verbose:
+    verbose = ctx.obj["verbose"] or verbose
+    if verbose:
         click.echo("🕷️  Documentation crawling functionality")
 
     if not tool and not crawl_all:
         click.echo("❌ Please specify --tool <name> or --all", err=True)
         sys.exit(1)
 
+    import asyncio
+
+    crawler = DocumentationCrawler(load_config(ctx.obj.get("config_file")))
+
     if crawl_all:
-        click.echo("📚 Would crawl all enabled tools:")
-        tools = [
-            "elasticsearch",
-            "docker",
-            "python",
-            "proxmox",
-            "nessus",
-            "topdesk",
-            "confluence",
-            "n8n",
-            "ollama",
-        ]
-        for t in tools:
-            click.echo(f"  • {t}")
+        click.echo("📚 Crawling all enabled tools:")
+        results = asyncio.run(crawler.crawl_all(force=force))
     else:
-        click.echo(f"📖 Would crawl tool: {tool}")
+        if tool not in crawler.supported_tools:
+            click.echo(f"❌ Unsupported tool: {tool}", err=True)
+            sys.exit(1)
+        click.echo(f"📖 Crawling tool: {tool}")
+        results = [asyncio.run(crawler.crawl_tool(tool, force=force))]
 
-    click.echo("⚠️  Note: Crawling functionality not yet implemented")
-    click.echo("   This will be added in the next development phase")
+    for result in results:
+        echo_crawl_result(result, verbose)
+
+
+@cli.command()
+@click.option("--tool", multiple=True, help="Tool to reindex (repeatable)")
+@click.pass_context
+def reindex(ctx, tool):
+    """Rebuild the documentation index from the raw-page cache.
+
+    No pages are downloaded; use this after changing parsing or chunking.
+    """
+    crawler = DocumentationCrawler(load_config(ctx.obj.get("config_file")))
+    tools = list(tool) or crawler.cache.tools()
+
+    if not tools:
+        click.echo("❌ Raw-page cache is empty, run `crawl` first", err=True)
+        sys.exit(1)
+
+    click.echo(f"🔄 Reindexing from cache: {', '.join(tools)}")
+    index = crawler.update_index(tools)
+    for name in tools:
+        stats = index.shards[name].stats()
+        click.echo(
+            f"✅ {name}: {stats['documents']} documents, {stats['chunks']} chunks"
+        )
+
+
+@cli.group("index")
+def index_group():
+    """Build and install portable index artifacts."""
+
+
+@index_group.command("build")
+@click.option(
+    "--source",
+    type=click.Choice(["cache", "index"]),
+    default="cache",
+    show_default=True,
+    help="Build from the raw-page cache or package the current index",
+)
+@click.option("--tool", multiple=True, help="Tool to include (repeatable)")
+@click.option("--output", type=click.Path(), help="Output directory")
+@click.option("--version", "version_label", help="Artifact version label")
+@click.pass_context
+def index_build(ctx, source, tool, output, version_label):
+    """Build a versioned, checksummed index artifact (no network access)."""
+    config = load_config(ctx.obj.get("config_file"))
+    output = output or config["index"]["artifacts_path"]
+
+    if source == "cache":
+        crawler = DocumentationCrawler(config)
+        tools = list(tool) or crawler.cache.tools()
+        if not tools:
+            click.echo("❌ Raw-page cache is empty, run `crawl` first", err=True)
+            sys.exit(1)
+        click.echo(f"🔨 Building index from cache: {', '.join(tools)}")
+        index = crawler.build_index(tools)
+    else:
+        index = DocumentIndex.load(config["index"]["path"])
+        if tool:
+            index.shards = {
+                name: shard for name, shard in index.shards.items() if name in tool
+            }
+        if not index:
+            click.echo(f"❌ No index found at {config['index']['path']}", err=True)
+            sys.exit(1)
+
+    codec = config["index"].get("text_codec")
+    path = build_artifact(index, output, version_label, codec)
+    for name, stats in index.stats().items():
+        click.echo(
+            f"   • {name}: {stats['documents']} documents, {stats['chunks']} chunks"
+        )
+    click.echo(f"📦 Artifact written to {path}")
+
+
+@index_group.command("pull")
+@click.argument("source")
+@click.option("--load", "load_after", is_flag=True, help="Install after pulling")
+@click.pass_context
+def index_pull(ctx, source, load_after):
+    """Copy an artifact from a path or URL into the artifact store."""
+    config = load_config(ctx.obj.get("config_file"))
+    try:
+        path = pull_artifact(source, config["index"]["artifacts_path"])
+    except (ArtifactError, OSError, httpx.HTTPError) as e:
+        click.echo(f"❌ {e}", err=True)
+        sys.exit(1)
+    click.echo(f"✅ Verified artifact {path}")
+
+    if load_after:
+        ctx.invoke(index_load, artifact=str(path))
+
+
+@index_group.command("load")
+@click.argument("artifact", default="latest")
+@click.pass_context
+def index_load(ctx, artifact):
+    """Install an artifact (path, version or 'latest') as the active index."""
+    config = load_config(ctx.obj.get("config_file"))
+    try:
+        path = find_artifact(artifact, config["index"]["artifacts_path"])
+        metadata = install_artifact(path, config["index"]["path"])
+    except (ArtifactError, OSError) as e:
+        click.echo(f"❌ {e}", err=True)
+        sys.exit(1)
+    click.echo(
+        f"✅ Installed index {metadata['version']} "
+        f"({', '.join(sorted(metadata['tools']))}) into {config['index']['path']}"
+    )
+
+
+@cli.command()
+@click.option(
+    "--corpus",
+    type=click.Choice(["synthetic", "index"]),
+    default="synthetic",
+    help="Generated corpus, or the configured index",
+)
+@click.option("--concurrency", default=8, type=int, help="Concurrent calls")
+@click.option(
+    "--duration", type=float, help="Seconds to run (default 30 without --requests)"
+)
+@click.option("--requests", "max_requests", type=int, help="Stop after N calls")
+@click.option(
+    "--mix",
+    default="search=70,get=20,list=10",
+    help="Call mix, e.g. search=70,get=20,list=10",
+)
+@click.option("--documents", default=200, type=int, help="Synthetic docs per tool")
+@click.option("--seed", default=0, type=int, help="Workload random seed")
+@click.option("--json", "json_path", type=click.Path(), help="Write report as JSON")
+@click.option("--server-log", type=click.Path(), help="Write server stderr here")
+@click.pass_context
+def loadtest(
+    ctx,
+    corpus,
+    concurrency,
+    duration,
+    max_requests,
+    mix,
+    documents,
+    seed,
+    json_path,
+    server_log,
+):
+    """Load-test the MCP server end to end over stdio."""
+    try:
+        call_mix = parse_mix(mix)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--mix")
+
+    config = load_config(ctx.obj.get("config_file"))
+    click.echo(
+        f"🏋️  Load testing with {concurrency} concurrent calls "
+        f"({corpus} corpus, {', '.join(f'{k}={v:.0%}' for k, v in call_mix.items())})"
+    )
+    try:
+        report = run_loadtest(
+            config,
+            corpus=corpus,
+            mix=call_mix,
+            concurrency=concurrency,
+            duration=duration or (None if max_requests else 30.0),
+            max_requests=max_requests,
+            documents_per_tool=documents,
+            seed=seed,
+            server_log=server_log,
+        )
+    except Exception as e:
+        click.echo(f"❌ Load test failed: {e}", err=True)
+        sys.exit(1)
+
+    click.echo(report.render())
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+        click.echo(f"💾 Report written to {json_path}")
 
 
 @cli.command()
@@ -160,19 +348,25 @@ def status(ctx):
 
     click.echo()
     click.echo("📚 Documentation Sources:")
-    tools = [
-        "elasticsearch",
-        "docker",
-        "python",
-        "proxmox",
-        "nessus",
-        "topdesk",
-        "confluence",
-        "n8n",
-        "ollama",
+    config = load_config(ctx.obj.get("config_file"))
+    index_path = config["index"]["path"]
+    try:
+        manifest = DocumentIndex.read_manifest(index_path)
+        artifact = installed_artifact(index_path)
+    except (OSError, ValueError) as e:
+        click.echo(f"   ❌ Cannot read index at {index_path}: {e}")
+        manifest, artifact = {}, None
+    if artifact:
+        click.echo(f"   📦 Index artifact: {artifact['version']}")
+
+    tools_config = config.get("tools", {})
+    enabled = [
+        name
+        for name, tool_config in tools_config.items()
+        if tool_config.get("enabled", True)
     ]
-    for tool in tools:
-        click.echo(f"   • {tool}: Not crawled yet")
+    for entry in build_catalog(enabled, tools_config, manifest.get("tools", {})):
+        click.echo(f"   • {entry['name']}: {describe_entry(entry)}")
 
 
 @cli.command("config")
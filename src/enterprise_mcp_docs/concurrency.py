@@ -0,0 +1,192 @@
+"""Admission control for MCP tool calls.
+
+Each tool call must obtain a slot from its client's limiter and from
+its tool's limiter before it runs. When a limiter is full, callers wait
+in a bounded FIFO queue until their deadline; when the queue itself is
+full, or the deadline passes, the call is rejected immediately with
+:class:`Overloaded` instead of piling up more work.
+
+CPU-bound work (query scoring, document lookup) is run in a small thread
+pool via :meth:`AdmissionController.run` so the asyncio loop keeps
+serving cheap calls such as ``list_available_tools`` while heavy calls
+are being computed.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Overloaded(Exception):
+    """Raised when a call is rejected because the server is at capacity."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Limiter:
+    """Concurrency cap with a bounded FIFO wait queue."""
+
+    def __init__(self, name: str, capacity: int, max_queue: int = 32):
+        self.name = name
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.active = 0
+        self.rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    @property
+    def idle(self) -> bool:
+        """No slot is held and nobody is waiting for one."""
+        return self.active == 0 and not self.waiting
+
+    async def acquire(self, deadline: float) -> None:
+        """Take a slot, waiting until ``deadline`` (``time.monotonic()``).
+
+        Raises:
+            Overloaded: If the queue is full or the deadline passes
+        """
+        if self.active < self.capacity and not self.waiting:
+            self.active += 1
+            return
+
+        timeout = deadline - time.monotonic()
+        if self.waiting >= self.max_queue or timeout <= 0:
+            self.rejected += 1
+            raise Overloaded(f"{self.name} is at capacity ({self.capacity} running)")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the deadline passed
+                self.release()
+            waiter.cancel()
+            self.rejected += 1
+            raise Overloaded(
+                f"{self.name} queue wait exceeded {timeout:.1f}s", retry_after=timeout
+            ) from None
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            waiter.cancel()
+            raise
+
+    def release(self) -> None:
+        """Return a slot, handing it directly to the next live waiter."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "capacity": self.capacity,
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionController:
+    """Per-tool and per-client concurrency limits plus a CPU executor."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize the controller.
+
+        Args:
+            config: The ``limits`` configuration section. ``per_tool``
+                maps tool names to caps; tools without a cap (or a cap
+                of 0) bypass admission control entirely.
+        """
+        config = config or {}
+        self.per_tool: Dict[str, int] = config.get("per_tool", {})
+        self.per_client = config.get("per_client", 4)
+        self.max_queue = config.get("max_queue", 32)
+        self.queue_timeout = config.get("queue_timeout", 2.0)
+        self.cpu_workers = config.get("cpu_workers", 4)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.cpu_workers,
+            thread_name_prefix="mcp-cpu",
+        )
+        self._tools: Dict[str, Limiter] = {}
+        # Client limiters only exist while the client has calls in flight,
+        # so the map stays bounded and a reused client id starts afresh
+        self._clients: Dict[str, Limiter] = {}
+
+    def _limiter(
+        self, limiters: Dict[str, Limiter], kind: str, name: str, capacity: int
+    ) -> Limiter:
+        if name not in limiters:
+            limiters[name] = Limiter(f"{kind} '{name}'", capacity, self.max_queue)
+        return limiters[name]
+
+    @asynccontextmanager
+    async def admit(self, tool: str, client: str = "default") -> AsyncIterator[None]:
+        """Hold a client slot and a tool slot for the duration of a call.
+
+        Raises:
+            Overloaded: If either slot cannot be obtained in time
+        """
+        capacity = self.per_tool.get(tool)
+        if not capacity:
+            yield
+            return
+
+        deadline = time.monotonic() + self.queue_timeout
+        limiters = []
+        if self.per_client:
+            limiters.append(
+                self._limiter(self._clients, "client", client, self.per_client)
+            )
+        limiters.append(self._limiter(self._tools, "tool", tool, capacity))
+
+        acquired = []
+        try:
+            for limiter in limiters:
+                await limiter.acquire(deadline)
+                acquired.append(limiter)
+            yield
+        finally:
+            for limiter in reversed(acquired):
+                limiter.release()
+            if (
+                self.per_client
+                and limiters[0].idle
+                and self._clients.get(client) is limiters[0]
+            ):
+                del self._clients[client]
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run CPU-bound ``func`` in the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def stats(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        return {
+            "tools": {name: lim.stats() for name, lim in self._tools.items()},
+            "clients": {name: lim.stats() for name, lim in self._clients.items()},
+        }
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
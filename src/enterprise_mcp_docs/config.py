@@ -0,0 +1,232 @@
+"""Configuration loading for Enterprise MCP Documentation Server.
+
+Configuration is read from a JSON file (``config/local.json`` or
+``config/default.json`` when no explicit path is given), merged over
+built-in defaults, and finally overridden by the environment variables
+documented in ``.env.example``.
+"""
+
+import copy
+import json
+import logging
+import os
+import re
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Config files searched (in order) when no explicit path is given
+CONFIG_SEARCH_PATHS = ["config/local.json", "config/default.json"]
+
+# Used when no configuration file can be found at all
+DEFAULT_TOOLS: Dict[str, Dict[str, Any]] = {
+    "elasticsearch": {"provider": "Elasticsearch", "enabled": True},
+    "docker": {"provider": "Docker", "enabled": True},
+    "python": {"provider": "Python", "enabled": True},
+}
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "tools": {},
+    "index": {
+        "path": "./data/index",
+        "artifacts_path": "./artifacts",
+        "near_duplicate_distance": 3,
+        "reload_interval": 30,
+        "text_cache_blocks": 64,
+        "text_codec": "zlib",
+    },
+    "page_cache": {
+        "path": "./cache/pages",
+        "max_size_mb": 512,
+        "compression": "auto",
+    },
+    "cache": {
+        "enabled": True,
+        "redis_url": "redis://localhost:6379",
+        "db": 0,
+        "password": None,
+        "ttl": 3600,
+        "prefix": "mcp_docs:",
+        "max_connections": 10,
+        "operation_timeout": 0.05,
+        "local_max_entries": 1024,
+        "reconnect_interval": 1,
+        "max_reconnect_interval": 60,
+    },
+    "limits": {
+        "per_tool": {"search_documentation": 8, "get_documentation": 4},
+        "per_client": 4,
+        "max_queue": 32,
+        "queue_timeout": 2.0,
+        "cpu_workers": 4,
+    },
+    "search": {
+        "mode": "lite",
+        "synonyms": [],
+        "synonyms_file": None,
+        "synonym_boost": 0.5,
+        "vector_candidates": 50,
+        "embedding_cache_size": 4096,
+        "shard_timeout_ms": 500,
+        "max_late_shards": 4,
+    },
+    "rerank": {
+        "enabled": True,
+        "candidates": 20,
+        "budget_ms": 15,
+    },
+    "query_log": {
+        "enabled": True,
+        "path": "./data/query_log.json",
+        "max_queries": 1000,
+        "max_query_chars": 200,
+        "flush_interval": 60,
+        "warm_queries": 50,
+        "warm_min_count": 2,
+        "warm_delay": 0.05,
+    },
+    "resources": {
+        "enabled": True,
+        "memory_budget_mb": None,
+        "cgroup_fraction": 0.8,
+        "high_watermark": 0.9,
+        "low_watermark": 0.7,
+        "check_interval": 10,
+        "grow_delay": 60,
+        "shard_idle_seconds": 600,
+        "min_result_cache_entries": 64,
+        "min_text_cache_blocks": 4,
+        "status_dir": "./data/status",
+    },
+    "tracing": {
+        "enabled": True,
+        "export_path": None,
+        "slow_query_ms": 500,
+        "slow_query_log": None,
+    },
+    "scheduler": {
+        "enabled": True,
+        "default_ttl": 86400,
+        "max_concurrent_crawls": 1,
+        "jitter": 0.1,
+        "startup_delay": 300,
+        "failure_retry": 900,
+        "nice": 10,
+    },
+    "crawling": {
+        "max_workers": 4,
+        "request_timeout": 30,
+        "request_delay": 1,
+        "retry_attempts": 3,
+        "user_agent": "enterprise-mcp-docs/0.1 (+https://github.com/hasecon)",
+        "max_urls_per_tool": 5000,
+        "min_request_delay": 0.1,
+        "max_request_delay": 30,
+        "host_concurrency": 2,
+        "slow_response_time": 5,
+        "max_backoff": 60,
+        "max_retry_after": 120,
+        "circuit_failure_threshold": 5,
+        "circuit_reset_timeout": 60,
+    },
+}
+
+# Environment variable -> (config path, converter)
+ENV_OVERRIDES: Dict[str, Tuple[Tuple[str, ...], Callable[[str], Any]]] = {
+    "REDIS_URL": (("cache", "redis_url"), str),
+    "REDIS_DB": (("cache", "db"), int),
+    "REDIS_PASSWORD": (("cache", "password"), str),
+    "CACHE_TTL": (("cache", "ttl"), int),
+    "CACHE_PREFIX": (("cache", "prefix"), str),
+    "TRACE_EXPORT_PATH": (("tracing", "export_path"), str),
+    "SLOW_QUERY_MS": (("tracing", "slow_query_ms"), float),
+    "SLOW_QUERY_LOG": (("tracing", "slow_query_log"), str),
+    "QUERY_LOG_PATH": (("query_log", "path"), str),
+    "MEMORY_BUDGET_MB": (("resources", "memory_budget_mb"), float),
+    "SEARCH_MODE": (("search", "mode"), str),
+    "SYNONYMS_FILE": (("search", "synonyms_file"), str),
+    "CRAWL_INTERVAL": (("scheduler", "default_ttl"), int),
+    "MAX_CRAWL_WORKERS": (("crawling", "max_workers"), int),
+    "REQUEST_TIMEOUT": (("crawling", "request_timeout"), float),
+    "REQUEST_DELAY": (("crawling", "request_delay"), float),
+    "RETRY_ATTEMPTS": (("crawling", "retry_attempts"), int),
+}
+
+
+def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Recursively merge ``override`` into a copy of ``base``."""
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+# Values that may legitimately contain "#" and are taken verbatim
+VERBATIM_ENV = {"REDIS_URL", "REDIS_PASSWORD"}
+
+# A "# comment" at the start of a value or after whitespace
+ENV_COMMENT_RE = re.compile(r"(?:^|\s)#.*$", re.DOTALL)
+
+
+def _env_value(name: str, raw: str) -> str:
+    """Strip trailing ``  # comments`` as used in ``.env.example``.
+
+    Only a ``#`` preceded by whitespace starts a comment, and secrets and
+    URLs (see :data:`VERBATIM_ENV`) are never stripped, so passwords and
+    URL fragments containing ``#`` survive.
+    """
+    if name in VERBATIM_ENV:
+        return raw.strip()
+    return ENV_COMMENT_RE.sub("", raw).strip()
+
+
+def find_config_file() -> Optional[str]:
+    """Return the first configuration file found on the search path."""
+    for path in CONFIG_SEARCH_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_config(path: Optional[str] = None) -> Dict[str, Any]:
+    """Load the server configuration.
+
+    Args:
+        path: Explicit configuration file. When omitted the default
+            search path is used.
+
+    Returns:
+        Merged configuration dictionary
+    """
+    config_file = path or find_config_file()
+    file_config: Dict[str, Any] = {}
+
+    if config_file:
+        with open(config_file) as f:
+            file_config = json.load(f)
+        logger.debug("Loaded configuration from %s", config_file)
+    else:
+        logger.debug("No configuration file found, using built-in defaults")
+        file_config = {"tools": DEFAULT_TOOLS}
+
+    config = _deep_merge(DEFAULT_CONFIG, file_config)
+
+    for env_name, (keys, convert) in ENV_OVERRIDES.items():
+        raw = os.getenv(env_name)
+        if raw is None or not _env_value(env_name, raw):
+            continue
+        try:
+            value = convert(_env_value(env_name, raw))
+        except ValueError:
+            logger.warning("Ignoring invalid value for %s: %r", env_name, raw)
+            continue
+        section = config.setdefault(keys[0], {})
+        section[keys[1]] = value
+
+    for tool_name, tool_config in config.get("tools", {}).items():
+        tool_config.setdefault("name", tool_name)
+
+    return config
@@ -1,22 +1,55 @@
 """Documentation crawling functionality.
 
-This module will contain the documentation crawling engine.
-Currently implemented as a placeholder for CI/CD compatibility.
+This module contains the documentation crawling engine. Crawls start with
+sitemap-first URL discovery (see :mod:`enterprise_mcp_docs.discovery`) so
+only in-scope pages are ever requested. Fetched pages are stored in the
+raw-page cache (revalidated with conditional requests on later crawls) and
+the tool's index shard is rebuilt from the cache afterwards. Pages a crawl
+references are pinned in the cache until that rebuild, and once a crawl has
+seen the tool's complete page list, cached pages missing from it are
+removed.
 """
 
+import asyncio
+import logging
 import sys
-from typing import Dict, List, Optional
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import urljoin
 
 import click
+import httpx
+from bs4 import BeautifulSoup
 
 from . import __version__
+from .config import load_config
+from .discovery import DiscoveredURL, SitemapDiscovery
+from .fetcher import Fetcher
+from .index import DocumentIndex, build_shard
+from .page_cache import RawPageCache
+from .providers import PROVIDER_REGISTRY, APIError, APIProvider
+
+logger = logging.getLogger(__name__)
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+
+def extract_links(html: bytes, page_url: str) -> List[str]:
+    """Return the ``href`` targets of all links on a page, resolved to absolute."""
+    soup = BeautifulSoup(html, "html.parser")
+    return [
+        urljoin(page_url, a["href"])
+        for a in soup.find_all("a", href=True)
+        if not a["href"].startswith(("#", "mailto:", "javascript:"))
+    ]
 
 
 class DocumentationCrawler:
     """Documentation crawler for enterprise tools.
 
-    This is a placeholder implementation that will be replaced
-    with actual crawling functionality in future development phases.
+    Discovers the pages of each configured tool from its sitemaps
+    (restricted to the tool's configured sections), fetches them into the
+    raw-page cache and rebuilds the tool's index shard.
     """
 
     def __init__(self, config: Optional[Dict] = None):
@@ -33,12 +66,45 @@ class DocumentationCrawler:
             "n8n",
             "ollama",
         ]
+        self._cache: Optional[RawPageCache] = None
+        # URLs pinned in the cache per tool until its shard is rebuilt
+        self._pinned: Dict[str, Set[str]] = {}
+
+    @property
+    def crawling_config(self) -> Dict:
+        """Crawler settings from the ``crawling`` config section."""
+        return self.config.get("crawling", {})
 
-    async def crawl_tool(self, tool_name: str) -> Dict:
+    @property
+    def cache(self) -> RawPageCache:
+        """Raw-page cache shared by all crawls."""
+        if self._cache is None:
+            self._cache = RawPageCache.from_config(self.config)
+        return self._cache
+
+    @property
+    def index_path(self) -> str:
+        """Directory the documentation index is stored in."""
+        return self.config.get("index", {}).get("path", "./data/index")
+
+    def _create_fetcher(self) -> Fetcher:
+        """Create the fetcher shared by a crawl."""
+        return Fetcher(self.crawling_config)
+
+    async def crawl_tool(
+        self,
+        tool_name: str,
+        fetcher: Optional[Fetcher] = None,
+        force: bool = False,
+        update_index: bool = True,
+    ) -> Dict:
         """Crawl documentation for a specific tool.
 
         Args:
             tool_name: Name of the tool to crawl
+            fetcher: Optional fetcher to share across tools
+            force: Re-download pages even if the cached copy is still valid
+            update_index: Rebuild the tool's index shard after fetching
 
         Returns:
             Dictionary containing crawl results
@@ -46,38 +112,388 @@ class DocumentationCrawler:
         if tool_name not in self.supported_tools:
             raise ValueError(f"Unsupported tool: {tool_name}")
 
-        # Placeholder implementation
+        provider = self.api_provider(tool_name)
+        if provider is not None:
+            return await self._sync_api(provider, force, update_index)
+
+        tool_config = self.config.get("tools", {}).get(tool_name, {})
+        if not tool_config.get("base_url"):
+            return {
+                "tool": tool_name,
+                "status": "not_configured",
+                "message": "No base_url configured for this tool",
+                "pages_found": 0,
+                "documents_processed": 0,
+            }
+
+        discovery = SitemapDiscovery(
+            tool_config["base_url"],
+            tool_config.get("sections", []),
+            user_agent=self.crawling_config.get("user_agent", "*"),
+            max_urls=self.crawling_config.get("max_urls_per_tool", 5000),
+        )
+
+        self._release_pins([tool_name])
+        seen = self._pinned[tool_name] = set()
+        try:
+            if fetcher is None:
+                async with self._create_fetcher() as own_fetcher:
+                    urls = await discovery.discover(own_fetcher)
+                    stats = await self._fetch_pages(
+                        own_fetcher, tool_name, discovery, urls, seen, force
+                    )
+            else:
+                urls = await discovery.discover(fetcher)
+                stats = await self._fetch_pages(
+                    fetcher, tool_name, discovery, urls, seen, force
+                )
+
+            # Only a complete crawl proves that a cached page is gone; a
+            # failed sitemap or page fetch could have hidden some
+            if discovery.used_sitemap:
+                complete = discovery.complete
+            else:
+                complete = not stats["failed"] and len(seen) < discovery.max_urls
+            if complete:
+                stats["deleted"] = await asyncio.to_thread(
+                    self.cache.prune, tool_name, seen
+                )
+        except BaseException:
+            self._release_pins([tool_name])
+            raise
+
+        documents = 0
+        if update_index:
+            index = self.update_index([tool_name])
+            documents = len(index.shards[tool_name].documents)
+
         return {
             "tool": tool_name,
-            "status": "not_implemented",
-            "message": "Crawling functionality will be implemented in next phase",
-            "pages_found": 0,
-            "documents_processed": 0,
+            "status": "crawled",
+            "message": (
+                "Discovered pages from sitemap"
+                if discovery.used_sitemap
+                else "No sitemap available, followed links from section seeds"
+            ),
+            "source": "sitemap" if discovery.used_sitemap else "seed",
+            "pages_found": stats["seen"],
+            "pages_fetched": stats["fetched"],
+            "pages_not_modified": stats["not_modified"],
+            "pages_failed": stats["failed"],
+            "pages_deleted": stats["deleted"],
+            "documents_processed": documents,
         }
 
-    async def crawl_all(self) -> List[Dict]:
+    def _release_pins(self, tools: Iterable[str]) -> None:
+        """Unpin the pages the last crawl of ``tools`` pinned."""
+        for tool in tools:
+            urls = self._pinned.pop(tool, None)
+            if urls:
+                self.cache.unpin(urls)
+
+    def api_provider(self, tool_name: str) -> Optional[APIProvider]:
+        """REST API provider for ``tool_name``, if its ``api.url`` is configured."""
+        tool_config = self.config.get("tools", {}).get(tool_name, {})
+        provider_class = PROVIDER_REGISTRY.get(tool_config.get("provider", ""))
+        if (
+            provider_class is None
+            or not issubclass(provider_class, APIProvider)
+            or not tool_config.get("api", {}).get("url")
+        ):
+            return None
+        return provider_class(
+            dict(tool_config, tool=tool_name, crawling=self.crawling_config)
+        )
+
+    async def _sync_api(
+        self, provider: APIProvider, force: bool, update_index: bool
+    ) -> Dict:
+        """Export a tool's changed content through its REST API."""
+        try:
+            stats = await provider.sync(self.cache, force=force)
+        except APIError as e:
+            logger.warning("API sync of %s failed: %s", provider.tool, e)
+            return {
+                "tool": provider.tool,
+                "status": "failed",
+                "message": f"API sync failed: {e}",
+                "pages_found": 0,
+                "documents_processed": 0,
+            }
+
+        documents = 0
+        if update_index:
+            index = self.update_index([provider.tool])
+            documents = len(index.shards[provider.tool].documents)
+
+        return {
+            "tool": provider.tool,
+            "status": "crawled",
+            "message": (
+                "Full export from the REST API"
+                if stats["full"]
+                else "Synced changes from the REST API"
+            ),
+            "source": "api",
+            "pages_found": stats["seen"],
+            "pages_fetched": stats["fetched"],
+            "pages_not_modified": stats["not_modified"],
+            "pages_failed": stats["failed"],
+            "pages_deleted": stats["deleted"],
+            "documents_processed": documents,
+        }
+
+    async def _fetch_pages(
+        self,
+        fetcher: Fetcher,
+        tool_name: str,
+        discovery: SitemapDiscovery,
+        urls: List[DiscoveredURL],
+        seen: Set[str],
+        force: bool,
+    ) -> Counter:
+        """Fetch discovered pages into the cache.
+
+        Without a sitemap, links found on fetched pages are followed as
+        long as they pass the discovery scope filter. Every page URL is
+        added to ``seen`` and pinned in the cache before it is fetched.
+        """
+        follow_links = not discovery.used_sitemap
+        queue: asyncio.Queue = asyncio.Queue()
+        stats: Counter = Counter()
+        cache = self.cache
+
+        for discovered in urls:
+            seen.add(discovered.url)
+            queue.put_nowait(discovered.url)
+        cache.pin(seen)
+
+        async def worker() -> None:
+            while True:
+                url = await queue.get()
+                try:
+                    content = await self._fetch_page(
+                        fetcher, tool_name, url, force, follow_links, stats
+                    )
+                    if not (follow_links and content):
+                        continue
+                    for link in extract_links(content, url):
+                        canonical = discovery.accepts(link)
+                        if (
+                            canonical
+                            and canonical not in seen
+                            and len(seen) < discovery.max_urls
+                        ):
+                            seen.add(canonical)
+                            cache.pin([canonical])
+                            queue.put_nowait(canonical)
+                except Exception as e:
+                    stats["failed"] += 1
+                    logger.warning("Failed to process %s: %s", url, e)
+                finally:
+                    queue.task_done()
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(self.crawling_config.get("max_workers", 4))
+        ]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        stats["seen"] = len(seen)
+        return stats
+
+    async def _fetch_page(
+        self,
+        fetcher: Fetcher,
+        tool_name: str,
+        url: str,
+        force: bool,
+        need_content: bool,
+        stats: Counter,
+    ) -> Optional[bytes]:
+        """Fetch a single page, revalidating the cached copy when present.
+
+        Politeness delays, retries and circuit breaking are handled by the
+        :class:`~enterprise_mcp_docs.fetcher.Fetcher`.
+
+        Returns:
+            The page content if it is available and ``need_content`` is set
+        """
+        # The cache does SQLite and disk I/O (and compresses on put), so it
+        # is only called from worker threads
+        cache = self.cache
+        cached = None if force else await asyncio.to_thread(cache.lookup, url)
+        headers = cached.validators if cached else {}
+
+        try:
+            response = await fetcher.get(url, headers=headers)
+        except httpx.HTTPError as e:
+            stats["failed"] += 1
+            logger.warning("Failed to fetch %s: %s", url, e)
+            return None
+
+        if response.status_code == 304 and cached:
+            await asyncio.to_thread(cache.touch, url)
+            stats["not_modified"] += 1
+            if need_content:
+                page = await asyncio.to_thread(cache.get, url)
+                return page.content if page else None
+            return None
+
+        content_type = response.headers.get("content-type", "")
+        if response.status_code != 200 or not content_type.startswith(
+            HTML_CONTENT_TYPES
+        ):
+            stats["failed"] += 1
+            logger.debug(
+                "Skipping %s (%s, %s)", url, response.status_code, content_type
+            )
+            return None
+
+        await asyncio.to_thread(
+            cache.put, url, tool_name, response.content, dict(response.headers)
+        )
+        stats["fetched"] += 1
+        return response.content
+
+    def update_index(self, tools: Optional[List[str]] = None) -> DocumentIndex:
+        """Rebuild index shards from the raw-page cache.
+
+        No network access is needed; this is what ``reindex`` runs. Only
+        the rebuilt shards and the manifest are written; the other shards
+        of the saved index are neither loaded nor rewritten. Pages pinned
+        by the crawls of the rebuilt tools are released afterwards.
+
+        Args:
+            tools: Tools to rebuild (all cached tools when omitted)
+
+        Returns:
+            An index holding the rebuilt shards
+        """
+        try:
+            index = self.build_index(tools)
+            index.save(
+                self.index_path,
+                self.config.get("index", {}).get("text_codec"),
+                merge=True,
+            )
+        finally:
+            self._release_pins(list(self._pinned) if tools is None else tools)
+            self.cache.evict()
+        return index
+
+    def build_index(
+        self,
+        tools: Optional[List[str]] = None,
+        index: Optional[DocumentIndex] = None,
+    ) -> DocumentIndex:
+        """Build index shards from the raw-page cache without saving them.
+
+        Args:
+            tools: Tools to build (all cached tools when omitted)
+            index: Index to add the shards to (a new one when omitted)
+
+        Returns:
+            The index containing the rebuilt shards
+        """
+        index = index if index is not None else DocumentIndex()
+        tools_config = self.config.get("tools", {})
+        dedup_distance = self.config.get("index", {}).get("near_duplicate_distance", 3)
+
+        for tool in tools or self.cache.tools():
+            index.shards[tool] = build_shard(
+                tool,
+                self.cache.iter_pages(tool),
+                tools_config.get(tool, {}),
+                dedup_distance=dedup_distance,
+            )
+        return index
+
+    def enabled_tools(self) -> List[str]:
+        """Supported tools that are enabled in the configuration."""
+        tools_config = self.config.get("tools", {})
+        if not tools_config:
+            return list(self.supported_tools)
+        return [
+            name
+            for name in self.supported_tools
+            if tools_config.get(name, {}).get("enabled", False)
+        ]
+
+    async def crawl_all(self, force: bool = False) -> List[Dict]:
         """Crawl documentation for all enabled tools.
 
+        Tools are crawled concurrently, bounded by ``crawling.max_workers``,
+        and the index is updated once all of them have finished.
+
+        Args:
+            force: Re-download pages even if the cached copy is still valid
+
         Returns:
             List of crawl results for each tool
         """
-        results = []
-        for tool in self.supported_tools:
-            result = await self.crawl_tool(tool)
-            results.append(result)
+        semaphore = asyncio.Semaphore(self.crawling_config.get("max_workers", 4))
+
+        async with self._create_fetcher() as fetcher:
+
+            async def crawl_one(tool: str) -> Dict:
+                async with semaphore:
+                    return await self.crawl_tool(
+                        tool, fetcher, force=force, update_index=False
+                    )
+
+            try:
+                results = list(
+                    await asyncio.gather(*(crawl_one(t) for t in self.enabled_tools()))
+                )
+            except BaseException:
+                self._release_pins(list(self._pinned))
+                raise
+
+        crawled = [r["tool"] for r in results if r["status"] == "crawled"]
+        if crawled:
+            index = self.update_index(crawled)
+            for result in results:
+                if result["status"] == "crawled":
+                    shard = index.shards[result["tool"]]
+                    result["documents_processed"] = len(shard.documents)
         return results
 
 
+def echo_crawl_result(result: Dict, verbose: bool = False) -> None:
+    """Print a single crawl result."""
+    if result["status"] != "crawled":
+        click.echo(f"⚠️  {result['tool']}: {result['message']}")
+        return
+    click.echo(
+        f"✅ {result['tool']}: {result['pages_found']} pages "
+        f"({result['source']}), {result['documents_processed']} documents indexed"
+    )
+    if verbose:
+        click.echo(
+            f"     fetched: {result['pages_fetched']}, "
+            f"not modified: {result['pages_not_modified']}, "
+            f"failed: {result['pages_failed']}"
+            + (
+                f", deleted: {result['pages_deleted']}"
+                if "pages_deleted" in result
+                else ""
+            )
+        )
+
+
 @click.command()
 @click.option("--tool", help="Specific tool to crawl")
 @click.option("--all", "crawl_all", is_flag=True, help="Crawl all tools")
 @click.option("--config", type=click.Path(exists=True), help="Config file")
 @click.option("--verbose", "-v", is_flag=True, help="Verbose output")
 def main(tool: Optional[str], crawl_all: bool, config: Optional[str], verbose: bool):
-    """Standalone crawling command.
-
-    This is a placeholder implementation for CI/CD compatibility.
-    """
+    """Standalone crawling command."""
     if verbose:
         click.echo(f"Enterprise MCP Documentation Crawler v{__version__}")
 
@@ -85,24 +501,21 @@ def main(tool: Optional[str], crawl_all: bool, config: Optional[str], verbose: b
         click.echo("❌ Please specify --tool <name> or --all", err=True)
         sys.exit(1)
 
-    crawler = DocumentationCrawler()
+    crawler = DocumentationCrawler(load_config(config))
 
     if crawl_all:
-        click.echo("🕷️  Would crawl all supported tools:")
-        for t in crawler.supported_tools:
-            click.echo(f"   • {t}")
+        click.echo("🕷️  Crawling all enabled tools...")
+        results = asyncio.run(crawler.crawl_all())
     else:
         if tool not in crawler.supported_tools:
             click.echo(f"❌ Unsupported tool: {tool}", err=True)
             click.echo(f"Supported tools: {', '.join(crawler.supported_tools)}")
             sys.exit(1)
-        click.echo(f"🕷️  Would crawl tool: {tool}")
+        click.echo(f"🕷️  Crawling tool: {tool}")
+        results = [asyncio.run(crawler.crawl_tool(tool))]
 
-    click.echo()
-    click.echo("⚠️  Note: This is a placeholder implementation")
-    click.echo(
-        "   Actual crawling functionality will be added in the next development phase"
-    )
+    for result in results:
+        echo_crawl_result(result, verbose)
 
 
 if __name__ == "__main__":
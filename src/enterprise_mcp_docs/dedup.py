@@ -0,0 +1,219 @@
+"""Near-duplicate detection for indexed documentation.
+
+Vendor documentation is frequently published several times: once per
+version (Python 3.9-3.12) or locale, with identical or nearly identical
+text. Documents are fingerprinted with 64-bit SimHash over word shingles;
+fingerprints within a small Hamming distance are treated as duplicates.
+Candidate pairs are found with banded lookup tables rather than by
+comparing every pair, so clustering stays close to linear in the number
+of documents.
+"""
+
+import hashlib
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+FINGERPRINT_BITS = 64
+
+# Words per shingle used for fingerprints
+SHINGLE_SIZE = 3
+
+# Below this many tokens SimHash is unreliable; only exact matches count
+MIN_SIMHASH_TOKENS = 24
+
+# Default maximum Hamming distance between near-duplicates. With four
+# 16-bit bands, any pair within distance 3 shares at least one band.
+DEFAULT_DISTANCE = 3
+BANDS = 4
+
+_VERSION_PART_RE = re.compile(r"\d+")
+_ROLLING_VERSIONS = {"current": 3, "latest": 3, "stable": 2, "main": 1, "master": 1}
+
+
+def simhash(tokens: Sequence[str]) -> int:
+    """Compute a 64-bit SimHash fingerprint over word shingles.
+
+    Bit weights are accumulated per hash byte value rather than per bit,
+    which keeps fingerprinting long pages cheap in pure Python.
+    """
+    if len(tokens) < SHINGLE_SIZE:
+        features: Iterable[str] = tokens
+    else:
+        features = (
+            " ".join(tokens[i : i + SHINGLE_SIZE])
+            for i in range(len(tokens) - SHINGLE_SIZE + 1)
+        )
+
+    digests = [
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        for feature in features
+    ]
+    weights = [0] * FINGERPRINT_BITS
+    for position in range(FINGERPRINT_BITS // 8):
+        for byte, count in Counter(d[position] for d in digests).items():
+            for bit in range(8):
+                weights[position * 8 + bit] += count if byte >> bit & 1 else -count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+def version_key(version: Optional[str]) -> Tuple[int, Tuple[int, ...]]:
+    """Sort key ranking documentation versions from oldest to newest.
+
+    Rolling aliases (``current``, ``latest``) rank above numbered
+    versions; numbered versions compare numerically (``3.10`` > ``3.9``).
+    """
+    if not version:
+        return (0, ())
+    if version in _ROLLING_VERSIONS:
+        return (2, (_ROLLING_VERSIONS[version],))
+    return (1, tuple(int(p) for p in _VERSION_PART_RE.findall(version)))
+
+
+class Fingerprint:
+    """Exact digest plus SimHash for a piece of text."""
+
+    __slots__ = ("digest", "simhash", "reliable")
+
+    def __init__(self, tokens: Sequence[str]):
+        self.digest = hashlib.sha1(" ".join(tokens).encode("utf-8")).digest()
+        self.reliable = len(tokens) >= MIN_SIMHASH_TOKENS
+        self.simhash = simhash(tokens) if self.reliable else 0
+
+    def matches(self, other: "Fingerprint", distance: int = DEFAULT_DISTANCE) -> bool:
+        """True if both fingerprints describe (near-)identical text."""
+        if self.digest == other.digest:
+            return True
+        return (
+            self.reliable
+            and other.reliable
+            and hamming(self.simhash, other.simhash) <= distance
+        )
+
+
+class SimHashIndex:
+    """Banded lookup of fingerprints for near-duplicate candidates."""
+
+    def __init__(self, bands: int = BANDS):
+        self.bands = bands
+        self.band_bits = FINGERPRINT_BITS // bands
+        self._tables: List[Dict[int, List[Any]]] = [
+            defaultdict(list) for _ in range(bands)
+        ]
+
+    def _band_values(self, fingerprint: int) -> Iterable[Tuple[int, int]]:
+        mask = (1 << self.band_bits) - 1
+        for band in range(self.bands):
+            yield band, fingerprint >> (band * self.band_bits) & mask
+
+    def add(self, key: Any, fingerprint: int) -> None:
+        for band, value in self._band_values(fingerprint):
+            self._tables[band][value].append(key)
+
+    def candidates(self, fingerprint: int) -> Set[Any]:
+        """Keys sharing at least one band with ``fingerprint``."""
+        found: Set[Any] = set()
+        for band, value in self._band_values(fingerprint):
+            found.update(self._tables[band].get(value, ()))
+        return found
+
+
+def cluster(
+    items: Dict[str, Sequence[str]], distance: int = DEFAULT_DISTANCE
+) -> List[List[str]]:
+    """Group keys whose token sequences are (near-)duplicates.
+
+    Args:
+        items: Mapping of key to token sequence
+        distance: Maximum SimHash Hamming distance
+
+    Returns:
+        Clusters with more than one member
+    """
+    parent = {key: key for key in items}
+
+    def find(key: str) -> str:
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    def union(a: str, b: str) -> None:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    by_digest: Dict[bytes, str] = {}
+    lsh = SimHashIndex()
+    prints: Dict[str, Fingerprint] = {}
+
+    for key, tokens in items.items():
+        fingerprint = Fingerprint(tokens)
+        prints[key] = fingerprint
+
+        if fingerprint.digest in by_digest:
+            union(by_digest[fingerprint.digest], key)
+            continue
+        by_digest[fingerprint.digest] = key
+
+        if fingerprint.reliable:
+            for other in lsh.candidates(fingerprint.simhash):
+                if fingerprint.matches(prints[other], distance):
+                    union(other, key)
+            lsh.add(key, fingerprint.simhash)
+
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for key in items:
+        groups[find(key)].append(key)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def collapse_hits(
+    hits: Iterable[Any],
+    limit: int,
+    tokenize: Any,
+    distance: int = DEFAULT_DISTANCE,
+) -> List[Any]:
+    """Collapse near-duplicate search hits into one representative each.
+
+    Hits are processed in rank order; a hit whose text duplicates an
+    already kept hit is folded into that hit's ``alternates`` instead of
+    taking a result slot.
+
+    Args:
+        hits: Hits ordered by descending score
+        limit: Maximum number of hits to keep
+        tokenize: Tokenizer used to fingerprint hit text
+        distance: Maximum SimHash Hamming distance
+
+    Returns:
+        Up to ``limit`` distinct hits
+    """
+    kept: List[Any] = []
+    prints: List[Fingerprint] = []
+
+    for hit in hits:
+        fingerprint = Fingerprint(tokenize(hit.text))
+        for existing, existing_print in zip(kept, prints):
+            if fingerprint.matches(existing_print, distance):
+                known = {existing.url} | {a["url"] for a in existing.alternates}
+                if hit.url not in known:
+                    existing.alternates.append({"url": hit.url, "version": hit.version})
+                break
+        else:
+            if len(kept) >= limit:
+                break
+            kept.append(hit)
+            prints.append(fingerprint)
+
+    return kept
@@ -0,0 +1,387 @@
+"""Sitemap-first URL discovery for documentation crawls.
+
+Instead of following navigation links, discovery asks the site which pages
+exist: ``robots.txt`` ``Sitemap:`` directives are read first, falling back
+to ``sitemap.xml`` next to the base URL and at the site root. Sitemaps (and
+sitemap indexes) are parsed incrementally while they download, so even very
+large files are never held in memory. Every URL is canonicalized,
+deduplicated and filtered to the provider's configured sections before a
+single page is fetched.
+"""
+
+import logging
+import posixpath
+import xml.etree.ElementTree as ET
+import zlib
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+if TYPE_CHECKING:
+    from .fetcher import Fetcher
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that never change page content
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+TRACKING_PREFIXES = ("utm_",)
+
+# Directory index documents collapsed onto their directory URL
+INDEX_DOCUMENTS = ("index.html", "index.htm")
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Separators allowed directly after a section name in a path
+SECTION_SEPARATORS = "/.-_"
+
+
+@dataclass
+class DiscoveredURL:
+    """A crawlable page found during discovery."""
+
+    url: str
+    lastmod: Optional[str] = None
+
+
+def canonicalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """Return the canonical form of ``url`` or ``None`` if it is not crawlable.
+
+    Canonicalization lowercases scheme and host, drops default ports,
+    fragments and tracking parameters, resolves dot segments, collapses
+    ``index.html`` onto its directory and sorts the query string.
+
+    Args:
+        url: Absolute or relative URL
+        base: Base URL used to resolve relative URLs
+
+    Returns:
+        Canonical URL, or None for non-HTTP(S) URLs
+    """
+    url = url.strip()
+    if base:
+        url = urljoin(base, url)
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower()
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+
+    path = parts.path or "/"
+    trailing_slash = path.endswith("/")
+    path = posixpath.normpath(path)
+    if path.startswith("//"):
+        path = "/" + path.lstrip("/")
+    if trailing_slash and path != "/":
+        path += "/"
+    for index_doc in INDEX_DOCUMENTS:
+        if path.endswith("/" + index_doc):
+            path = path[: -len(index_doc)]
+            break
+
+    query_pairs = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query = urlencode(sorted(query_pairs))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def match_section(url: str, base_url: str, sections: Sequence[str]) -> Optional[str]:
+    """Return the configured section a canonical URL belongs to.
+
+    A URL is in scope when it lives under ``base_url`` and the path relative
+    to it starts with a section name followed by a separator (``/``, ``.``,
+    ``-`` or ``_``) or the end of the path. With no sections configured,
+    everything below ``base_url`` is in scope and ``""`` is returned.
+
+    Args:
+        url: Canonical URL to check
+        base_url: Canonical provider base URL
+        sections: Section names from the provider configuration
+
+    Returns:
+        The matching section name, or None if the URL is out of scope
+    """
+    if not url.startswith(base_url):
+        return None
+    if not sections:
+        return ""
+
+    relative = url[len(base_url) :].lstrip("/")
+    for section in sections:
+        section = section.strip("/")
+        if not relative.startswith(section):
+            continue
+        rest = relative[len(section) :]
+        if not rest or rest[0] in SECTION_SEPARATORS:
+            return section
+    return None
+
+
+def in_sections(url: str, base_url: str, sections: Sequence[str]) -> bool:
+    """Check whether a canonical URL belongs to one of the configured sections."""
+    return match_section(url, base_url, sections) is not None
+
+
+class SitemapParser:
+    """Incremental parser for sitemaps and sitemap indexes.
+
+    Feed raw bytes as they arrive and collect entries with
+    :meth:`entries`. Gzip-compressed sitemaps are detected from their
+    magic bytes and decompressed on the fly. Parsed elements are cleared
+    immediately, keeping memory usage flat regardless of sitemap size.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._decompressor: Optional[Any] = None
+        self._sniffed = False
+        self._root: Optional[ET.Element] = None
+
+    def feed(self, data: bytes) -> None:
+        """Feed a chunk of (possibly gzipped) sitemap bytes."""
+        if not self._sniffed:
+            self._sniffed = True
+            if data[:2] == b"\x1f\x8b":
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._decompressor is not None:
+            data = self._decompressor.decompress(data)
+        self._parser.feed(data)
+
+    def close(self) -> None:
+        """Signal the end of input."""
+        if self._decompressor is not None:
+            self._parser.feed(self._decompressor.flush())
+        self._parser.close()
+
+    def entries(self) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """Yield ``(kind, loc, lastmod)`` tuples parsed so far.
+
+        ``kind`` is ``"url"`` for pages and ``"sitemap"`` for child
+        sitemaps referenced from a sitemap index.
+        """
+        for event, element in self._parser.read_events():
+            tag = element.tag.rsplit("}", 1)[-1]
+            if event == "start":
+                if self._root is None:
+                    self._root = element
+                continue
+            if tag not in ("url", "sitemap"):
+                continue
+
+            loc = lastmod = None
+            for child in element:
+                child_tag = child.tag.rsplit("}", 1)[-1]
+                if child_tag == "loc" and child.text:
+                    loc = child.text.strip()
+                elif child_tag == "lastmod" and child.text:
+                    lastmod = child.text.strip()
+            if self._root is not None:
+                self._root.clear()
+            if loc:
+                yield tag, loc, lastmod
+
+
+def parse_robots(robots_url: str, text: str) -> RobotFileParser:
+    """Parse ``robots.txt`` content into a :class:`RobotFileParser`."""
+    robots = RobotFileParser(robots_url)
+    robots.parse(text.splitlines())
+    return robots
+
+
+class SitemapDiscovery:
+    """Discover crawlable pages for a documentation provider.
+
+    Discovery never fetches a documentation page itself; it only downloads
+    ``robots.txt`` and sitemap files. When no sitemap is available, or it
+    lists no in-scope pages, the provider's base URL and section roots are
+    returned as crawl seeds instead (see :attr:`used_sitemap`).
+    :attr:`complete` tells whether the sitemaps were read in full, i.e.
+    whether a page missing from the result is really gone.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        sections: Sequence[str],
+        user_agent: str = "*",
+        max_urls: int = 5000,
+        max_sitemaps: int = 50,
+    ):
+        """Initialize discovery for a provider.
+
+        Args:
+            base_url: Provider documentation root
+            sections: Section names that bound the crawl
+            user_agent: User agent used for robots.txt rules
+            max_urls: Upper bound on returned URLs
+            max_sitemaps: Upper bound on sitemap files downloaded
+        """
+        canonical = canonicalize_url(base_url)
+        if canonical is None:
+            raise ValueError(f"Invalid base URL: {base_url!r}")
+        if not canonical.endswith("/"):
+            canonical += "/"
+        self.base_url = canonical
+        self.sections = [s.strip("/") for s in sections if s.strip("/")]
+        self.user_agent = user_agent
+        self.max_urls = max_urls
+        self.max_sitemaps = max_sitemaps
+        self.robots: Optional[RobotFileParser] = None
+        self.used_sitemap = False
+        self.complete = False
+
+    @property
+    def site_root(self) -> str:
+        """Scheme and host of the base URL."""
+        parts = urlsplit(self.base_url)
+        return f"{parts.scheme}://{parts.netloc}/"
+
+    def accepts(self, url: str) -> Optional[str]:
+        """Canonicalize ``url`` and return it if it is in scope."""
+        canonical = canonicalize_url(url)
+        if canonical is None or not in_sections(
+            canonical, self.base_url, self.sections
+        ):
+            return None
+        if self.robots is not None and not self.robots.can_fetch(
+            self.user_agent, canonical
+        ):
+            return None
+        return canonical
+
+    def seed_urls(self) -> List[DiscoveredURL]:
+        """Crawl seeds used when the site publishes no sitemap."""
+        if not self.sections:
+            return [DiscoveredURL(self.base_url)]
+        seeds = [urljoin(self.base_url, section + "/") for section in self.sections]
+        return [DiscoveredURL(url) for url in dict.fromkeys(seeds)]
+
+    async def discover(
+        self, client: Union[httpx.AsyncClient, "Fetcher"]
+    ) -> List[DiscoveredURL]:
+        """Discover in-scope URLs for the provider.
+
+        Args:
+            client: Fetcher (or plain HTTP client) used to download
+                robots.txt and sitemaps
+
+        Returns:
+            Deduplicated, in-scope URLs in sitemap order
+        """
+        self.used_sitemap = False
+        self.complete = True
+        sitemaps = await self._sitemaps_from_robots(client)
+        if not sitemaps:
+            sitemaps = [
+                urljoin(self.base_url, "sitemap.xml"),
+                urljoin(self.site_root, "sitemap.xml"),
+            ]
+
+        found: Dict[str, DiscoveredURL] = {}
+        queue = list(dict.fromkeys(sitemaps))
+        seen_sitemaps = set()
+
+        while queue:
+            sitemap_url = queue.pop(0)
+            if sitemap_url in seen_sitemaps:
+                continue
+            if len(found) >= self.max_urls or len(seen_sitemaps) >= self.max_sitemaps:
+                self.complete = False
+                break
+            seen_sitemaps.add(sitemap_url)
+
+            entries = self._stream_sitemap(client, sitemap_url)
+            try:
+                async for kind, loc, lastmod in entries:
+                    if kind == "sitemap":
+                        child = canonicalize_url(loc)
+                        if child:
+                            queue.append(child)
+                        continue
+                    url = self.accepts(loc)
+                    if url and url not in found:
+                        found[url] = DiscoveredURL(url, lastmod)
+                        if len(found) >= self.max_urls:
+                            self.complete = False
+                            break
+            except (httpx.HTTPError, ET.ParseError, zlib.error) as e:
+                logger.debug("Sitemap %s unavailable: %s", sitemap_url, e)
+                # A sitemap that does not exist lists no pages; any other
+                # failure may have hidden some
+                if not (
+                    isinstance(e, httpx.HTTPStatusError)
+                    and e.response.status_code in (404, 410)
+                ):
+                    self.complete = False
+            finally:
+                await entries.aclose()
+
+        if not found:
+            logger.info(
+                "No in-scope sitemap entries for %s, using seed URLs", self.base_url
+            )
+            return self.seed_urls()
+
+        self.used_sitemap = True
+        logger.info(
+            "Discovered %d in-scope URLs for %s from %d sitemap(s)",
+            len(found),
+            self.base_url,
+            len(seen_sitemaps),
+        )
+        return list(found.values())
+
+    async def _sitemaps_from_robots(
+        self, client: Union[httpx.AsyncClient, "Fetcher"]
+    ) -> List[str]:
+        """Load robots.txt and return the sitemaps it advertises."""
+        robots_url = urljoin(self.site_root, "robots.txt")
+        try:
+            response = await client.get(robots_url)
+        except httpx.HTTPError as e:
+            logger.debug("robots.txt unavailable for %s: %s", self.site_root, e)
+            return []
+        if response.status_code != 200:
+            return []
+
+        self.robots = parse_robots(robots_url, response.text)
+        return list(self.robots.site_maps() or [])
+
+    async def _stream_sitemap(
+        self, client: Union[httpx.AsyncClient, "Fetcher"], url: str
+    ):
+        """Download a sitemap and yield its entries while it streams in."""
+        parser = SitemapParser()
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+                for entry in parser.entries():
+                    yield entry
+        parser.close()
+        for entry in parser.entries():
+            yield entry
@@ -0,0 +1,377 @@
+"""Resilient HTTP fetch layer shared by discovery and crawling.
+
+Every request goes through three per-host guards:
+
+* a :class:`HostThrottle` that spaces requests to a host and adapts the
+  spacing to observed latency and error rate (back off quickly when a
+  site slows down or errors, speed up slowly while it is healthy),
+* a :class:`CircuitBreaker` that stops sending requests to a host after
+  repeated failures and fails fast until a cool-down has passed,
+* jittered exponential retries (via ``tenacity``) for connection errors,
+  5xx and 429 responses, honoring ``Retry-After`` when a server sends it.
+
+A slow or flaky documentation site therefore cannot tie up crawl workers
+for long: once its circuit opens, remaining requests fail immediately.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Smoothing factor for latency and error-rate moving averages
+EWMA_ALPHA = 0.2
+
+
+class FetchError(httpx.HTTPError):
+    """Base class for fetch-layer errors."""
+
+
+class CircuitOpenError(FetchError):
+    """Raised when a request is rejected because the host's circuit is open."""
+
+
+class _RetryableResponse(Exception):
+    """Internal signal that a response should be retried."""
+
+    def __init__(self, response: httpx.Response, retry_after: Optional[float]):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header into seconds.
+
+    Both the delta-seconds and the HTTP-date forms are supported.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests are rejected for ``reset_timeout`` seconds. A single trial
+    request is then let through (half-open); its outcome closes or re-opens
+    the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def release(self) -> None:
+        """Give back a half-open trial slot whose request had no outcome."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("Circuit opened after %d failures", self.failures)
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class HostThrottle:
+    """Adaptive request spacing and concurrency limit for one host.
+
+    The delay between requests grows multiplicatively on errors and slow
+    responses and shrinks gradually while responses are fast, bounded by
+    ``min_delay`` and ``max_delay``.
+    """
+
+    def __init__(
+        self,
+        delay: float = 1.0,
+        min_delay: float = 0.1,
+        max_delay: float = 30.0,
+        concurrency: int = 2,
+        slow_threshold: float = 5.0,
+    ):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.delay = min(max(delay, min_delay), max_delay)
+        self.slow_threshold = slow_threshold
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for this host's next request slot."""
+        async with self._semaphore:
+            async with self._lock:
+                now = time.monotonic()
+                wait = max(0.0, self._next_slot - now)
+                self._next_slot = max(now, self._next_slot) + self.delay
+            if wait:
+                await asyncio.sleep(wait)
+            yield
+
+    def record(self, latency: float, ok: bool, pause: Optional[float] = None) -> None:
+        """Adapt the request delay to an observed response.
+
+        Args:
+            latency: Seconds until the response headers arrived
+            ok: False for errors, 5xx and 429 responses
+            pause: Extra pause requested by the server (``Retry-After``)
+        """
+        self.requests += 1
+        self.latency = (
+            latency
+            if self.latency is None
+            else (1 - EWMA_ALPHA) * self.latency + EWMA_ALPHA * latency
+        )
+        self.error_rate = (1 - EWMA_ALPHA) * self.error_rate + EWMA_ALPHA * (not ok)
+
+        if not ok:
+            self.delay = min(self.max_delay, max(self.delay * 2, self.min_delay))
+        elif self.latency > self.slow_threshold:
+            self.delay = min(self.max_delay, self.delay * 1.5)
+        else:
+            self.delay = max(self.min_delay, self.delay * 0.9)
+
+        if pause:
+            self._next_slot = max(self._next_slot, time.monotonic() + pause)
+
+
+class Fetcher:
+    """Shared HTTP fetcher with retries, circuit breakers and throttling.
+
+    Mirrors the parts of :class:`httpx.AsyncClient` used by the crawler
+    (``get`` and ``stream``), so it can be passed wherever a client is
+    expected. Use as an async context manager to close the underlying
+    client.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        """Initialize the fetcher.
+
+        Args:
+            config: The ``crawling`` configuration section
+            client: HTTP client to use (one is created from ``config``
+                when omitted)
+        """
+        self.config = config or {}
+        self.retry_attempts = self.config.get("retry_attempts", 3)
+        self.backoff_base = self.config.get("backoff_base", 0.5)
+        self.max_backoff = self.config.get("max_backoff", 60)
+        self.max_retry_after = self.config.get("max_retry_after", 120)
+
+        if client is None:
+            headers = {}
+            if self.config.get("user_agent"):
+                headers["User-Agent"] = self.config["user_agent"]
+            client = httpx.AsyncClient(
+                timeout=self.config.get("request_timeout", 30),
+                headers=headers,
+                follow_redirects=True,
+            )
+        self.client = client
+
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._throttles: Dict[str, HostThrottle] = {}
+        self._backoff = wait_random_exponential(
+            multiplier=self.backoff_base, max=self.max_backoff
+        )
+
+    async def __aenter__(self) -> "Fetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """Circuit breaker for ``host``."""
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(
+                self.config.get("circuit_failure_threshold", 5),
+                self.config.get("circuit_reset_timeout", 60),
+            )
+        return self._breakers[host]
+
+    def throttle(self, host: str) -> HostThrottle:
+        """Adaptive throttle for ``host``."""
+        if host not in self._throttles:
+            self._throttles[host] = HostThrottle(
+                delay=self.config.get("request_delay", 1),
+                min_delay=self.config.get("min_request_delay", 0.1),
+                max_delay=self.config.get("max_request_delay", 30),
+                concurrency=self.config.get("host_concurrency", 2),
+                slow_threshold=self.config.get("slow_response_time", 5),
+            )
+        return self._throttles[host]
+
+    def _wait(self, retry_state: RetryCallState) -> float:
+        """Retry wait: ``Retry-After`` if the server sent one, else backoff."""
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        if isinstance(exc, _RetryableResponse) and exc.retry_after is not None:
+            return min(exc.retry_after, self.max_retry_after)
+        return self._backoff(retry_state)
+
+    async def _send_once(self, request: httpx.Request, stream: bool) -> httpx.Response:
+        host = request.url.host
+        breaker = self.breaker(host)
+        throttle = self.throttle(host)
+
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {host}")
+
+        # Every exit must record an outcome or give back the half-open
+        # trial slot, or the host stays rejected for good
+        recorded = False
+        try:
+            async with throttle.slot():
+                started = time.monotonic()
+                try:
+                    response = await self.client.send(request, stream=stream)
+                except httpx.HTTPError:
+                    # Transport errors, but also redirect loops or bodies
+                    # that cannot be decoded
+                    throttle.record(time.monotonic() - started, ok=False)
+                    breaker.record_failure()
+                    recorded = True
+                    raise
+                latency = time.monotonic() - started
+
+            if response.status_code in RETRYABLE_STATUS:
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                throttle.record(latency, ok=False, pause=retry_after)
+                breaker.record_failure()
+                recorded = True
+                if stream:
+                    await response.aclose()
+                raise _RetryableResponse(response, retry_after)
+
+            throttle.record(latency, ok=True)
+            breaker.record_success()
+            recorded = True
+            return response
+        finally:
+            if not recorded:
+                # Cancelled (e.g. by a crawl timeout) or an unexpected error
+                breaker.release()
+
+    async def _send(self, request: httpx.Request, stream: bool) -> httpx.Response:
+        """Send a request with retries; returns the last response on exhaustion."""
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.retry_attempts),
+            wait=self._wait,
+            retry=retry_if_exception_type((httpx.TransportError, _RetryableResponse)),
+            reraise=True,
+        )
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    return await self._send_once(request, stream)
+        except _RetryableResponse as e:
+            logger.warning(
+                "Giving up on %s after %d attempts (HTTP %d)",
+                request.url,
+                self.retry_attempts,
+                e.response.status_code,
+            )
+            return e.response
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Fetch ``url`` (body fully read)."""
+        request = self.client.build_request("GET", url, **kwargs)
+        return await self._send(request, stream=False)
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[httpx.Response]:
+        """Stream a response body, retrying until headers are received."""
+        request = self.client.build_request(method, url, **kwargs)
+        response = await self._send(request, stream=True)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    def host_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host throttle and circuit state, for status output."""
+        stats = {}
+        for host, throttle in self._throttles.items():
+            breaker = self.breaker(host)
+            stats[host] = {
+                "circuit": breaker.state,
+                "delay": round(throttle.delay, 3),
+                "latency_ms": (
+                    round(throttle.latency * 1000, 1) if throttle.latency else None
+                ),
+                "error_rate": round(throttle.error_rate, 3),
+                "requests": throttle.requests,
+            }
+        return stats
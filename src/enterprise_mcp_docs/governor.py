@@ -0,0 +1,515 @@
+"""Memory guardrails with adaptive cache sizing.
+
+A :class:`ResourceGovernor` samples the process RSS against a memory
+budget (``resources.memory_budget_mb``, or a fraction of the container's
+cgroup memory limit) and adapts in-process memory users to it:
+
+* above ``high_watermark`` of the budget, registered consumers are
+  shrunk one at a time, cheapest to rebuild first (caches are halved,
+  idle index shards drop their inverted index), until RSS is back under
+  the watermark,
+* below ``low_watermark``, and no sooner than ``grow_delay`` seconds
+  after the last shrink, shrunk caches grow back step by step.
+
+Freed Python memory is only returned to the OS after a garbage
+collection and, with glibc, ``malloc_trim``; the governor does both after
+shrinking. Every action is kept in a short history that ``/health`` and
+``/metrics`` report. Processes publish their status as a JSON file in
+``status_dir`` so the health server can report on MCP server processes
+too.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import gc
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+)
+
+try:
+    import psutil
+except ImportError:  # psutil is optional; /proc is used instead
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+_CGROUP_LIMIT_FILES = (
+    "/sys/fs/cgroup/memory.max",  # cgroup v2
+    "/sys/fs/cgroup/memory/memory.limit_in_bytes",  # cgroup v1
+)
+# cgroup v1 reports "no limit" as a huge page-aligned number
+_UNLIMITED = 1 << 60
+
+MB = 1024 * 1024
+
+
+def process_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, if it can be measured."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def cgroup_memory_limit(paths: Iterable[str] = _CGROUP_LIMIT_FILES) -> Optional[int]:
+    """Memory limit of the container in bytes, None if unlimited or unknown."""
+    for path in paths:
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value == "max":
+            return None
+        try:
+            limit = int(value)
+        except ValueError:
+            continue
+        return limit if limit < _UNLIMITED else None
+    return None
+
+
+_libc: Any = None
+
+
+def release_memory() -> None:
+    """Collect garbage and hand freed heap memory back to the OS."""
+    global _libc
+    gc.collect()
+    if _libc is None:
+        name = ctypes.util.find_library("c")
+        try:
+            _libc = ctypes.CDLL(name) if name else False
+        except OSError:
+            _libc = False
+    if _libc and hasattr(_libc, "malloc_trim"):
+        _libc.malloc_trim(0)
+
+
+class Resizable:
+    """A cache whose capacity is halved under pressure and doubled back."""
+
+    def __init__(
+        self,
+        name: str,
+        get_size: Callable[[], int],
+        set_size: Callable[[int], None],
+        maximum: int,
+        minimum: int = 1,
+    ):
+        """Initialize the consumer.
+
+        Args:
+            name: Name used in actions and metrics
+            get_size: Returns the current capacity
+            set_size: Applies a new capacity (evicting as needed)
+            maximum: Configured capacity, never exceeded when growing
+            minimum: Capacity never shrunk below
+        """
+        self.name = name
+        self.get_size = get_size
+        self.set_size = set_size
+        self.maximum = maximum
+        self.minimum = min(minimum, maximum)
+
+    def shrink(self) -> Optional[str]:
+        current = self.get_size()
+        if current <= self.minimum:
+            return None
+        size = max(self.minimum, current // 2)
+        self.set_size(size)
+        return f"shrank {self.name} from {current} to {size}"
+
+    def grow(self) -> Optional[str]:
+        current = self.get_size()
+        if current >= self.maximum:
+            return None
+        size = min(self.maximum, max(current * 2, 1))
+        self.set_size(size)
+        return f"grew {self.name} from {current} to {size}"
+
+    def status(self) -> Dict[str, Any]:
+        return {"size": self.get_size(), "maximum": self.maximum}
+
+
+class IdleShards:
+    """Unloads the inverted index of index shards nobody searched recently.
+
+    Unloaded shards rebuild their index on the next search, so nothing
+    needs to grow back.
+    """
+
+    def __init__(
+        self,
+        shards: Callable[[], Dict[str, Any]],
+        idle_seconds: float = 600,
+        min_idle_seconds: float = 30,
+    ):
+        """Initialize the consumer.
+
+        Args:
+            shards: Returns the current shards by tool
+            idle_seconds: Shards idle this long are all unloaded at once
+            min_idle_seconds: Otherwise the least recently used shard is
+                unloaded if it has been idle at least this long
+        """
+        self.name = "index_shards"
+        self.shards = shards
+        self.idle_seconds = idle_seconds
+        self.min_idle_seconds = min_idle_seconds
+        self.unloaded = 0
+
+    def shrink(self) -> Optional[str]:
+        now = time.monotonic()
+        loaded = {
+            tool: now - (shard.last_used or 0.0)
+            for tool, shard in self.shards().items()
+            if shard.loaded
+        }
+        idle = [tool for tool, age in loaded.items() if age >= self.idle_seconds]
+        if not idle and loaded:
+            tool = max(loaded, key=loaded.get)
+            if loaded[tool] >= self.min_idle_seconds:
+                idle = [tool]
+        released = [tool for tool in sorted(idle) if self.shards()[tool].release()]
+        if not released:
+            return None
+        self.unloaded += len(released)
+        return f"unloaded idle shards {', '.join(released)}"
+
+    def grow(self) -> Optional[str]:
+        return None
+
+    def status(self) -> Dict[str, Any]:
+        shards = self.shards()
+        return {
+            "loaded": sum(1 for shard in shards.values() if shard.loaded),
+            "total": len(shards),
+            "unloaded": self.unloaded,
+        }
+
+
+class Releasable:
+    """A cache that can only be dropped (it refills on demand)."""
+
+    def __init__(self, name: str, release: Callable[[], bool]):
+        self.name = name
+        self.release = release
+
+    def shrink(self) -> Optional[str]:
+        return f"dropped {self.name}" if self.release() else None
+
+    def grow(self) -> Optional[str]:
+        return None
+
+    def status(self) -> Dict[str, Any]:
+        return {}
+
+
+class ResourceGovernor:
+    """Keeps process RSS under a memory budget by resizing consumers."""
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        name: str = "server",
+        rss: Callable[[], Optional[int]] = process_rss,
+    ):
+        """Initialize the governor.
+
+        Args:
+            config: The ``resources`` configuration section
+            name: Process role reported in status and metrics
+            rss: Returns the current RSS in bytes (for tests)
+        """
+        config = config or {}
+        self.name = name
+        self.enabled = config.get("enabled", True)
+        self.high_watermark = config.get("high_watermark", 0.9)
+        self.low_watermark = config.get("low_watermark", 0.7)
+        self.check_interval = config.get("check_interval", 10)
+        self.grow_delay = config.get("grow_delay", 60)
+        self.status_dir = config.get("status_dir")
+        self._rss = rss
+
+        budget_mb = config.get("memory_budget_mb")
+        if budget_mb:
+            self.budget: Optional[int] = int(budget_mb * MB)
+        else:
+            limit = cgroup_memory_limit()
+            fraction = config.get("cgroup_fraction", 0.8)
+            self.budget = int(limit * fraction) if limit else None
+
+        self.consumers: List[Any] = []
+        self.actions: Deque[Dict[str, Any]] = deque(maxlen=config.get("history", 50))
+        self.counters: Counter = Counter()
+        self.rss: Optional[int] = None
+        self.peak_rss = 0
+        self.level = "ok"
+        self._last_shrink = float("-inf")
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, consumer: Any) -> None:
+        """Add a consumer; consumers registered first are shrunk first."""
+        self.consumers.append(consumer)
+
+    def _measure(self) -> Optional[int]:
+        rss = self._rss()
+        if rss is not None:
+            self.rss = rss
+            self.peak_rss = max(self.peak_rss, rss)
+        return rss
+
+    def _record(self, kind: str, action: str) -> None:
+        self.counters[kind] += 1
+        self.actions.append(
+            {
+                "time": time.time(),
+                "kind": kind,
+                "action": action,
+                "rss_mb": round((self.rss or 0) / MB, 1),
+            }
+        )
+        logger.log(
+            logging.WARNING if kind == "shrink" else logging.INFO,
+            f"{'🧹' if kind == 'shrink' else '📈'} Memory governor {action} "
+            f"(RSS {(self.rss or 0) / MB:.0f} MB of {self.budget / MB:.0f} MB)",
+        )
+
+    def _settle(self) -> Optional[int]:
+        """Return freed memory to the OS and measure again."""
+        release_memory()
+        return self._measure()
+
+    def _check(self) -> Generator[Callable[[], Any], Any, List[str]]:
+        """Decisions of :meth:`check`.
+
+        Yields the blocking steps (reading RSS, collecting and trimming
+        the heap) for the caller to run, in a worker thread if it likes,
+        and receives their results; resizing happens in the caller's
+        thread.
+        """
+        rss = yield self._measure
+        if rss is None or not self.budget or not self.enabled:
+            return []
+
+        taken: List[str] = []
+        if rss > self.budget * self.high_watermark:
+            self.level = "high"
+            for consumer in self.consumers:
+                action = consumer.shrink()
+                if not action:
+                    continue
+                yield self._settle
+                self._last_shrink = time.monotonic()
+                self._record("shrink", action)
+                taken.append(action)
+                if (self.rss or 0) <= self.budget * self.high_watermark:
+                    break
+            if not taken:
+                self.counters["exhausted"] += 1
+        elif rss < self.budget * self.low_watermark:
+            self.level = "ok"
+            if time.monotonic() - self._last_shrink >= self.grow_delay:
+                for consumer in reversed(self.consumers):
+                    action = consumer.grow()
+                    if action:
+                        self._record("grow", action)
+                        taken.append(action)
+        else:
+            self.level = "elevated"
+        return taken
+
+    def check(self) -> List[str]:
+        """Measure RSS once and shrink or grow consumers as needed.
+
+        Returns:
+            Descriptions of the actions taken
+        """
+        steps = self._check()
+        try:
+            step = next(steps)
+            while True:
+                step = steps.send(step())
+        except StopIteration as done:
+            return done.value
+
+    async def check_async(self) -> List[str]:
+        """:meth:`check` for the event loop.
+
+        RSS reads, garbage collection and ``malloc_trim`` run in a worker
+        thread so in-flight requests are not stalled; consumers are
+        resized on the loop, where they are used.
+        """
+        steps = self._check()
+        try:
+            step = next(steps)
+            while True:
+                step = steps.send(await asyncio.to_thread(step))
+        except StopIteration as done:
+            return done.value
+
+    def status(self) -> Dict[str, Any]:
+        """Current state, consumers and recent actions."""
+        return {
+            "process": self.name,
+            "pid": os.getpid(),
+            "updated_at": time.time(),
+            "rss_bytes": self.rss,
+            "peak_rss_bytes": self.peak_rss,
+            "budget_bytes": self.budget,
+            "level": self.level,
+            "consumers": {c.name: c.status() for c in self.consumers},
+            "counters": dict(self.counters),
+            "recent_actions": list(self.actions)[-10:],
+        }
+
+    def publish(self, status: Optional[Dict[str, Any]] = None) -> None:
+        """Write ``status`` (default :meth:`status`) to ``status_dir``.
+
+        The health server aggregates these files.
+        """
+        if not self.status_dir:
+            return
+        path = Path(self.status_dir)
+        try:
+            path.mkdir(parents=True, exist_ok=True)
+            target = path / f"{self.name}-{os.getpid()}.json"
+            tmp = target.with_suffix(".tmp")
+            tmp.write_text(json.dumps(status or self.status()))
+            os.replace(tmp, target)
+        except OSError as e:
+            logger.debug("Cannot publish resource status: %s", e)
+
+    def unpublish(self) -> None:
+        if self.status_dir:
+            target = Path(self.status_dir) / f"{self.name}-{os.getpid()}.json"
+            try:
+                target.unlink()
+            except OSError:
+                pass
+
+    def _tick(self) -> None:
+        try:
+            self.check()
+        except Exception as e:
+            logger.error(f"❌ Memory governor check failed: {e}")
+        self.publish()
+
+    async def run(self) -> None:
+        """Check periodically until cancelled (for asyncio servers).
+
+        Only resizing runs on the event loop; measuring, collecting and
+        writing the status file happen in worker threads.
+        """
+        try:
+            while True:
+                try:
+                    await self.check_async()
+                except Exception as e:
+                    logger.error(f"❌ Memory governor check failed: {e}")
+                # Snapshot on the loop, write in a thread
+                await asyncio.to_thread(self.publish, self.status())
+                await asyncio.sleep(self.check_interval)
+        finally:
+            self.unpublish()
+
+    def start(self) -> None:
+        """Check periodically in a daemon thread."""
+
+        def loop() -> None:
+            while not self._stopping.is_set():
+                self._tick()
+                self._stopping.wait(self.check_interval)
+            self.unpublish()
+
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=loop, name="resource-governor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def read_published(status_dir: Optional[str], max_age: float = 120) -> List[Dict]:
+    """Statuses published by other processes that are still alive."""
+    if not status_dir or not os.path.isdir(status_dir):
+        return []
+    statuses = []
+    now = time.time()
+    for path in sorted(Path(status_dir).glob("*.json")):
+        try:
+            status = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if now - status.get("updated_at", 0) > max_age:
+            continue
+        statuses.append(status)
+    return statuses
+
+
+def render_metrics(statuses: Iterable[Dict[str, Any]]) -> str:
+    """Render statuses in the Prometheus text exposition format."""
+    gauges = {
+        "mcp_docs_memory_rss_bytes": ("Resident set size", "rss_bytes"),
+        "mcp_docs_memory_peak_rss_bytes": ("Peak resident set size", "peak_rss_bytes"),
+        "mcp_docs_memory_budget_bytes": ("Memory budget", "budget_bytes"),
+    }
+    statuses = list(statuses)
+    lines: List[str] = []
+    for metric, (help_text, key) in gauges.items():
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        for status in statuses:
+            if status.get(key) is not None:
+                labels = f'process="{status["process"]}",pid="{status["pid"]}"'
+                lines.append(f"{metric}{{{labels}}} {status[key]}")
+
+    metric = "mcp_docs_memory_governor_actions_total"
+    lines += [
+        f"# HELP {metric} Cache shrink/grow actions taken",
+        f"# TYPE {metric} counter",
+    ]
+    for status in statuses:
+        for kind, count in sorted(status.get("counters", {}).items()):
+            labels = f'process="{status["process"]}",pid="{status["pid"]}"'
+            lines.append(f'{metric}{{{labels},kind="{kind}"}} {count}')
+
+    metric = "mcp_docs_cache_capacity"
+    lines += [
+        f"# HELP {metric} Current capacity of resizable caches",
+        f"# TYPE {metric} gauge",
+    ]
+    for status in statuses:
+        for name, consumer in sorted(status.get("consumers", {}).items()):
+            size = consumer.get("size", consumer.get("loaded"))
+            if size is None:
+                continue
+            labels = (
+                f'process="{status["process"]}",pid="{status["pid"]}",'
+                f'cache="{name}"'
+            )
+            lines.append(f"{metric}{{{labels}}} {size}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,988 @@
+"""Documentation index.
+
+Parsed documentation is organized in one shard per tool. Each shard holds
+the tool's documents, split into heading-delimited chunks, and a positional
+inverted index over those chunks (see :mod:`enterprise_mcp_docs.lexical`).
+Indexes are built from the raw-page cache (see
+:mod:`enterprise_mcp_docs.page_cache`) and persisted per shard as gzipped
+JSON plus a block-compressed text store (see
+:mod:`enterprise_mcp_docs.textstore`), with a small manifest. Chunk text
+of a loaded index stays compressed until it is read.
+"""
+
+import functools
+import gzip
+import hashlib
+import heapq
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from bs4 import BeautifulSoup
+
+from .dedup import DEFAULT_DISTANCE, cluster, collapse_hits, version_key
+from .discovery import canonicalize_url, match_section
+from .lexical import LexicalIndex, Query, tokenize
+from .textstore import (
+    DEFAULT_CACHE_BLOCKS,
+    MISSING_ZSTD,
+    TextStore,
+    codec_available,
+    read_codec,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT = 2
+# Format 1 kept chunk text inline in the shard JSON
+READABLE_INDEX_FORMATS = (1, 2)
+# Times load() re-reads the manifest when a concurrent save removed files
+LOAD_ATTEMPTS = 3
+
+VERSION_RE = re.compile(
+    r"/(v?\d+(?:\.\d+)*(?:\.x)?|current|latest|stable|main|master)(?=/)"
+)
+
+HEADING_TAGS = ["h1", "h2", "h3"]
+BLOCK_TAGS = ["p", "li", "pre", "dt", "dd", "td", "th", "blockquote", "h4", "h5"]
+NOISE_TAGS = [
+    "script",
+    "style",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "noscript",
+    "form",
+    "svg",
+    "button",
+]
+
+MAX_CHUNK_CHARS = 1500
+
+
+def detect_version(url: str) -> Optional[str]:
+    """Extract a documentation version (``3.12``, ``8.x``, ``current``) from a URL."""
+    match = VERSION_RE.search(url)
+    return match.group(1) if match else None
+
+
+def document_id(url: str) -> str:
+    """Stable document identifier derived from the canonical URL."""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+# A text, or a zero-argument callable that loads it (see ``_lazy_text``)
+TextSource = Union[str, Callable[[], str]]
+
+
+def _lazy_text(memoize: bool) -> property:
+    """``text`` property that accepts a loader and calls it on access.
+
+    Chunks of a loaded index are given loaders reading from the shard's
+    :class:`~enterprise_mcp_docs.textstore.TextStore`, so their text is
+    only decompressed when something actually reads it.
+    """
+
+    def get(self) -> str:
+        text = self.__dict__["_text"]
+        if callable(text):
+            loaded = text()
+            if memoize:
+                self.__dict__["_text"] = loaded
+            return loaded
+        return text
+
+    def set(self, value: TextSource) -> None:
+        self.__dict__["_text"] = value
+
+    return property(get, set)
+
+
+@dataclass
+class Chunk:
+    """A heading-delimited piece of a document."""
+
+    chunk_id: str
+    heading: str
+    text: TextSource
+    code: List[str] = field(default_factory=list)
+
+    def text_source(self) -> TextSource:
+        """The text, or its loader if it has not been read."""
+        return self.__dict__["_text"]
+
+
+# Not memoized: decompressed text lives in the store's block LRU only
+Chunk.text = _lazy_text(memoize=False)  # type: ignore[assignment]
+
+
+@dataclass
+class Document:
+    """A parsed documentation page."""
+
+    doc_id: str
+    tool: str
+    url: str
+    title: str
+    section: Optional[str] = None
+    version: Optional[str] = None
+    fetched_at: Optional[float] = None
+    chunks: List[Chunk] = field(default_factory=list)
+    # Near-duplicates share the representative's content: a duplicate keeps
+    # no chunks and points at its representative, which lists the variants.
+    duplicate_of: Optional[str] = None
+    variants: List[Dict[str, Optional[str]]] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Full plain text of the document."""
+        return "\n\n".join(chunk.text for chunk in self.chunks)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(
+        cls, data: Dict[str, Any], texts: Optional[TextStore] = None
+    ) -> "Document":
+        """Rebuild a document; chunks with a ``text_ref`` read from ``texts``."""
+        data = dict(data)
+        chunks = []
+        for chunk in data.get("chunks", []):
+            chunk = dict(chunk)
+            ref = chunk.pop("text_ref", None)
+            if ref is not None:
+                chunk["text"] = functools.partial(texts.get, ref)
+            chunks.append(Chunk(**chunk))
+        data["chunks"] = chunks
+        return cls(**data)
+
+
+@dataclass
+class SearchHit:
+    """A chunk matching a search query."""
+
+    tool: str
+    doc_id: str
+    chunk_id: str
+    url: str
+    title: str
+    heading: str
+    text: TextSource
+    score: float
+    version: Optional[str] = None
+    section: Optional[str] = None
+    alternates: List[Dict[str, Optional[str]]] = field(default_factory=list)
+
+    def to_dict(self, include_text: bool = True) -> Dict[str, Any]:
+        """Serialize the hit; without text, see :meth:`IndexShard.hit_from_dict`."""
+        data = {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if include_text or f.name != "text"
+        }
+        data["alternates"] = [dict(alt) for alt in self.alternates]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SearchHit":
+        data = dict(data)
+        # Copy alternates: merging appends to them
+        data["alternates"] = [dict(alt) for alt in data.get("alternates", [])]
+        return cls(**data)
+
+
+# Memoized: a hit's text is read at most once, after ranking
+SearchHit.text = _lazy_text(memoize=True)  # type: ignore[assignment]
+
+
+def parse_html(
+    html: Union[str, bytes],
+    url: str,
+    tool: str,
+    section: Optional[str] = None,
+    fetched_at: Optional[float] = None,
+) -> Optional[Document]:
+    """Parse an HTML page into a chunked :class:`Document`.
+
+    Navigation, headers, footers and scripts are stripped; the remaining
+    main content is split into chunks at ``h1``-``h3`` headings. Code
+    blocks are kept verbatim alongside each chunk.
+
+    Args:
+        html: Raw page content
+        url: Canonical page URL
+        tool: Tool the page belongs to
+        section: Configured section the page belongs to
+        fetched_at: Fetch timestamp
+
+    Returns:
+        The parsed document, or None if the page has no text content
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    title = ""
+    if soup.title and soup.title.string:
+        title = soup.title.string.strip()
+
+    for tag in soup(NOISE_TAGS):
+        tag.decompose()
+
+    root = (
+        soup.find("main")
+        or soup.find("article")
+        or soup.find(attrs={"role": "main"})
+        or soup.body
+        or soup
+    )
+    if not title:
+        h1 = root.find("h1")
+        title = h1.get_text(" ", strip=True) if h1 else url
+
+    doc_id = document_id(url)
+    chunks: List[Chunk] = []
+    heading = title
+    parts: List[str] = []
+    code: List[str] = []
+    size = 0
+
+    def flush() -> None:
+        nonlocal parts, code, size
+        if parts:
+            chunks.append(
+                Chunk(
+                    chunk_id=f"{doc_id}#{len(chunks)}",
+                    heading=heading,
+                    text="\n".join(parts),
+                    code=code,
+                )
+            )
+        parts, code, size = [], [], 0
+
+    for element in root.find_all(HEADING_TAGS + BLOCK_TAGS):
+        if element.find_parent(BLOCK_TAGS) is not None:
+            continue  # text already captured by the enclosing block
+
+        if element.name in HEADING_TAGS:
+            flush()
+            heading = element.get_text(" ", strip=True).rstrip("¶#").strip() or title
+            continue
+
+        if element.name == "pre":
+            text = element.get_text().strip("\n")
+            blocks = [text]
+        else:
+            text = element.get_text(" ", strip=True)
+            blocks = [pre.get_text().strip("\n") for pre in element.find_all("pre")]
+        if not text:
+            continue
+
+        if size + len(text) > MAX_CHUNK_CHARS and parts:
+            flush()
+        parts.append(text)
+        code.extend(b for b in blocks if b)
+        size += len(text)
+
+    flush()
+    if not chunks:
+        return None
+
+    return Document(
+        doc_id=doc_id,
+        tool=tool,
+        url=url,
+        title=title,
+        section=section,
+        version=detect_version(url),
+        fetched_at=fetched_at,
+        chunks=chunks,
+    )
+
+
+class IndexShard:
+    """Documents and a positional inverted index for a single tool."""
+
+    def __init__(
+        self,
+        tool: str,
+        documents: Optional[Iterable[Document]] = None,
+        built_at: Optional[str] = None,
+        texts: Optional[TextStore] = None,
+    ):
+        self.tool = tool
+        self.documents: Dict[str, Document] = {}
+        self.built_at = built_at or datetime.now(timezone.utc).isoformat()
+        # Compressed chunk text of a loaded shard
+        self.texts = texts
+        self._chunk_refs: List[Tuple[str, int]] = []
+        self._lexical = LexicalIndex()
+        self._dirty = True
+        # Guards building and releasing the inverted index
+        self._lock = threading.Lock()
+        # time.monotonic() of the last search, None if never searched
+        self.last_used: Optional[float] = None
+        for document in documents or []:
+            self.add_document(document)
+
+    def add_document(self, document: Document) -> None:
+        """Add (or replace) a document."""
+        self.documents[document.doc_id] = document
+        self._dirty = True
+
+    @property
+    def chunk_count(self) -> int:
+        return sum(len(doc.chunks) for doc in self.documents.values())
+
+    @property
+    def duplicate_count(self) -> int:
+        return sum(1 for doc in self.documents.values() if doc.duplicate_of)
+
+    def deduplicate(self, distance: int = DEFAULT_DISTANCE) -> int:
+        """Fold near-duplicate documents onto a single representative.
+
+        The newest version in each cluster (see
+        :func:`~enterprise_mcp_docs.dedup.version_key`) keeps the content;
+        the other members drop their chunks and are listed as its variants.
+
+        Args:
+            distance: Maximum SimHash Hamming distance between duplicates
+
+        Returns:
+            Number of documents folded into a representative
+        """
+        candidates = {
+            doc.doc_id: tokenize(doc.text)
+            for doc in self.documents.values()
+            if doc.duplicate_of is None
+        }
+
+        folded = 0
+        for members in cluster(candidates, distance):
+            docs = sorted(
+                (self.documents[doc_id] for doc_id in members),
+                key=lambda d: (version_key(d.version), -len(d.url)),
+                reverse=True,
+            )
+            representative = docs[0]
+            for duplicate in docs[1:]:
+                representative.variants.append(
+                    {"url": duplicate.url, "version": duplicate.version}
+                )
+                representative.variants.extend(duplicate.variants)
+                duplicate.variants = []
+                duplicate.chunks = []
+                duplicate.duplicate_of = representative.doc_id
+                folded += 1
+
+        if folded:
+            self._dirty = True
+            logger.info("Folded %d near-duplicate %s documents", folded, self.tool)
+        return folded
+
+    def resolve(self, document: Document) -> Document:
+        """Return the document holding ``document``'s content."""
+        if document.duplicate_of and document.duplicate_of in self.documents:
+            return self.documents[document.duplicate_of]
+        return document
+
+    def _build(self) -> None:
+        """(Re)build the inverted index from the documents."""
+        lexical = LexicalIndex()
+        refs: List[Tuple[str, int]] = []
+
+        for doc in self.documents.values():
+            for position, chunk in enumerate(doc.chunks):
+                lexical.add(doc.title, chunk.heading, chunk.text, chunk.code)
+                refs.append((doc.doc_id, position))
+
+        lexical.finish()
+        if self.texts is not None:
+            # Indexing read every block; keep the LRU for query traffic
+            self.texts.clear_cache()
+        self._lexical = lexical
+        self._chunk_refs = refs
+        self._dirty = False
+
+    def search(
+        self, query: Union[str, Query], limit: int = 10, min_score: float = 0.0
+    ) -> List[SearchHit]:
+        """Rank chunks against ``query`` with BM25.
+
+        Besides free text, queries support ``"exact phrases"``, ``code:``
+        and ``title:`` fields and ``prefix*``/wildcard terms (see
+        :mod:`enterprise_mcp_docs.lexical`).
+
+        Args:
+            query: Query string, or an already parsed (e.g. synonym
+                expanded) query
+            limit: Maximum number of hits
+            min_score: Leave out hits scoring lower (see
+                :class:`TopScores`)
+
+        Returns:
+            Hits ordered by descending score
+        """
+        lexical, refs = self._snapshot()
+        ranked = lexical.search(query, limit, min_score)
+        return [self._hit(refs[ordinal], score) for ordinal, score in ranked]
+
+    def max_score(self, query: Union[str, Query]) -> Optional[float]:
+        """Upper bound of any hit's score for ``query``.
+
+        Returns:
+            The bound, or None if the inverted index is not built (it is
+            not built just for this)
+        """
+        with self._lock:
+            if self._dirty:
+                return None
+            lexical = self._lexical
+        return lexical.max_score(query)
+
+    def _snapshot(self) -> Tuple[LexicalIndex, List[Tuple[str, int]]]:
+        """The inverted index and its chunk refs, building them if needed."""
+        self.last_used = time.monotonic()
+        with self._lock:
+            if self._dirty:
+                self._build()
+            return self._lexical, self._chunk_refs
+
+    @property
+    def loaded(self) -> bool:
+        """True if the inverted index is built."""
+        return not self._dirty
+
+    def load(self) -> bool:
+        """Build the inverted index now rather than on the next search.
+
+        Returns:
+            True if the index had to be built
+        """
+        built = self._dirty
+        self._snapshot()
+        return built
+
+    def release(self) -> bool:
+        """Drop the inverted index and cached text to free memory.
+
+        Documents stay loaded; the index is rebuilt on the next search.
+
+        Returns:
+            True if an index was dropped
+        """
+        with self._lock:
+            if self._dirty:
+                return False
+            self._lexical = LexicalIndex()
+            self._chunk_refs = []
+            self._dirty = True
+        if self.texts is not None:
+            self.texts.clear_cache()
+        return True
+
+    def _hit(self, ref: Tuple[str, int], score: float) -> SearchHit:
+        doc_id, position = ref
+        doc = self.documents[doc_id]
+        chunk = doc.chunks[position]
+        return SearchHit(
+            tool=self.tool,
+            doc_id=doc_id,
+            chunk_id=chunk.chunk_id,
+            url=doc.url,
+            title=doc.title,
+            heading=chunk.heading,
+            text=chunk.text_source(),
+            score=score,
+            version=doc.version,
+            section=doc.section,
+            alternates=[dict(variant) for variant in doc.variants],
+        )
+
+    def hit_from_dict(self, data: Dict[str, Any]) -> SearchHit:
+        """Rebuild a hit serialized without text, reading text from the shard."""
+        if "text" in data:
+            return SearchHit.from_dict(data)
+        text: TextSource = ""
+        doc = self.documents.get(data["doc_id"])
+        for chunk in doc.chunks if doc else []:
+            if chunk.chunk_id == data["chunk_id"]:
+                text = chunk.text_source()
+                break
+        return SearchHit.from_dict(dict(data, text=text))
+
+    def find_document(self, topic: str) -> Optional[Document]:
+        """Find the document that best matches a topic.
+
+        Exact URL, title and section matches win; otherwise the document
+        owning the best-scoring chunk is returned.
+        """
+        needle = topic.strip().lower()
+        if not needle:
+            return None
+        for doc in self.documents.values():
+            if doc.url.lower().rstrip("/").endswith(needle.rstrip("/")):
+                return self.resolve(doc)
+        for doc in self.documents.values():
+            if doc.title.lower() == needle:
+                return self.resolve(doc)
+
+        hits = self.search(topic, limit=1)
+        return self.documents[hits[0].doc_id] if hits else None
+
+    def versions(self) -> List[str]:
+        """Documentation versions present in the shard."""
+        return sorted({d.version for d in self.documents.values() if d.version})
+
+    def last_crawled(self) -> Optional[float]:
+        """Most recent fetch time of any document in the shard."""
+        times = [d.fetched_at for d in self.documents.values() if d.fetched_at]
+        return max(times) if times else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self.documents),
+            "duplicates": self.duplicate_count,
+            "chunks": self.chunk_count,
+            "built_at": self.built_at,
+            "last_crawled": self.last_crawled(),
+            "versions": self.versions(),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tool": self.tool,
+            "built_at": self.built_at,
+            "documents": [doc.to_dict() for doc in self.documents.values()],
+        }
+
+    def to_stored(
+        self, codec: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], TextStore]:
+        """Split the shard into JSON-able metadata and a compressed text store.
+
+        Chunk text is replaced by a ``text_ref`` into the returned store.
+
+        Args:
+            codec: Text store codec (see :mod:`enterprise_mcp_docs.textstore`)
+        """
+        texts: List[str] = []
+        documents = []
+        for doc in self.documents.values():
+            data = doc.to_dict()
+            for chunk in data["chunks"]:
+                chunk["text_ref"] = len(texts)
+                texts.append(chunk.pop("text"))
+            documents.append(data)
+        metadata = {
+            "tool": self.tool,
+            "built_at": self.built_at,
+            "documents": documents,
+        }
+        return metadata, TextStore.build(texts, codec)
+
+    @classmethod
+    def from_dict(
+        cls, data: Dict[str, Any], texts: Optional[TextStore] = None
+    ) -> "IndexShard":
+        return cls(
+            data["tool"],
+            documents=(Document.from_dict(d, texts) for d in data.get("documents", [])),
+            built_at=data.get("built_at"),
+            texts=texts,
+        )
+
+
+def candidate_count(limit: int) -> int:
+    """Hits to fetch per shard so that collapsing still fills ``limit``."""
+    return limit * 2
+
+
+class TopScores:
+    """The ``k`` highest scores seen so far across shards.
+
+    Once ``k`` scores are known, a hit scoring below :attr:`threshold`
+    cannot make the merged top ``k``, so later shards are searched with
+    it as their ``min_score``.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, scores: Iterable[float]) -> None:
+        for score in scores:
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, score)
+            elif score > self._heap[0]:
+                heapq.heapreplace(self._heap, score)
+
+    @property
+    def threshold(self) -> float:
+        """Lowest score still in the top ``k``, 0 until ``k`` are known."""
+        if self.k <= 0 or len(self._heap) < self.k:
+            return 0.0
+        return self._heap[0]
+
+
+def merge_hits(
+    hits: Iterable[SearchHit],
+    limit: int,
+    rerank: Optional[Callable[[List[SearchHit]], List[SearchHit]]] = None,
+) -> List[SearchHit]:
+    """Merge per-shard hits by score and collapse near-duplicates.
+
+    ``rerank`` may re-order the score-ordered hits before collapsing
+    (see :mod:`enterprise_mcp_docs.rerank`).
+    """
+    ranked = sorted(hits, key=lambda hit: hit.score, reverse=True)
+    if rerank is not None:
+        ranked = rerank(ranked)
+    return collapse_hits(ranked, limit, tokenize)
+
+
+class DocumentIndex:
+    """Collection of per-tool index shards."""
+
+    def __init__(self, shards: Optional[Dict[str, IndexShard]] = None):
+        self.shards: Dict[str, IndexShard] = dict(shards or {})
+        # Size of each persisted shard file in bytes
+        self.sizes: Dict[str, int] = {}
+
+    @property
+    def tools(self) -> List[str]:
+        return sorted(self.shards)
+
+    def __bool__(self) -> bool:
+        return any(shard.documents for shard in self.shards.values())
+
+    def search(
+        self,
+        query: Union[str, Query],
+        tools: Optional[Iterable[str]] = None,
+        limit: int = 10,
+    ) -> List[SearchHit]:
+        """Search one or more tool shards and merge the results by score.
+
+        Hits with (near-)identical text are collapsed into one result that
+        lists the others as alternates, so duplicates never use up
+        ``limit`` slots.
+        """
+        names = list(tools) if tools else self.tools
+        candidates = candidate_count(limit)
+        top = TopScores(candidates)
+        hits: List[SearchHit] = []
+        for name in names:
+            shard = self.shards.get(name)
+            if shard is not None:
+                shard_hits = shard.search(query, candidates, top.threshold)
+                top.add(hit.score for hit in shard_hits)
+                hits.extend(shard_hits)
+        return merge_hits(hits, limit)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: dict(shard.stats(), size_bytes=self.sizes.get(name))
+            for name, shard in self.shards.items()
+        }
+
+    def save(
+        self, path: Union[str, Path], codec: Optional[str] = None, merge: bool = False
+    ) -> None:
+        """Persist the index to ``path``.
+
+        Each shard is written as gzipped JSON (``shards/<tool>.<gen>.json.gz``)
+        and a compressed text store (``shards/<tool>.<gen>.text``), where
+        ``<gen>`` is new for every save. Files are never overwritten: the
+        manifest is replaced last and is the only commit point, so a
+        concurrent :meth:`load` sees either the old or the new pair, never
+        a mix. Files no longer referenced are deleted afterwards. The
+        manifest records each store's codec, so hosts that cannot read it
+        refuse the index up front. Postings are not stored; they are rebuilt
+        from the documents when a shard is first searched.
+
+        Args:
+            path: Index directory
+            codec: Text store codec; the portable default is zlib
+            merge: Only write this index's shards and keep the other shards
+                already saved at ``path`` (used to rebuild a few tools)
+        """
+        path = Path(path)
+        shards_path = path / "shards"
+        shards_path.mkdir(parents=True, exist_ok=True)
+        with lock_index(path):
+            self._save(path, codec, merge)
+
+    def _save(self, path: Path, codec: Optional[str], merge: bool) -> None:
+        shards_path = path / "shards"
+        generation = f"{time.time_ns():x}"
+        manifest: Dict[str, Any] = {
+            "format": INDEX_FORMAT,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "tools": {},
+        }
+        if merge:
+            manifest["tools"].update(self.read_manifest(path).get("tools", {}))
+        for name, shard in self.shards.items():
+            filename = f"{name}.{generation}.json.gz"
+            text_filename = f"{name}.{generation}.text"
+            metadata, texts = shard.to_stored(codec)
+            data = gzip.compress(json.dumps(metadata).encode("utf-8"))
+            text_data = texts.to_bytes()
+            _atomic_write(shards_path / text_filename, text_data)
+            _atomic_write(shards_path / filename, data)
+            size = len(data) + len(text_data)
+            self.sizes[name] = size
+            manifest["tools"][name] = dict(
+                shard.stats(),
+                file=f"shards/{filename}",
+                text_file=f"shards/{text_filename}",
+                text_codec=texts.codec,
+                size_bytes=size,
+            )
+
+        _atomic_write(
+            path / "manifest.json", json.dumps(manifest, indent=2).encode("utf-8")
+        )
+
+        referenced = {
+            Path(info[key]).name
+            for info in manifest["tools"].values()
+            for key in ("file", "text_file")
+            if info.get(key)
+        }
+        for file in shards_path.iterdir():
+            if file.name not in referenced:
+                try:
+                    file.unlink()
+                except OSError as e:
+                    logger.warning("Cannot remove old index file %s: %s", file, e)
+
+    @classmethod
+    def load(
+        cls, path: Union[str, Path], cache_blocks: int = DEFAULT_CACHE_BLOCKS
+    ) -> "DocumentIndex":
+        """Load an index saved with :meth:`save`.
+
+        A missing index yields an empty :class:`DocumentIndex`.
+
+        Args:
+            path: Index directory
+            cache_blocks: Decompressed text blocks cached per shard
+        """
+        path = Path(path)
+        for attempt in range(LOAD_ATTEMPTS):
+            manifest = cls.read_manifest(path)
+            if not manifest:
+                return cls()
+            cls.check_codecs(path, manifest)
+            try:
+                return cls._load_shards(path, manifest, cache_blocks)
+            except FileNotFoundError:
+                # A save replaced the manifest and removed the files it
+                # referenced; the new manifest is complete
+                if attempt == LOAD_ATTEMPTS - 1:
+                    raise
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    @classmethod
+    def _load_shards(
+        cls, path: Path, manifest: Dict[str, Any], cache_blocks: int
+    ) -> "DocumentIndex":
+        shards = {}
+        sizes = {}
+        for name, info in manifest.get("tools", {}).items():
+            raw = (path / info["file"]).read_bytes()
+            texts = None
+            size = len(raw)
+            if info.get("text_file"):
+                text_data = (path / info["text_file"]).read_bytes()
+                texts = TextStore.from_bytes(text_data, cache_blocks)
+                size += len(text_data)
+            shards[name] = IndexShard.from_dict(json.loads(gzip.decompress(raw)), texts)
+            sizes[name] = size
+        index = cls(shards)
+        index.sizes = sizes
+        return index
+
+    @staticmethod
+    def text_codecs(
+        path: Union[str, Path], manifest: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, str]:
+        """Text store codec of each shard of the index at ``path``.
+
+        Manifests written before codecs were recorded are completed by
+        reading the header of each text store.
+        """
+        path = Path(path)
+        if manifest is None:
+            manifest = DocumentIndex.read_manifest(path)
+        codecs = {}
+        for name, info in manifest.get("tools", {}).items():
+            if info.get("text_codec"):
+                codecs[name] = info["text_codec"]
+            elif info.get("text_file"):
+                codecs[name] = read_codec(path / info["text_file"])
+        return codecs
+
+    @staticmethod
+    def check_codecs(
+        path: Union[str, Path], manifest: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Make sure every text store of the index at ``path`` is readable here.
+
+        Raises:
+            ValueError: Naming the shards and the missing package
+        """
+        codecs = DocumentIndex.text_codecs(path, manifest)
+        unreadable = sorted(
+            name for name, codec in codecs.items() if not codec_available(codec)
+        )
+        if unreadable:
+            raise ValueError(
+                f"Index at {path} cannot be loaded here: shards "
+                f"{', '.join(unreadable)} use the {MISSING_ZSTD}"
+            )
+
+    @staticmethod
+    def read_manifest(path: Union[str, Path]) -> Dict[str, Any]:
+        """Read an index manifest without loading any shards.
+
+        Returns:
+            The manifest, or an empty dict if there is no index at ``path``
+        """
+        manifest_path = Path(path) / "manifest.json"
+        if not manifest_path.exists():
+            return {}
+
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("format") not in READABLE_INDEX_FORMATS:
+            raise ValueError(
+                f"Unsupported index format {manifest.get('format')} in {path}"
+            )
+        return manifest
+
+
+@contextmanager
+def lock_index(path: Union[str, Path]) -> Iterator[None]:
+    """Hold the exclusive lock for writing the index at ``path``.
+
+    The lock file sits next to the index directory (``<path>.lock``), so
+    it also covers swapping the whole directory. Where ``fcntl`` is not
+    available (Windows) only one writer must run at a time.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` so readers see the old or new file.
+
+    Each call writes its own temporary file, so concurrent writers of the
+    same path never mix their bytes, and the data is on disk before the
+    rename publishes it.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as tmp:
+        try:
+            tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    try:
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+
+def build_shard(
+    tool: str,
+    pages: Iterable[Any],
+    tool_config: Dict[str, Any],
+    dedup_distance: Optional[int] = DEFAULT_DISTANCE,
+) -> IndexShard:
+    """Build a shard for ``tool`` from cached pages.
+
+    Args:
+        tool: Tool name
+        pages: Cached pages with ``url``, ``content`` and ``fetched_at``
+        tool_config: Tool configuration (``base_url`` and ``sections``)
+        dedup_distance: SimHash distance for near-duplicate folding
+            (None disables deduplication)
+
+    Returns:
+        The new index shard
+    """
+    base_url = canonicalize_url(tool_config.get("base_url", "")) or ""
+    if base_url and not base_url.endswith("/"):
+        base_url += "/"
+    sections = tool_config.get("sections", [])
+
+    shard = IndexShard(tool)
+    for page in pages:
+        section = match_section(page.url, base_url, sections) if base_url else None
+        try:
+            document = parse_html(
+                page.content,
+                page.url,
+                tool,
+                section=section or None,
+                fetched_at=page.fetched_at,
+            )
+        except Exception as e:
+            logger.warning("Failed to parse %s: %s", page.url, e)
+            continue
+        if document is not None:
+            shard.add_document(document)
+
+    if dedup_distance is not None:
+        shard.deduplicate(dedup_distance)
+
+    logger.info(
+        "Built %s shard: %d documents (%d duplicates), %d chunks",
+        tool,
+        len(shard.documents),
+        shard.duplicate_count,
+        shard.chunk_count,
+    )
+    return shard
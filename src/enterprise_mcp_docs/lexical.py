@@ -0,0 +1,547 @@
+"""Lexical query engine over a positional inverted index.
+
+Free-text search handles prose well but exact identifiers such as
+``index.number_of_replicas``, ``docker compose up --wait`` or
+``PUT _ilm/policy`` need exact matching. Queries therefore support:
+
+* ``"exact phrase"`` - terms must appear consecutively (required),
+* ``code:term`` / ``code:"phrase"`` - match only inside code blocks,
+* ``title:term`` - match only in page titles and headings,
+* ``term*`` / ``te?m`` / ``*suffix`` - prefix, wildcard and suffix terms,
+* bare words - scored with BM25; a bare word made of several tokens
+  (an identifier like ``number_of_replicas``) additionally earns a
+  phrase bonus when its tokens appear in order.
+
+Phrases and fielded clauses are required; bare words and wildcards are
+optional and only contribute to the score. Positions are recorded for
+every token (stopwords included) so phrases match exactly.
+
+Wildcard expansion uses a sorted term dictionary: the literal prefix of
+a pattern is located with binary search and only that range is
+examined. A second dictionary of reversed terms serves leading
+wildcards (``*replicas``) the same way. Patterns with wildcards at both
+ends (``*replica*``) have no literal range, so they fall back to a scan
+of the dictionary that stops after ``MAX_UNANCHORED_SCAN`` terms.
+
+Every term also stores its maximum BM25 term-frequency component, which
+bounds the score any chunk can get from it. :meth:`LexicalIndex.search`
+uses these bounds MaxScore-style when given a ``min_score``: an index
+whose best possible score is lower returns nothing at once, and chunks
+that only match clauses whose bounds add up to less than ``min_score``
+are never scored.
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how i in is it of on or that the this to "
+    "what when where which with you".split()
+)
+
+# Searchable fields
+TEXT = "text"
+CODE = "code"
+TITLE = "title"
+FIELDS = (TEXT, CODE, TITLE)
+
+# Position gap between separately indexed parts (title, heading, body,
+# individual code blocks) so that phrases never span two parts
+POSITION_GAP = 16
+
+# Maximum number of dictionary terms a wildcard expands to
+MAX_EXPANSIONS = 64
+# Dictionary terms examined for a pattern with wildcards at both ends
+MAX_UNANCHORED_SCAN = 50_000
+
+# Score multiplier for an identifier's tokens appearing in order
+IDENTIFIER_PHRASE_BOOST = 2.0
+
+WILDCARD_CHARS = "*?"
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Relative slack on min_score: pruning adds clause scores in a different
+# order, which can change a sum in its last bits
+SCORE_EPSILON = 1e-9
+
+_CLAUSE_RE = re.compile(
+    r'(?:(?P<field>[a-z]+):)?(?:"(?P<phrase>[^"]*)"?|(?P<word>[^\s"]+))',
+    re.IGNORECASE,
+)
+_PATTERN_RE = re.compile(r"[a-z0-9*?]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase index terms, dropping stopwords."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def all_tokens(text: str) -> List[str]:
+    """Split text into lowercase tokens, keeping stopwords (for positions)."""
+    return TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class Clause:
+    """One parsed query clause.
+
+    ``kind`` is ``term``, ``phrase`` or ``wildcard``. Required clauses
+    must match for a chunk to be returned; optional clauses only add to
+    the score.
+    """
+
+    kind: str
+    terms: List[str]
+    field: str = TEXT
+    required: bool = False
+    boost: float = 1.0
+
+
+@dataclass
+class Query:
+    """A parsed lexical query."""
+
+    clauses: List[Clause] = field(default_factory=list)
+
+    @property
+    def required(self) -> List[Clause]:
+        return [clause for clause in self.clauses if clause.required]
+
+    @property
+    def optional(self) -> List[Clause]:
+        return [clause for clause in self.clauses if not clause.required]
+
+    def __bool__(self) -> bool:
+        return bool(self.clauses)
+
+
+def _word_clauses(word: str, field_name: str, required: bool) -> List[Clause]:
+    """Clauses for an unquoted word (possibly a wildcard or identifier)."""
+    word = word.lower()
+    if any(char in word for char in WILDCARD_CHARS):
+        clauses = []
+        for piece in _PATTERN_RE.findall(word):
+            if any(char in piece for char in WILDCARD_CHARS):
+                if piece.strip(WILDCARD_CHARS):
+                    clauses.append(
+                        Clause("wildcard", [piece], field_name, required=required)
+                    )
+            else:
+                clauses.append(Clause("term", [piece], field_name, required=required))
+        return clauses
+
+    tokens = all_tokens(word)
+    if len(tokens) == 1:
+        return [Clause("term", tokens, field_name, required=required)]
+    if not tokens:
+        return []
+    if required:
+        return [Clause("phrase", tokens, field_name, required=True)]
+
+    # Identifier: score its tokens individually, reward exact order
+    clauses = [
+        Clause("term", [token], field_name)
+        for token in tokens
+        if token not in STOPWORDS
+    ]
+    clauses.append(Clause("phrase", tokens, field_name, boost=IDENTIFIER_PHRASE_BOOST))
+    return clauses
+
+
+def parse_query(text: str) -> Query:
+    """Parse a query string into clauses (see module docstring)."""
+    query = Query()
+    for match in _CLAUSE_RE.finditer(text):
+        field_name = (match.group("field") or "").lower()
+        phrase, word = match.group("phrase"), match.group("word")
+
+        if field_name and field_name not in FIELDS:
+            # Not a field prefix (e.g. "http:" or "key:value"): plain word
+            word = match.group(0).strip('"')
+            phrase = None
+            field_name = ""
+        fielded = bool(field_name)
+        field_name = field_name or TEXT
+
+        if phrase is not None:
+            tokens = all_tokens(phrase)
+            if len(tokens) == 1:
+                query.clauses.append(Clause("term", tokens, field_name, True))
+            elif tokens:
+                query.clauses.append(Clause("phrase", tokens, field_name, True))
+        elif word:
+            query.clauses.extend(_word_clauses(word, field_name, required=fielded))
+
+    # Bare stopwords carry no signal on their own
+    query.clauses = [
+        clause
+        for clause in query.clauses
+        if clause.required or clause.kind != "term" or clause.terms[0] not in STOPWORDS
+    ]
+    return query
+
+
+class TermDictionary:
+    """Sorted term dictionary supporting prefix and wildcard expansion."""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms = sorted(terms)
+        self.reversed_terms = sorted(term[::-1] for term in self.terms)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @staticmethod
+    def _scan(
+        terms: Sequence[str],
+        prefix: str,
+        pattern: str,
+        reverse: bool,
+        max_scan: Optional[int] = None,
+    ) -> List[str]:
+        matches = []
+        start = bisect_left(terms, prefix)
+        stop = len(terms) if max_scan is None else min(len(terms), start + max_scan)
+        for i in range(start, stop):
+            term = terms[i]
+            if not term.startswith(prefix):
+                break
+            candidate = term[::-1] if reverse else term
+            if fnmatchcase(candidate, pattern):
+                matches.append(candidate)
+                if len(matches) >= MAX_EXPANSIONS:
+                    break
+        return matches
+
+    def expand(self, pattern: str) -> List[str]:
+        """Dictionary terms matching a ``*``/``?`` pattern.
+
+        The literal prefix (or, for leading wildcards, the literal suffix)
+        bounds the examined range of the sorted dictionary. A pattern with
+        neither (``*replica*``) is matched against the dictionary in order,
+        examining at most ``MAX_UNANCHORED_SCAN`` terms, so on very large
+        dictionaries it can miss matches.
+        """
+        if not any(char in pattern for char in WILDCARD_CHARS):
+            i = bisect_left(self.terms, pattern)
+            found = i < len(self.terms) and self.terms[i] == pattern
+            return [pattern] if found else []
+
+        first = min(pattern.index(c) for c in WILDCARD_CHARS if c in pattern)
+        prefix = pattern[:first]
+        if prefix:
+            return self._scan(self.terms, prefix, pattern, reverse=False)
+
+        last = max(pattern.rindex(c) for c in WILDCARD_CHARS if c in pattern)
+        suffix = pattern[last + 1 :]
+        if suffix:
+            return self._scan(self.reversed_terms, suffix[::-1], pattern, reverse=True)
+        return self._scan(
+            self.terms, "", pattern, reverse=False, max_scan=MAX_UNANCHORED_SCAN
+        )
+
+
+class FieldIndex:
+    """Positional postings and length statistics for one field."""
+
+    def __init__(self) -> None:
+        # term -> {ordinal: positions}
+        self.postings: Dict[str, Dict[int, List[int]]] = defaultdict(dict)
+        self.lengths: Dict[int, int] = {}
+        self.avg_length = 0.0
+        self.dictionary = TermDictionary([])
+        # term -> highest term-frequency component of its BM25 scores
+        self.max_impact: Dict[str, float] = {}
+
+    def add(self, ordinal: int, parts: Iterable[str]) -> None:
+        position = 0
+        length = 0
+        for part in parts:
+            tokens = all_tokens(part)
+            for offset, token in enumerate(tokens):
+                self.postings[token].setdefault(ordinal, []).append(position + offset)
+            position += len(tokens) + POSITION_GAP
+            length += len(tokens)
+        if length:
+            self.lengths[ordinal] = length
+
+    def finish(self) -> None:
+        self.postings = dict(self.postings)
+        self.avg_length = (
+            sum(self.lengths.values()) / len(self.lengths) if self.lengths else 0.0
+        )
+        self.dictionary = TermDictionary(self.postings)
+        self.max_impact = {
+            term: max(
+                self._impact(ordinal, len(positions))
+                for ordinal, positions in postings.items()
+            )
+            for term, postings in self.postings.items()
+        }
+
+    @staticmethod
+    def _idf(df: int, total: int) -> float:
+        return math.log(1 + (total - df + 0.5) / (df + 0.5))
+
+    def _impact(self, ordinal: int, tf: int) -> float:
+        """Term-frequency component of BM25 (the score without idf)."""
+        norm = BM25_K1 * (
+            1 - BM25_B + BM25_B * self.lengths.get(ordinal, 0) / (self.avg_length or 1)
+        )
+        return tf * (BM25_K1 + 1) / (tf + norm)
+
+    def bm25(self, ordinal: int, tf: int, df: int, total: int) -> float:
+        return self._idf(df, total) * self._impact(ordinal, tf)
+
+    def term_bound(self, term: str, total: int) -> float:
+        """Upper bound of :meth:`term_scores` for ``term``."""
+        postings = self.postings.get(term)
+        if not postings:
+            return 0.0
+        return self._idf(len(postings), total) * self.max_impact[term]
+
+    def phrase_bound(self, terms: List[str], total: int) -> float:
+        """Upper bound of :meth:`phrase_scores` for ``terms``.
+
+        A phrase occurs at most as often as its rarest term in a chunk,
+        and in at least one chunk if it matches at all.
+        """
+        if not all(term in self.postings for term in terms):
+            return 0.0
+        return self._idf(1, total) * min(self.max_impact[term] for term in terms)
+
+    def wildcard_bound(self, pattern: str, total: int) -> float:
+        """Upper bound of :meth:`wildcard_scores` for ``pattern``."""
+        return max(
+            (self.term_bound(term, total) for term in self.dictionary.expand(pattern)),
+            default=0.0,
+        )
+
+    def term_scores(self, term: str, total: int) -> Dict[int, float]:
+        postings = self.postings.get(term)
+        if not postings:
+            return {}
+        df = len(postings)
+        return {
+            ordinal: self.bm25(ordinal, len(positions), df, total)
+            for ordinal, positions in postings.items()
+        }
+
+    def term_scores_for(
+        self, term: str, ordinals: Iterable[int], total: int
+    ) -> Dict[int, float]:
+        """:meth:`term_scores` restricted to ``ordinals``."""
+        postings = self.postings.get(term)
+        if not postings:
+            return {}
+        df = len(postings)
+        scores = {}
+        for ordinal in ordinals:
+            positions = postings.get(ordinal)
+            if positions:
+                scores[ordinal] = self.bm25(ordinal, len(positions), df, total)
+        return scores
+
+    def phrase_scores(self, terms: List[str], total: int) -> Dict[int, float]:
+        postings = [self.postings.get(term) for term in terms]
+        if not all(postings):
+            return {}
+
+        # Intersect starting from the rarest term
+        rarest = min(range(len(terms)), key=lambda i: len(postings[i]))
+        candidates: Set[int] = set(postings[rarest])
+        for plist in postings:
+            candidates.intersection_update(plist)
+            if not candidates:
+                return {}
+
+        frequencies: Dict[int, int] = {}
+        for ordinal in candidates:
+            starts = set(postings[0][ordinal])
+            for i in range(1, len(terms)):
+                starts &= {p - i for p in postings[i][ordinal]}
+                if not starts:
+                    break
+            if starts:
+                frequencies[ordinal] = len(starts)
+
+        df = len(frequencies)
+        return {
+            ordinal: self.bm25(ordinal, tf, df, total)
+            for ordinal, tf in frequencies.items()
+        }
+
+    def wildcard_scores(self, pattern: str, total: int) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for term in self.dictionary.expand(pattern):
+            for ordinal, score in self.term_scores(term, total).items():
+                if score > scores.get(ordinal, 0.0):
+                    scores[ordinal] = score
+        return scores
+
+
+class LexicalIndex:
+    """Positional inverted index over chunks, with a small query language."""
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, FieldIndex] = {name: FieldIndex() for name in FIELDS}
+        self.total = 0
+
+    def add(self, title: str, heading: str, text: str, code: Sequence[str] = ()) -> int:
+        """Index a chunk and return its ordinal."""
+        ordinal = self.total
+        self.total += 1
+        self.fields[TEXT].add(ordinal, [title, heading, text])
+        self.fields[TITLE].add(ordinal, [title, heading])
+        self.fields[CODE].add(ordinal, code)
+        return ordinal
+
+    def finish(self) -> None:
+        """Finalize postings and term dictionaries after the last add."""
+        for index in self.fields.values():
+            index.finish()
+
+    def _clause_scores(self, clause: Clause) -> Dict[int, float]:
+        index = self.fields[clause.field]
+        if clause.kind == "phrase":
+            scores = index.phrase_scores(clause.terms, self.total)
+        elif clause.kind == "wildcard":
+            scores = index.wildcard_scores(clause.terms[0], self.total)
+        else:
+            scores = index.term_scores(clause.terms[0], self.total)
+        if clause.boost != 1.0:
+            scores = {ordinal: s * clause.boost for ordinal, s in scores.items()}
+        return scores
+
+    def _clause_scores_for(
+        self, clause: Clause, ordinals: Iterable[int]
+    ) -> Dict[int, float]:
+        """Scores of ``clause`` for the given chunks only."""
+        if clause.kind != "term":
+            ordinals = set(ordinals)
+            return {
+                ordinal: score
+                for ordinal, score in self._clause_scores(clause).items()
+                if ordinal in ordinals
+            }
+        scores = self.fields[clause.field].term_scores_for(
+            clause.terms[0], ordinals, self.total
+        )
+        if clause.boost != 1.0:
+            scores = {ordinal: s * clause.boost for ordinal, s in scores.items()}
+        return scores
+
+    def clause_bound(self, clause: Clause) -> float:
+        """Highest score any chunk can get from ``clause``."""
+        index = self.fields[clause.field]
+        if clause.kind == "phrase":
+            bound = index.phrase_bound(clause.terms, self.total)
+        elif clause.kind == "wildcard":
+            bound = index.wildcard_bound(clause.terms[0], self.total)
+        else:
+            bound = index.term_bound(clause.terms[0], self.total)
+        return bound * clause.boost
+
+    def max_score(self, query: Union[str, Query]) -> float:
+        """Upper bound of the score of any chunk for ``query``.
+
+        Returns 0 when a required clause cannot match at all.
+        """
+        if isinstance(query, str):
+            query = parse_query(query)
+        bound = 0.0
+        for clause in query.clauses:
+            clause_bound = self.clause_bound(clause)
+            if clause.required and not clause_bound:
+                return 0.0
+            bound += clause_bound
+        return bound
+
+    def search(
+        self, query: Union[str, Query], limit: int = 10, min_score: float = 0.0
+    ) -> List[Tuple[int, float]]:
+        """Rank chunks against ``query``.
+
+        Args:
+            query: Query string or parsed query
+            limit: Maximum number of results
+            min_score: Leave out chunks scoring lower, e.g. the lowest
+                score still in a merged top-k; enables MaxScore pruning
+
+        Returns:
+            ``(ordinal, score)`` pairs ordered by descending score
+        """
+        if isinstance(query, str):
+            query = parse_query(query)
+        if not query or not self.total:
+            return []
+        min_score *= 1 - SCORE_EPSILON
+        if min_score > 0 and self.max_score(query) < min_score:
+            return []
+
+        scores: Optional[Dict[int, float]] = None
+        for clause in query.required:
+            clause_scores = self._clause_scores(clause)
+            if scores is None:
+                scores = clause_scores
+            else:
+                scores = {
+                    ordinal: score + clause_scores[ordinal]
+                    for ordinal, score in scores.items()
+                    if ordinal in clause_scores
+                }
+            if not scores:
+                return []
+
+        restricted = scores is not None
+        totals: Dict[int, float] = dict(scores or {})
+        essential, non_essential = query.optional, []
+        if min_score > 0 and not restricted:
+            essential, non_essential = self._split_essential(query.optional, min_score)
+        for clause in essential:
+            for ordinal, score in self._clause_scores(clause).items():
+                if ordinal in totals:
+                    totals[ordinal] += score
+                elif not restricted:
+                    totals[ordinal] = score
+        # Only chunks matched above can still reach min_score
+        for clause in non_essential:
+            for ordinal, score in self._clause_scores_for(clause, totals).items():
+                totals[ordinal] += score
+
+        if min_score > 0:
+            totals = {o: score for o, score in totals.items() if score >= min_score}
+        return heapq.nlargest(limit, totals.items(), key=lambda item: item[1])
+
+    def _split_essential(
+        self, clauses: List[Clause], min_score: float
+    ) -> Tuple[List[Clause], List[Clause]]:
+        """Split optional clauses into essential and non-essential ones.
+
+        The non-essential clauses are the lowest-bound clauses whose
+        bounds add up to less than ``min_score``: a chunk matching only
+        those cannot reach it, so they need not introduce candidates.
+        """
+        bounds = [self.clause_bound(clause) for clause in clauses]
+        non_essential: Set[int] = set()
+        cumulative = 0.0
+        for i in sorted(range(len(clauses)), key=bounds.__getitem__):
+            if cumulative + bounds[i] >= min_score:
+                break
+            cumulative += bounds[i]
+            non_essential.add(i)
+        return (
+            [clause for i, clause in enumerate(clauses) if i not in non_essential],
+            [clause for i, clause in enumerate(clauses) if i in non_essential],
+        )
@@ -0,0 +1,528 @@
+"""End-to-end load testing over the MCP stdio protocol.
+
+The load generator starts ``enterprise-mcp-docs serve --mode mcp`` as a
+subprocess and drives it with the MCP client library, exactly like an
+assistant would. A weighted mix of ``search_documentation``,
+``get_documentation`` and ``list_available_tools`` calls is replayed by a
+fixed number of concurrent workers, and the run is summarized as
+throughput, latency percentiles per tool, error/rejection rate and the
+server's resident memory over time.
+
+The corpus is either the configured index (``corpus="index"``) or a
+synthetic one generated into a temporary directory, so a run needs no
+network access. All calls go through one MCP session (one stdio server
+serves one client), so the server's per-client admission limit applies
+and shows up as rejected calls when the target concurrency exceeds it.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from mcp import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+
+from .index import Chunk, Document, DocumentIndex, IndexShard, document_id
+
+logger = logging.getLogger(__name__)
+
+CALL_TYPES = ("search_documentation", "get_documentation", "list_available_tools")
+MIX_ALIASES = {
+    "search": "search_documentation",
+    "get": "get_documentation",
+    "list": "list_available_tools",
+}
+DEFAULT_MIX = {
+    "search_documentation": 0.7,
+    "get_documentation": 0.2,
+    "list_available_tools": 0.1,
+}
+PERCENTILES = (50, 90, 95, 99)
+
+# Prefix of the response text for calls rejected by admission control
+BUSY_PREFIX = "⏳ Server busy"
+ERROR_PREFIX = "Error executing"
+
+SYNTHETIC_TOOLS = ["elasticsearch", "docker", "python", "n8n", "ollama"]
+SYNTHETIC_TOPICS = {
+    "elasticsearch": ["index", "mapping", "query", "aggregation", "shard", "cluster"],
+    "docker": ["compose", "network", "volume", "image", "container", "swarm"],
+    "python": ["asyncio", "typing", "dataclass", "logging", "pathlib", "unittest"],
+    "n8n": ["workflow", "node", "credential", "trigger", "webhook", "expression"],
+    "ollama": ["model", "modelfile", "embedding", "prompt", "api", "gpu"],
+}
+SYNTHETIC_WORDS = (
+    "configure install update delete create list settings example default "
+    "timeout retry memory performance security logging endpoint request "
+    "response version upgrade backup restore template variable parameter"
+).split()
+
+
+def parse_mix(spec: Optional[str]) -> Dict[str, float]:
+    """Parse a call mix such as ``search=70,get=20,list=10``.
+
+    Weights are normalized to sum to 1; tool names may be given in full
+    or as ``search``/``get``/``list``.
+
+    Raises:
+        ValueError: If the spec names an unknown call or has no weight
+    """
+    if not spec:
+        return dict(DEFAULT_MIX)
+
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = MIX_ALIASES.get(name.strip(), name.strip())
+        if name not in CALL_TYPES:
+            raise ValueError(f"Unknown call type in mix: {name!r}")
+        mix[name] = float(weight or 1)
+
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("Call mix has no positive weight")
+    return {name: weight / total for name, weight in mix.items() if weight > 0}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def build_synthetic_corpus(
+    path: Path, documents_per_tool: int = 200, seed: int = 0
+) -> DocumentIndex:
+    """Generate and save a synthetic documentation index at ``path``.
+
+    Documents are built from per-tool topic words and a shared vocabulary,
+    so searches have realistic overlap between tools.
+    """
+    rng = random.Random(seed)
+    now = time.time()
+    shards = {}
+    for tool in SYNTHETIC_TOOLS:
+        topics = SYNTHETIC_TOPICS[tool]
+        documents = []
+        for number in range(documents_per_tool):
+            topic = rng.choice(topics)
+            title = f"{tool.title()} {topic} {rng.choice(SYNTHETIC_WORDS)} {number}"
+            url = f"https://docs.example.com/{tool}/{topic}/{number}.html"
+            doc_id = document_id(url)
+            chunks = []
+            for position in range(rng.randint(2, 5)):
+                words = rng.choices(topics + SYNTHETIC_WORDS, k=rng.randint(60, 160))
+                chunks.append(
+                    Chunk(
+                        chunk_id=f"{doc_id}-{position}",
+                        heading=f"{topic.title()} {rng.choice(SYNTHETIC_WORDS)}",
+                        text=" ".join(words),
+                        code=[f"{tool} {topic} --{rng.choice(SYNTHETIC_WORDS)}"],
+                    )
+                )
+            documents.append(
+                Document(
+                    doc_id=doc_id,
+                    tool=tool,
+                    url=url,
+                    title=title,
+                    section=topic,
+                    fetched_at=now,
+                    chunks=chunks,
+                )
+            )
+        shards[tool] = IndexShard(tool, documents)
+
+    index = DocumentIndex(shards)
+    index.save(path)
+    return index
+
+
+def build_workload(
+    index: DocumentIndex,
+    mix: Dict[str, float],
+    size: int = 1000,
+    seed: int = 0,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Generate ``size`` tool calls following ``mix`` from the index contents.
+
+    Search queries are drawn from document titles and headings (one in
+    four restricted to the document's tool); ``get_documentation`` topics
+    are document titles.
+    """
+    rng = random.Random(seed)
+    samples: List[Tuple[str, str, List[str]]] = []
+    for tool, shard in index.shards.items():
+        for document in shard.documents.values():
+            if document.duplicate_of:
+                continue
+            words = document.title.split()
+            for chunk in document.chunks[:2]:
+                words.extend(chunk.heading.split())
+            samples.append((tool, document.title, words))
+    if not samples:
+        raise ValueError("The corpus has no documents to build a workload from")
+
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    workload = []
+    for _ in range(size):
+        name = rng.choices(names, weights)[0]
+        tool, title, words = rng.choice(samples)
+        if name == "search_documentation":
+            terms = rng.sample(words, min(len(words), rng.randint(1, 3)))
+            arguments: Dict[str, Any] = {"query": " ".join(terms), "limit": 10}
+            if rng.random() < 0.25:
+                arguments["tools"] = [tool]
+        elif name == "get_documentation":
+            arguments = {"tool": tool, "topic": title}
+        else:
+            arguments = {}
+        workload.append((name, arguments))
+    return workload
+
+
+class RssSampler:
+    """Samples the resident memory of the server process tree."""
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.samples: List[Tuple[float, float]] = []
+        self._known: Set[int] = set()
+        self._started = time.monotonic()
+        try:
+            import psutil
+
+            self._psutil = psutil
+            self._known = {child.pid for child in psutil.Process().children(True)}
+        except ImportError:
+            self._psutil = None
+
+    @property
+    def available(self) -> bool:
+        return self._psutil is not None
+
+    def rss_mb(self) -> Optional[float]:
+        """RSS of child processes started since the sampler was created."""
+        if self._psutil is None:
+            return None
+        total = 0
+        for child in self._psutil.Process().children(recursive=True):
+            if child.pid in self._known:
+                continue
+            try:
+                total += child.memory_info().rss
+            except self._psutil.Error:
+                continue
+        return total / (1024 * 1024)
+
+    def sample(self) -> None:
+        rss = self.rss_mb()
+        if rss:
+            self.samples.append((round(time.monotonic() - self._started, 1), rss))
+
+    async def run(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+
+class LoadReport:
+    """Collects call outcomes and summarizes a load-test run."""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.latencies: Dict[str, List[float]] = {name: [] for name in CALL_TYPES}
+        self.errors: Dict[str, int] = {name: 0 for name in CALL_TYPES}
+        self.rejected: Dict[str, int] = {name: 0 for name in CALL_TYPES}
+        self.error_samples: List[str] = []
+        self.duration = 0.0
+        self.startup_seconds = 0.0
+        self.rss: List[Tuple[float, float]] = []
+
+    def record(self, name: str, seconds: float, outcome: str, detail: str = "") -> None:
+        self.latencies[name].append(seconds * 1000)
+        if outcome == "error":
+            self.errors[name] += 1
+            if len(self.error_samples) < 5:
+                self.error_samples.append(f"{name}: {detail[:200]}")
+        elif outcome == "rejected":
+            self.rejected[name] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(len(values) for values in self.latencies.values())
+
+    def _summary(self, values: List[float], errors: int, rejected: int) -> Dict:
+        summary = {
+            "requests": len(values),
+            "errors": errors,
+            "rejected": rejected,
+            "mean_ms": round(sum(values) / len(values), 2) if values else 0.0,
+            "max_ms": round(max(values), 2) if values else 0.0,
+        }
+        for pct in PERCENTILES:
+            summary[f"p{pct}_ms"] = round(percentile(values, pct), 2)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        all_values = [value for values in self.latencies.values() for value in values]
+        errors = sum(self.errors.values())
+        rejected = sum(self.rejected.values())
+        rss_values = [rss for _, rss in self.rss]
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "concurrency": self.concurrency,
+            "duration_s": round(self.duration, 2),
+            "startup_s": round(self.startup_seconds, 2),
+            "throughput_rps": (
+                round(self.total / self.duration, 1) if self.duration else 0.0
+            ),
+            "error_rate": (
+                round((errors + rejected) / self.total, 4) if self.total else 0
+            ),
+            "overall": self._summary(all_values, errors, rejected),
+            "tools": {
+                name: self._summary(values, self.errors[name], self.rejected[name])
+                for name, values in self.latencies.items()
+                if values
+            },
+            "rss_mb": {
+                "start": round(rss_values[0], 1) if rss_values else None,
+                "peak": round(max(rss_values), 1) if rss_values else None,
+                "end": round(rss_values[-1], 1) if rss_values else None,
+                "samples": [[t, round(rss, 1)] for t, rss in self.rss],
+            },
+            "error_samples": self.error_samples,
+        }
+
+    def render(self) -> str:
+        data = self.to_dict()
+        overall = data["overall"]
+        lines = [
+            "📈 Load test results",
+            f"   Concurrency: {data['concurrency']}  "
+            f"Duration: {data['duration_s']:.1f}s  "
+            f"Server startup: {data['startup_s']:.1f}s",
+            f"   Requests: {overall['requests']}  "
+            f"Throughput: {data['throughput_rps']} req/s",
+            f"   Errors: {overall['errors']}  Rejected: {overall['rejected']}  "
+            f"Error rate: {data['error_rate']:.2%}",
+            "",
+            f"   {'tool':<24}{'count':>7}{'p50':>9}{'p90':>9}{'p95':>9}"
+            f"{'p99':>9}{'max':>9}  (ms)",
+        ]
+        rows = list(data["tools"].items()) + [("all", overall)]
+        for name, summary in rows:
+            lines.append(
+                f"   {name:<24}{summary['requests']:>7}"
+                f"{summary['p50_ms']:>9.1f}{summary['p90_ms']:>9.1f}"
+                f"{summary['p95_ms']:>9.1f}{summary['p99_ms']:>9.1f}"
+                f"{summary['max_ms']:>9.1f}"
+            )
+
+        rss = data["rss_mb"]
+        lines.append("")
+        if rss["peak"] is None:
+            lines.append("   RSS: not available (install psutil)")
+        else:
+            lines.append(
+                f"   RSS: start {rss['start']} MB, peak {rss['peak']} MB, "
+                f"end {rss['end']} MB"
+            )
+        for sample in data["error_samples"]:
+            lines.append(f"   ❌ {sample}")
+        return "\n".join(lines)
+
+
+def _outcome(result: Any) -> Tuple[str, str]:
+    """Classify a ``CallToolResult`` as ok, rejected or error."""
+    text = "".join(getattr(item, "text", "") for item in result.content)
+    if result.isError or text.startswith(ERROR_PREFIX):
+        return "error", text
+    if text.startswith(BUSY_PREFIX):
+        return "rejected", text
+    return "ok", ""
+
+
+def server_parameters(config_path: str, env: Optional[Dict[str, str]] = None):
+    """Parameters for spawning ``enterprise-mcp-docs serve --mode mcp``."""
+    server_env = dict(os.environ)
+    server_env.setdefault("LOG_LEVEL", "WARNING")
+    server_env.update(env or {})
+    return StdioServerParameters(
+        command=sys.executable,
+        args=[
+            "-m",
+            "enterprise_mcp_docs.cli",
+            "serve",
+            "--mode",
+            "mcp",
+            "--config",
+            config_path,
+        ],
+        env=server_env,
+    )
+
+
+async def run_load(
+    config_path: str,
+    workload: List[Tuple[str, Dict[str, Any]]],
+    concurrency: int = 8,
+    duration: Optional[float] = 30.0,
+    max_requests: Optional[int] = None,
+    rss_interval: float = 1.0,
+    server_log: Optional[Path] = None,
+) -> LoadReport:
+    """Drive a freshly spawned MCP server with ``workload``.
+
+    Args:
+        config_path: Configuration file passed to the server
+        workload: Tool calls, replayed round-robin by the workers
+        concurrency: Number of concurrent in-flight calls
+        duration: Stop after this many seconds (None: no time limit)
+        max_requests: Stop after this many calls (None: no count limit)
+        rss_interval: Seconds between RSS samples
+        server_log: File receiving the server's stderr (default: discarded)
+
+    Returns:
+        The run's report
+    """
+    if duration is None and max_requests is None:
+        raise ValueError("Either duration or max_requests must be set")
+
+    report = LoadReport(concurrency)
+    sampler = RssSampler(rss_interval)
+    position = 0
+    stop_at = None
+
+    def next_call() -> Optional[Tuple[str, Dict[str, Any]]]:
+        nonlocal position
+        if max_requests is not None and position >= max_requests:
+            return None
+        if stop_at is not None and time.monotonic() >= stop_at:
+            return None
+        call = workload[position % len(workload)]
+        position += 1
+        return call
+
+    async def worker(session: ClientSession) -> None:
+        while True:
+            call = next_call()
+            if call is None:
+                return
+            name, arguments = call
+            started = time.perf_counter()
+            try:
+                result = await session.call_tool(name, arguments)
+                outcome, detail = _outcome(result)
+            except Exception as e:
+                outcome, detail = "error", f"{type(e).__name__}: {e}"
+            report.record(name, time.perf_counter() - started, outcome, detail)
+
+    errlog = open(server_log or os.devnull, "w")
+    try:
+        started = time.monotonic()
+        async with stdio_client(server_parameters(config_path), errlog=errlog) as (
+            read_stream,
+            write_stream,
+        ):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                report.startup_seconds = time.monotonic() - started
+
+                sampling = asyncio.create_task(sampler.run())
+                begin = time.monotonic()
+                if duration is not None:
+                    stop_at = begin + duration
+                try:
+                    await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+                finally:
+                    report.duration = time.monotonic() - begin
+                    sampler.sample()
+                    sampling.cancel()
+    finally:
+        errlog.close()
+
+    report.rss = sampler.samples
+    return report
+
+
+def run_loadtest(
+    config: Dict[str, Any],
+    corpus: str = "synthetic",
+    mix: Optional[Dict[str, float]] = None,
+    concurrency: int = 8,
+    duration: Optional[float] = 30.0,
+    max_requests: Optional[int] = None,
+    documents_per_tool: int = 200,
+    seed: int = 0,
+    server_log: Optional[Path] = None,
+) -> LoadReport:
+    """Prepare a corpus and server configuration, then run the load test.
+
+    Args:
+        config: Server configuration; with ``corpus="index"`` its index
+            is used as-is
+        corpus: ``synthetic`` or ``index``
+        mix: Call mix (see :func:`parse_mix`)
+        documents_per_tool: Size of the synthetic corpus
+
+    Returns:
+        The run's report
+    """
+    with tempfile.TemporaryDirectory(prefix="mcp-loadtest-") as tmp:
+        workdir = Path(tmp)
+        server_config = json.loads(json.dumps(config))
+        if corpus == "synthetic":
+            index_path = workdir / "index"
+            index = build_synthetic_corpus(index_path, documents_per_tool, seed)
+            server_config["tools"] = {
+                tool: {"provider": tool.title(), "enabled": True}
+                for tool in SYNTHETIC_TOOLS
+            }
+            server_config.setdefault("index", {})["path"] = str(index_path)
+        elif corpus == "index":
+            index = DocumentIndex.load(server_config["index"]["path"])
+            if not index:
+                raise ValueError(f"No index at {server_config['index']['path']}")
+        else:
+            raise ValueError(f"Unknown corpus: {corpus}")
+
+        # Measure the server, not a shared Redis or trace exporter
+        server_config.setdefault("cache", {})["enabled"] = False
+        tracing = server_config.setdefault("tracing", {})
+        tracing["export_path"] = tracing["slow_query_log"] = None
+        server_config.setdefault("resources", {})["status_dir"] = str(
+            workdir / "status"
+        )
+        # Start cold and keep synthetic queries out of the real query log
+        server_config.setdefault("query_log", {})["path"] = str(
+            workdir / "query_log.json"
+        )
+        config_path = workdir / "config.json"
+        config_path.write_text(json.dumps(server_config))
+
+        workload = build_workload(index, mix or DEFAULT_MIX, seed=seed)
+        return asyncio.run(
+            run_load(
+                str(config_path),
+                workload,
+                concurrency=concurrency,
+                duration=duration,
+                max_requests=max_requests,
+                server_log=server_log,
+            )
+        )
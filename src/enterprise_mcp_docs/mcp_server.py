@@ -6,43 +6,156 @@ documentation access to AI assistants like Claude Code.
 """
 
 import asyncio
-import json
+import functools
+import hashlib
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from mcp.server import Server, InitializationOptions
+from mcp.server import Server
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
+from mcp.types import TextContent, Tool
 
+from . import __version__
+from .cache import ResultCache
+from .catalog import build_catalog, render_catalog
+from .concurrency import AdmissionController, Overloaded
+from .config import load_config
+from .governor import IdleShards, Releasable, Resizable, ResourceGovernor
+from .index import (
+    Document,
+    DocumentIndex,
+    IndexShard,
+    SearchHit,
+    TopScores,
+    candidate_count,
+    merge_hits,
+)
+from .lexical import Query
 from .providers import PROVIDER_REGISTRY
+from .querylog import QueryLog
+from .rerank import Reranker
+from .synonyms import SynonymExpander
+from .textstore import DEFAULT_CACHE_BLOCKS
+from .tracing import Tracer, summarize_arguments
 
 logger = logging.getLogger(__name__)
 
+AVAILABLE_TOOLS = [
+    "elasticsearch",
+    "docker",
+    "python",
+    "proxmox",
+    "nessus",
+    "topdesk",
+    "confluence",
+    "n8n",
+    "ollama",
+]
+
+# Maximum characters of document text returned by get_documentation
+MAX_DOCUMENT_CHARS = 8000
+SNIPPET_CHARS = 300
+
 
 class EnterpriseMCPServer:
     """Enterprise MCP Documentation Server
-    
+
     Provides documentation search and retrieval capabilities for enterprise tools
     through the Model Context Protocol.
     """
-    
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """Initialize the MCP server.
-        
+
         Args:
             config: Configuration dictionary for tools and providers
         """
         self.config = config or {}
         self.providers: Dict[str, Any] = {}
-        self.server = Server("enterprise-mcp-docs")
-        
+        self.index = DocumentIndex()
+        # manifest mtime of the loaded index and when it was last checked
+        self._index_mtime: Optional[float] = None
+        self._index_checked = 0.0
+        # (index, response) of the last rendered tool catalog
+        self._catalog: Optional[Tuple[DocumentIndex, List[TextContent]]] = None
+        self.cache = ResultCache(self.config.get("cache", {}))
+        self.tracer = Tracer(self.config.get("tracing", {}))
+        self.limits = AdmissionController(self.config.get("limits", {}))
+        # Shard searches still running after their fan-out answered
+        self._late_shards = 0
+        self.reranker = Reranker(
+            self.config.get("rerank", {}), self.config.get("tools", {})
+        )
+        search_config = self.config.get("search", {})
+        self.synonyms = SynonymExpander.from_config(search_config)
+        # Embeddings are only loaded in hybrid mode; lite mode never imports a model
+        self.vector = None
+        if search_config.get("mode", "lite") == "hybrid":
+            from .vector import VectorScorer
+
+            self.vector = VectorScorer.load(
+                search_config, self.config.get("vector_db", {})
+            )
+        self.search_mode = "hybrid" if self.vector else "lite"
+        self.text_cache_blocks = self.config.get("index", {}).get(
+            "text_cache_blocks", DEFAULT_CACHE_BLOCKS
+        )
+        self.query_log = QueryLog(self.config.get("query_log", {}))
+        self._warm_task: Optional[asyncio.Task] = None
+        self.governor = self._create_governor()
+        self.server = Server("enterprise-mcp-docs", version=__version__)
+
         # Setup MCP server handlers
         self._setup_handlers()
-        
+
+    def _create_governor(self) -> ResourceGovernor:
+        """Memory governor over this server's caches, cheapest to refill first."""
+        resources = self.config.get("resources", {})
+        governor = ResourceGovernor(resources, name="mcp")
+        governor.register(Releasable("tool_catalog", self._drop_catalog))
+        governor.register(
+            Resizable(
+                "result_cache",
+                lambda: self.cache.local.max_entries,
+                self.cache.local.resize,
+                self.cache.local.max_entries,
+                resources.get("min_result_cache_entries", 64),
+            )
+        )
+        governor.register(
+            Resizable(
+                "text_cache_blocks",
+                lambda: self.text_cache_blocks,
+                self._resize_text_cache,
+                self.text_cache_blocks,
+                resources.get("min_text_cache_blocks", 4),
+            )
+        )
+        governor.register(
+            IdleShards(
+                lambda: self.index.shards, resources.get("shard_idle_seconds", 600)
+            )
+        )
+        return governor
+
+    def _drop_catalog(self) -> bool:
+        dropped = self._catalog is not None
+        self._catalog = None
+        return dropped
+
+    def _resize_text_cache(self, blocks: int) -> None:
+        self.text_cache_blocks = blocks
+        for shard in self.index.shards.values():
+            if shard.texts is not None:
+                shard.texts.resize_cache(blocks)
+
     def _setup_handlers(self):
         """Setup MCP protocol handlers."""
-        
+
         @self.server.list_tools()
         async def handle_list_tools() -> List[Tool]:
             """Return available documentation tools."""
@@ -55,22 +168,28 @@ class EnterpriseMCPServer:
                         "properties": {
                             "query": {
                                 "type": "string",
-                                "description": "Search query for documentation"
+                                "description": (
+                                    "Search query for documentation. Supports "
+                                    '"exact phrases", code: and title: fields '
+                                    '(code:"docker compose up --wait") and '
+                                    "prefix/wildcard terms (number_of_repl*)"
+                                ),
                             },
                             "tools": {
                                 "type": "array",
                                 "items": {"type": "string"},
                                 "description": "Specific tools to search (optional)",
-                                "default": []
+                                "default": [],
                             },
                             "limit": {
                                 "type": "integer",
                                 "description": "Maximum number of results",
-                                "default": 10
-                            }
+                                "default": 10,
+                                "minimum": 1,
+                            },
                         },
-                        "required": ["query"]
-                    }
+                        "required": ["query"],
+                    },
                 ),
                 Tool(
                     name="get_documentation",
@@ -80,15 +199,17 @@ class EnterpriseMCPServer:
                         "properties": {
                             "tool": {
                                 "type": "string",
-                                "description": "Tool name (e.g., 'elasticsearch', 'docker')"
+                                "description": (
+                                    "Tool name (e.g., 'elasticsearch', 'docker')"
+                                ),
                             },
                             "topic": {
-                                "type": "string", 
-                                "description": "Documentation topic or section"
-                            }
+                                "type": "string",
+                                "description": "Documentation topic or section",
+                            },
                         },
-                        "required": ["tool", "topic"]
-                    }
+                        "required": ["tool", "topic"],
+                    },
                 ),
                 Tool(
                     name="list_available_tools",
@@ -96,192 +217,637 @@ class EnterpriseMCPServer:
                     inputSchema={
                         "type": "object",
                         "properties": {},
-                        "additionalProperties": False
-                    }
-                )
+                        "additionalProperties": False,
+                    },
+                ),
             ]
-        
+
         @self.server.call_tool()
-        async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+        async def handle_call_tool(
+            name: str, arguments: Dict[str, Any]
+        ) -> List[TextContent]:
             """Handle tool calls from AI assistants."""
-            logger.info(f"Tool called: {name} with arguments: {arguments}")
-            
-            try:
-                if name == "search_documentation":
-                    return await self._search_documentation(
-                        query=arguments["query"],
-                        tools=arguments.get("tools", []),
-                        limit=arguments.get("limit", 10)
-                    )
-                
-                elif name == "get_documentation":
-                    return await self._get_documentation(
-                        tool=arguments["tool"],
-                        topic=arguments["topic"]
+            logger.info("Tool called: %s", name)
+            logger.debug("Tool arguments: %s", sorted(arguments))
+
+            with self.tracer.trace(
+                "tools/call", **{"mcp.tool": name, **summarize_arguments(arguments)}
+            ) as span:
+                try:
+                    async with self.limits.admit(name, self._client_id()):
+                        return await self._dispatch(name, arguments)
+                except Overloaded as e:
+                    logger.warning("Rejected %s: %s", name, e)
+                    if span is not None:
+                        span.set_attribute("rejected", True)
+                    return [
+                        TextContent(
+                            type="text",
+                            text=f"⏳ Server busy: {e}. Retry in {e.retry_after:.0f}s.",
+                        )
+                    ]
+                except Exception as e:
+                    logger.error("Error in tool %s: %s", name, e)
+                    if span is not None:
+                        span.error = f"{type(e).__name__}: {e}"
+                    return [
+                        TextContent(
+                            type="text", text=f"Error executing {name}: {str(e)}"
+                        )
+                    ]
+
+    def _client_id(self) -> str:
+        """Identify the client session of the current request."""
+        try:
+            session = self.server.request_context.session
+        except LookupError:
+            return "default"
+        params = session.client_params
+        name = params.clientInfo.name if params else "client"
+        return f"{name}:{id(session):x}"
+
+    async def _dispatch(
+        self, name: str, arguments: Dict[str, Any]
+    ) -> List[TextContent]:
+        """Route a tool call to its implementation."""
+        await self._reload_index_if_changed()
+
+        if name == "search_documentation":
+            return await self._search_documentation(
+                query=arguments["query"],
+                tools=arguments.get("tools", []),
+                limit=arguments.get("limit", 10),
+            )
+
+        elif name == "get_documentation":
+            return await self._get_documentation(
+                tool=arguments["tool"], topic=arguments["topic"]
+            )
+
+        elif name == "list_available_tools":
+            return await self._list_available_tools()
+
+        else:
+            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+
+    async def _search_documentation(
+        self, query: str, tools: List[str], limit: int
+    ) -> List[TextContent]:
+        """Search documentation across tools."""
+        search_tools = tools if tools else AVAILABLE_TOOLS
+        self.query_log.record(query, tools, limit)
+
+        if not self.index:
+            return [
+                TextContent(
+                    type="text",
+                    text="\n".join(
+                        [
+                            f"🔍 Searching for: '{query}'",
+                            f"📚 Tools: {', '.join(search_tools)}",
+                            "",
+                            "⚠️  No documentation has been indexed yet.",
+                            "   Run `enterprise-mcp-docs crawl --all` "
+                            "to initialize documentation.",
+                        ]
+                    ),
+                )
+            ]
+
+        hits = await self._search_index(query, search_tools, limit)
+
+        with self.tracer.span("render", hits=len(hits)):
+            results = [
+                f"🔍 Results for: '{query}'",
+                f"📚 Tools: {', '.join(search_tools)}",
+                "",
+            ]
+            if not hits:
+                results.append("No matching documentation found.")
+            for position, hit in enumerate(hits, 1):
+                results.extend(self._render_hit(position, hit))
+
+            return [TextContent(type="text", text="\n".join(results))]
+
+    async def _search_index(
+        self, query: str, tools: List[str], limit: int, wait_for_all: bool = False
+    ) -> List[SearchHit]:
+        """Search the index, reusing cached per-tool results.
+
+        Each tool's candidate hits are cached under a key that includes the
+        shard's build time, so a rebuilt shard never serves stale results.
+        All tools of one query are looked up in a single pipelined round trip;
+        tools without cached hits are searched concurrently (see
+        :meth:`_search_shards`).
+
+        Args:
+            query: The search query
+            tools: Tools to search
+            limit: Number of results
+            wait_for_all: Ignore ``search.shard_timeout_ms`` and wait for
+                every shard (used when warming caches)
+        """
+        # Clients do not all validate against the schema's minimum
+        limit = max(1, limit)
+        pool = self.reranker.pool_size(limit)
+        candidates = max(candidate_count(limit), pool)
+        with self.tracer.span("query.encode"):
+            normalized = " ".join(query.lower().split())
+            parsed = self.synonyms.parse(query)
+            digest = hashlib.sha1(
+                f"{candidates}:{self.synonyms.fingerprint}:{normalized}".encode("utf-8")
+            ).hexdigest()
+
+        keys = {}
+        for tool in tools:
+            shard = self.index.shards.get(tool)
+            if shard is not None:
+                keys[tool] = self.cache.key("search", tool, shard.built_at, digest)
+
+        with self.tracer.span("cache.lookup", keys=len(keys)) as span:
+            cached = await self.cache.get_many(keys.values())
+            if span is not None:
+                span.set_attribute("hits", len(cached))
+
+        # Hits below the k-th best score so far cannot reach the merged
+        # candidates (nor, in hybrid mode, the embedded pool)
+        top = TopScores(max(candidates, self.vector.candidates if self.vector else 0))
+        hits: List[SearchHit] = []
+        fresh: Dict[str, Any] = {}
+        uncached: Dict[str, str] = {}
+        with self.tracer.span("search.lexical", shards=len(keys)) as span:
+            for tool, key in keys.items():
+                if key in cached:
+                    shard = self.index.shards[tool]
+                    tool_hits = [shard.hit_from_dict(hit) for hit in cached[key]]
+                    top.add(hit.score for hit in tool_hits)
+                    hits.extend(tool_hits)
+                else:
+                    uncached[tool] = key
+            if uncached:
+                hits.extend(
+                    await self._search_shards(
+                        parsed, uncached, candidates, top, fresh, span, wait_for_all
                     )
-                    
-                elif name == "list_available_tools":
-                    return await self._list_available_tools()
-                    
+                )
+
+        await self.cache.set_many(fresh)
+        if self.vector is not None and hits:
+            with self.tracer.span(
+                "search.vector", candidates=min(len(hits), self.vector.candidates)
+            ):
+                hits = await self.limits.run(self.vector.fuse, query, hits)
+
+        def rerank(ranked: List[SearchHit]) -> List[SearchHit]:
+            with self.tracer.span(
+                "search.rerank", candidates=min(len(ranked), pool)
+            ) as span:
+                ranked, completed = self.reranker.rerank(query, ranked)
+                if span is not None:
+                    span.set_attribute("completed", completed)
+                return ranked
+
+        with self.tracer.span("search.fusion", candidates=len(hits)):
+            return merge_hits(hits, limit, rerank if self.reranker.enabled else None)
+
+    async def _search_shards(
+        self,
+        query: Query,
+        keys: Dict[str, str],
+        candidates: int,
+        top: TopScores,
+        fresh: Dict[str, Any],
+        span: Any = None,
+        wait_for_all: bool = False,
+    ) -> List[SearchHit]:
+        """Search several tool shards concurrently and merge as they finish.
+
+        Shards most likely to produce the best hits are submitted first, at
+        most ``limits.cpu_workers`` at a time. Each shard is searched with
+        the global k-th best score known when it is submitted as its
+        ``min_score``, so shards that cannot beat it return at once and the
+        others skip chunks that cannot (MaxScore pruning).
+
+        Once ``search.shard_timeout_ms`` has passed since the fan-out started
+        and some hits have been found, shards not submitted yet are dropped
+        and those still running are left out of the response; they finish in
+        the background. At most ``search.max_late_shards`` such searches run
+        across the server; beyond that the fan-out waits for its shards
+        instead. Only complete results (searched without a ``min_score``) are
+        cached, including those of late shards.
+
+        Args:
+            query: The parsed query
+            keys: Result cache key of each tool to search
+            candidates: Hits to fetch per shard
+            top: Scores of the hits found so far; updated in place
+            fresh: Receives the cache entries of complete results
+            span: Span to record fan-out statistics on
+            wait_for_all: Wait for every shard regardless of the timeout
+
+        Returns:
+            Hits of the shards that finished in time
+        """
+        dropped = threading.Event()
+
+        def search(
+            shard: IndexShard, min_score: float
+        ) -> Optional[Tuple[float, List[SearchHit]]]:
+            # Late searches still queued in the executor are not started
+            if dropped.is_set():
+                return None
+            return min_score, shard.search(query, candidates, min_score)
+
+        def priority(tool: str) -> float:
+            # Cold shards (bound unknown) go last so they do not hold up
+            # the executor before warm shards have raised the threshold
+            bound = self.index.shards[tool].max_score(query)
+            return -1.0 if bound is None else bound
+
+        search_config = self.config.get("search", {})
+        timeout_ms = search_config.get("shard_timeout_ms", 500)
+        max_late = search_config.get("max_late_shards", 4)
+        loop = asyncio.get_running_loop()
+        deadline = (
+            None if wait_for_all or not timeout_ms else loop.time() + timeout_ms / 1000
+        )
+        queue = deque(sorted(keys, key=priority, reverse=True))
+        tasks: Dict[asyncio.Future, str] = {}
+        pending: Set[asyncio.Future] = set()
+        hits: List[SearchHit] = []
+        skipped: List[str] = []
+        pruned = 0
+        while queue or pending:
+            expired = deadline is not None and loop.time() >= deadline
+            if expired and len(top):
+                skipped.extend(queue)
+                queue.clear()
+                if self._late_shards + len(pending) <= max_late:
+                    break
+            while queue and len(pending) < self.limits.cpu_workers:
+                tool = queue.popleft()
+                # The threshold is read here, on the event loop, and passed
+                # by value: worker threads never see TopScores
+                task = asyncio.ensure_future(
+                    self.limits.run(search, self.index.shards[tool], top.threshold)
+                )
+                tasks[task] = tool
+                pending.add(task)
+            # Past the deadline with nothing found: an answer is worth waiting for
+            timeout = None if deadline is None or expired else deadline - loop.time()
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                min_score, tool_hits = task.result()
+                top.add(hit.score for hit in tool_hits)
+                hits.extend(tool_hits)
+                if min_score > 0:
+                    pruned += 1
                 else:
-                    return [TextContent(
-                        type="text",
-                        text=f"Unknown tool: {name}"
-                    )]
-                    
-            except Exception as e:
-                logger.error(f"Error in tool {name}: {e}")
-                return [TextContent(
-                    type="text", 
-                    text=f"Error executing {name}: {str(e)}"
-                )]
-    
-    async def _search_documentation(self, query: str, tools: List[str], limit: int) -> List[TextContent]:
-        """Search documentation across tools."""
-        # TODO: Implement actual search functionality
-        # For now, return placeholder response
-        
-        available_tools = ["elasticsearch", "docker", "python", "proxmox", "nessus", 
-                          "topdesk", "confluence", "n8n", "ollama"]
-        
-        search_tools = tools if tools else available_tools
-        
-        results = []
-        results.append(f"🔍 Searching for: '{query}'")
-        results.append(f"📚 Tools: {', '.join(search_tools)}")
-        results.append(f"📄 Limit: {limit} results")
-        results.append("")
-        results.append("⚠️  Note: This is a placeholder implementation.")
-        results.append("   Actual search functionality will be implemented in the next phase.")
-        results.append("   The documentation crawling and vector search is not yet active.")
-        
-        return [TextContent(type="text", text="\n".join(results))]
-    
+                    fresh[keys[tasks[task]]] = self._cache_entry(tool_hits)
+
+        dropped.set()
+        self._late_shards += len(pending)
+        for task in pending:
+            task.add_done_callback(
+                functools.partial(self._cache_late_result, keys[tasks[task]])
+            )
+        late = sorted(tasks[task] for task in pending) + sorted(skipped)
+        if late:
+            logger.debug("⏱️  Answered without slow tools: %s", ", ".join(late))
+        if span is not None:
+            span.set_attribute("pruned", pruned)
+            span.set_attribute("timed_out", late)
+        return hits
+
+    @staticmethod
+    def _cache_entry(hits: List[SearchHit]) -> List[Dict[str, Any]]:
+        # Text is left out: it is re-read from the shard's text store
+        return [hit.to_dict(include_text=False) for hit in hits]
+
+    def _cache_late_result(self, key: str, task: asyncio.Future) -> None:
+        """Cache the result of a shard search that missed its deadline."""
+        self._late_shards -= 1
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            return
+        min_score, hits = task.result()
+        if min_score == 0:
+            asyncio.ensure_future(self.cache.set_many({key: self._cache_entry(hits)}))
+
+    @staticmethod
+    def _render_hit(position: int, hit: SearchHit) -> List[str]:
+        """Render a single search hit."""
+        title = (
+            hit.title
+            if hit.heading in (hit.title, "")
+            else f"{hit.title} — {hit.heading}"
+        )
+        snippet = hit.text[:SNIPPET_CHARS].replace("\n", " ")
+        if len(hit.text) > SNIPPET_CHARS:
+            snippet += "…"
+        version = f", {hit.version}" if hit.version else ""
+        lines = [
+            f"{position}. **{title}** ({hit.tool}{version})",
+            f"   🔗 {hit.url}",
+            f"   {snippet}",
+        ]
+        if hit.alternates:
+            alternates = EnterpriseMCPServer._render_alternates(hit.alternates)
+            lines.append(f"   🔀 Also in: {alternates}")
+        lines.append("")
+        return lines
+
+    @staticmethod
+    def _render_alternates(alternates: List[Dict[str, Optional[str]]]) -> str:
+        """Render alternate versions/locations of the same content."""
+        return ", ".join(
+            f"{alt['version']} ({alt['url']})" if alt.get("version") else alt["url"]
+            for alt in alternates
+        )
+
     async def _get_documentation(self, tool: str, topic: str) -> List[TextContent]:
         """Get specific documentation content."""
-        # TODO: Implement actual documentation retrieval
-        
-        available_tools = ["elasticsearch", "docker", "python", "proxmox", "nessus",
-                          "topdesk", "confluence", "n8n", "ollama"]
-        
-        if tool not in available_tools:
-            return [TextContent(
-                type="text",
-                text=f"❌ Tool '{tool}' not available. Available tools: {', '.join(available_tools)}"
-            )]
-        
-        result = [
-            f"📖 Documentation for: {tool}",
-            f"📄 Topic: {topic}",
-            "",
-            "⚠️  Note: This is a placeholder implementation.",
-            "   Actual documentation content will be available after implementing:",
-            "   1. Documentation crawling engine",
-            "   2. Vector database integration", 
-            "   3. Provider implementations",
-            "",
-            f"🔗 For now, please refer to the official {tool} documentation directly."
-        ]
-        
-        return [TextContent(type="text", text="\n".join(result))]
-    
+        if tool not in AVAILABLE_TOOLS:
+            return [
+                TextContent(
+                    type="text",
+                    text=(
+                        f"❌ Tool '{tool}' not available. "
+                        f"Available tools: {', '.join(AVAILABLE_TOOLS)}"
+                    ),
+                )
+            ]
+
+        with self.tracer.span("document.lookup"):
+            shard = self.index.shards.get(tool)
+            document = (
+                await self.limits.run(shard.find_document, topic) if shard else None
+            )
+
+        if document is None:
+            return [
+                TextContent(
+                    type="text",
+                    text="\n".join(
+                        [
+                            f"📖 Documentation for: {tool}",
+                            f"📄 Topic: {topic}",
+                            "",
+                            "⚠️  No indexed documentation matches this topic.",
+                            f"   Run `enterprise-mcp-docs crawl --tool {tool}` "
+                            f"if {tool} has not been crawled yet.",
+                        ]
+                    ),
+                )
+            ]
+
+        with self.tracer.span("render"):
+            text = await self.limits.run(self._render_document, document)
+            return [TextContent(type="text", text=text)]
+
+    def _render_document(self, document: Document) -> str:
+        """Render a document, truncated to MAX_DOCUMENT_CHARS."""
+        result = [f"📖 {document.title}", f"🔗 {document.url}"]
+        if document.variants:
+            result.append(
+                f"🔀 Same content: {self._render_alternates(document.variants)}"
+            )
+        result.append("")
+        size = 0
+        for chunk in document.chunks:
+            if size >= MAX_DOCUMENT_CHARS:
+                result.extend(["", "… (truncated)"])
+                break
+            if chunk.heading and chunk.heading != document.title:
+                result.extend([f"## {chunk.heading}", ""])
+            result.extend([chunk.text, ""])
+            size += len(chunk.text)
+
+        return "\n".join(result)
+
     async def _list_available_tools(self) -> List[TextContent]:
-        """List all available documentation tools."""
-        
-        tools_info = {
-            "elasticsearch": "✅ Search & Analytics - Elasticsearch documentation",
-            "docker": "✅ Containerization - Docker and Docker Compose",
-            "python": "✅ Programming - Python 3.x documentation", 
-            "proxmox": "✅ Virtualization - Proxmox VE management",
-            "nessus": "✅ Security - Nessus vulnerability scanning",
-            "topdesk": "✅ Service Management - TopDesk workflows",
-            "confluence": "✅ Collaboration - Confluence documentation",
-            "n8n": "✅ Automation - n8n workflow automation",
-            "ollama": "✅ AI/ML - Ollama model management"
-        }
-        
-        result = ["🛠️  Available Documentation Tools:", ""]
-        
-        for tool, description in tools_info.items():
-            result.append(f"• **{tool}**: {description}")
-        
-        result.extend([
-            "",
-            "⚠️  Note: Documentation content is not yet crawled.",
-            "   Run `enterprise-mcp-docs crawl --all` to initialize documentation.",
-            "",
-            "🔧 Status: Development Phase - Basic MCP connectivity established"
-        ])
-        
-        return [TextContent(type="text", text="\n".join(result))]
-    
+        """List all available documentation tools.
+
+        The rendered catalog is cached until the index is swapped.
+        """
+        if self._catalog is None or self._catalog[0] is not self.index:
+            self._catalog = (self.index, self._build_catalog())
+        return self._catalog[1]
+
+    def _build_catalog(self) -> List[TextContent]:
+        """Render the tool catalog from configuration and index statistics."""
+        tools_config = self.config.get("tools", {})
+        names = [
+            name
+            for name, tool_config in tools_config.items()
+            if tool_config.get("enabled", True)
+        ] or AVAILABLE_TOOLS
+        entries = build_catalog(names, tools_config, self.index.stats())
+        return [TextContent(type="text", text=render_catalog(entries))]
+
     async def initialize_providers(self):
         """Initialize documentation providers based on configuration."""
         logger.info("Initializing documentation providers...")
-        
-        # TODO: Load actual providers from config
-        # For now, just log that we're ready for provider implementation
-        
+
         tools_config = self.config.get("tools", {})
         logger.info(f"Found {len(tools_config)} tools in configuration")
-        
+
         for tool_name, tool_config in tools_config.items():
             if tool_config.get("enabled", True):
                 logger.info(f"Tool configured: {tool_name}")
-                # TODO: Initialize actual provider
-                # provider_class = PROVIDER_REGISTRY.get(tool_config.get("provider"))
-                # if provider_class:
-                #     self.providers[tool_name] = provider_class(tool_config)
-        
-        logger.info("Provider initialization completed (placeholder)")
-    
+                provider_class = PROVIDER_REGISTRY.get(tool_config.get("provider", ""))
+                if provider_class:
+                    self.providers[tool_name] = provider_class(
+                        dict(tool_config, tool=tool_name)
+                    )
+
+        logger.info(
+            f"Provider initialization completed ({len(self.providers)} API providers)"
+        )
+
+        self.load_index()
+
+    def _index_path(self) -> str:
+        return self.config.get("index", {}).get("path", "./data/index")
+
+    def _manifest_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(os.path.join(self._index_path(), "manifest.json")).st_mtime
+        except OSError:
+            return None
+
+    async def _reload_index_if_changed(self):
+        """Pick up an index refreshed on disk (e.g. by the crawl scheduler).
+
+        The manifest is checked at most every ``index.reload_interval``
+        seconds; the new index is loaded off the event loop and swapped in
+        as a whole.
+        """
+        interval = self.config.get("index", {}).get("reload_interval", 30)
+        now = time.monotonic()
+        if not interval or now - self._index_checked < interval:
+            return
+        self._index_checked = now
+        mtime = self._manifest_mtime()
+        if mtime is not None and mtime != self._index_mtime:
+            logger.info("🔄 Index changed on disk, reloading")
+            await self.limits.run(self.load_index)
+            self.schedule_warm_up()
+
+    def load_index(self):
+        """Load the documentation index from disk."""
+        index_path = self._index_path()
+        mtime = self._manifest_mtime()
+        try:
+            self.index = DocumentIndex.load(index_path, self.text_cache_blocks)
+        except Exception as e:
+            logger.error(f"Failed to load index from {index_path}: {e}")
+            return
+        self._index_mtime = mtime
+        self._index_checked = time.monotonic()
+
+        if self.index:
+            logger.info(
+                f"📚 Loaded index with {len(self.index.shards)} tools from {index_path}"
+            )
+        else:
+            logger.warning(f"No documentation index found at {index_path}")
+
+    def schedule_warm_up(self) -> Optional[asyncio.Task]:
+        """Replay popular queries against the current index in the background.
+
+        A warm-up still running for a previous index is cancelled.
+        """
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+            self._warm_task = None
+        if not self.index or not self.query_log.enabled:
+            return None
+        self._warm_task = asyncio.create_task(self._warm_up(self.index))
+        return self._warm_task
+
+    async def _warm_up(self, index: DocumentIndex) -> int:
+        """Run the most frequent logged searches against ``index``.
+
+        Builds the inverted indexes of the shards they touch, then replays
+        them through the normal search path, which fills the result and
+        embedding caches and the text store block caches. Replays are
+        spaced by ``query_log.warm_delay`` seconds so real traffic keeps
+        priority, and stop as soon as the index is swapped again.
+
+        Returns:
+            Number of replayed searches
+        """
+        settings = self.config.get("query_log", {})
+        # The worker thread gets a copy: record() keeps running on the loop
+        searches = await asyncio.to_thread(
+            self.query_log.top,
+            settings.get("warm_queries", 50),
+            settings.get("warm_min_count", 2),
+            self.query_log.pending(),
+        )
+        if not searches:
+            return 0
+
+        started = time.monotonic()
+        tools = {
+            tool
+            for _, filter_tools, _ in searches
+            for tool in (filter_tools or AVAILABLE_TOOLS)
+        }
+        for tool in sorted(tools):
+            shard = index.shards.get(tool)
+            if shard is not None and not shard.loaded:
+                await self.limits.run(shard.load)
+
+        replayed = 0
+        for query, filter_tools, limit in searches:
+            if self.index is not index:
+                break
+            try:
+                await self._search_index(
+                    query,
+                    list(filter_tools) or AVAILABLE_TOOLS,
+                    limit,
+                    wait_for_all=True,
+                )
+            except Exception as e:
+                logger.debug("Warm-up query %r failed: %s", query, e)
+                continue
+            replayed += 1
+            await asyncio.sleep(settings.get("warm_delay", 0.05))
+
+        logger.info(
+            "🔥 Warmed caches with %d popular queries in %.1fs",
+            replayed,
+            time.monotonic() - started,
+        )
+        return replayed
+
     async def start(self):
         """Start the MCP server."""
         logger.info("🚀 Starting Enterprise MCP Documentation Server...")
-        
+
         # Initialize providers
         await self.initialize_providers()
-        
+        await self.cache.connect()
+        logger.info(f"🔎 Search mode: {self.search_mode}")
+        governor_task = (
+            asyncio.create_task(self.governor.run()) if self.governor.enabled else None
+        )
+        query_log_task = (
+            asyncio.create_task(self.query_log.run())
+            if self.query_log.enabled
+            else None
+        )
+        self.schedule_warm_up()
+
         # Start stdio server
         logger.info("📡 Starting MCP stdio server...")
-        logger.info("🔗 Ready to accept connections from Claude Code and other MCP clients")
-        
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream, 
-                InitializationOptions(
-                    server_name="enterprise-mcp-docs",
-                    server_version="0.1.0"
+        logger.info(
+            "🔗 Ready to accept connections from Claude Code and other MCP clients"
+        )
+
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    self.server.create_initialization_options(),
                 )
-            )
+        finally:
+            tasks = [
+                task
+                for task in (governor_task, query_log_task, self._warm_task)
+                if task
+            ]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.cache.close()
+            self.tracer.close()
+            self.limits.close()
 
 
 async def main():
     """Main entry point for the MCP server."""
-    
+
     # Setup logging
     log_level = os.getenv("LOG_LEVEL", "INFO").upper()
     logging.basicConfig(
         level=getattr(logging, log_level),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
-    
+
     logger.info("Enterprise MCP Documentation Server starting...")
-    
-    # TODO: Load configuration from file
-    config = {
-        "tools": {
-            "elasticsearch": {"provider": "Elasticsearch", "enabled": True},
-            "docker": {"provider": "Docker", "enabled": True},
-            "python": {"provider": "Python", "enabled": True}
-        }
-    }
-    
+
+    config = load_config(os.getenv("CONFIG_FILE"))
+
     # Create and start server
     server = EnterpriseMCPServer(config)
     await server.start()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
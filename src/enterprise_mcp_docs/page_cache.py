@@ -0,0 +1,506 @@
+"""Persistent raw-page cache.
+
+Fetched HTML is kept on disk so the index can be rebuilt after a parser or
+chunker change without downloading anything again. Page bodies are stored
+content-addressed (identical pages share one blob) and compressed with
+zstd when the ``zstandard`` package is installed, gzip otherwise. A small
+SQLite manifest maps each URL to its blob and the validator headers
+(``ETag``/``Last-Modified``) needed for conditional re-fetches. The cache
+is bounded by a size cap and evicts least recently used pages first;
+pages a running crawl still needs can be pinned to exempt them.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # zstd support is optional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CODEC_EXTENSIONS = {"zstd": ".zst", "gzip": ".gz"}
+
+# Once over its cap the cache is shrunk to this fraction of it, so that
+# the following puts do not each evict a page
+EVICT_LOW_WATER = 0.9
+# Pages examined per eviction query
+EVICT_BATCH = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    tool TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_tool ON pages (tool);
+CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at);
+CREATE INDEX IF NOT EXISTS pages_digest ON pages (digest);
+CREATE TABLE IF NOT EXISTS sync_state (
+    tool TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class CachedPage:
+    """A page stored in the raw-page cache."""
+
+    url: str
+    tool: str
+    digest: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_type: Optional[str]
+    fetched_at: float
+    content: Optional[bytes] = None
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for re-fetching this page."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def default_codec() -> str:
+    """Best compression codec available in this environment."""
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    """Compress ``data`` with the given codec."""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the zstandard package")
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """Decompress ``data`` written with the given codec."""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd decompression requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class RawPageCache:
+    """Content-addressed, size-capped cache of fetched pages."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_size_mb: float = 512,
+        compression: str = "auto",
+    ):
+        """Open (or create) a page cache.
+
+        Args:
+            path: Cache directory
+            max_size_mb: Size cap for stored (compressed) page bodies
+            compression: ``"zstd"``, ``"gzip"`` or ``"auto"``
+        """
+        self.path = Path(path)
+        self.objects_path = self.path / "objects"
+        self.objects_path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.codec = default_codec() if compression == "auto" else compression
+        if self.codec not in CODEC_EXTENSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+
+        self._lock = threading.Lock()
+        # Pins have their own lock so pinning never waits for cache I/O
+        self._pin_lock = threading.Lock()
+        self._pins: Counter = Counter()
+        # Set when eviction found nothing left to evict but pinned pages
+        self._evict_stalled = False
+        self._db = sqlite3.connect(
+            str(self.path / "manifest.db"), check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        # Stored size of all distinct blobs, kept up to date by every
+        # method that adds or releases one
+        self._total = int(
+            self._db.execute(
+                "SELECT COALESCE(SUM(stored_size), 0) FROM "
+                "(SELECT DISTINCT digest, stored_size FROM pages)"
+            ).fetchone()[0]
+        )
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "RawPageCache":
+        """Create the cache described by the ``page_cache`` config section."""
+        cache_config = config.get("page_cache", {})
+        return cls(
+            cache_config.get("path", "./cache/pages"),
+            max_size_mb=cache_config.get("max_size_mb", 512),
+            compression=cache_config.get("compression", "auto"),
+        )
+
+    def _blob_path(self, digest: str, codec: str) -> Path:
+        return self.objects_path / digest[:2] / (digest + CODEC_EXTENSIONS[codec])
+
+    def _row_to_page(self, row: sqlite3.Row) -> CachedPage:
+        return CachedPage(
+            url=row["url"],
+            tool=row["tool"],
+            digest=row["digest"],
+            etag=row["etag"],
+            last_modified=row["last_modified"],
+            content_type=row["content_type"],
+            fetched_at=row["fetched_at"],
+        )
+
+    def _read_content(self, row: sqlite3.Row) -> Optional[bytes]:
+        try:
+            blob = self._blob_path(row["digest"], row["codec"]).read_bytes()
+        except FileNotFoundError:
+            logger.warning("Cache blob missing for %s", row["url"])
+            return None
+        return decompress(blob, row["codec"])
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        """Return cache metadata for ``url`` without reading the body."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        return self._row_to_page(row) if row else None
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page for ``url`` including its content."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url)
+            )
+            self._db.commit()
+
+        page = self._row_to_page(row)
+        page.content = self._read_content(row)
+        return page if page.content is not None else None
+
+    def put(
+        self,
+        url: str,
+        tool: str,
+        content: bytes,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> CachedPage:
+        """Store a freshly fetched page.
+
+        Args:
+            url: Canonical page URL
+            tool: Tool the page belongs to
+            content: Raw response body
+            headers: Response headers (validators are kept)
+
+        Returns:
+            The cached page entry
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest, self.codec)
+
+        # Compress outside the lock, but link the blob in under it: otherwise
+        # a concurrent evict() or delete() could remove a blob this page is
+        # about to reference
+        tmp_path = None
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_name(
+                f"{blob_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            tmp_path.write_bytes(compress(content, self.codec))
+
+        now = time.time()
+        with self._lock:
+            if tmp_path is not None:
+                os.replace(tmp_path, blob_path)
+            elif not blob_path.exists():
+                # Released since the check above
+                blob_path.write_bytes(compress(content, self.codec))
+            stored_size = blob_path.stat().st_size
+            shared = self._db.execute(
+                "SELECT 1 FROM pages WHERE digest = ? LIMIT 1", (digest,)
+            ).fetchone()
+            if not shared:
+                self._total += stored_size
+            previous = self._db.execute(
+                "SELECT digest, codec FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    tool,
+                    digest,
+                    self.codec,
+                    headers.get("etag"),
+                    headers.get("last-modified"),
+                    headers.get("content-type"),
+                    len(content),
+                    stored_size,
+                    now,
+                    now,
+                ),
+            )
+            if previous and previous["digest"] != digest:
+                self._release_blob(previous["digest"], previous["codec"])
+            self._db.commit()
+            over_budget = self._total > self.max_bytes and not self._evict_stalled
+
+        if over_budget:
+            self.evict()
+        return CachedPage(
+            url=url,
+            tool=tool,
+            digest=digest,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            content_type=headers.get("content-type"),
+            fetched_at=now,
+            content=content,
+        )
+
+    def touch(self, url: str) -> None:
+        """Mark ``url`` as revalidated (e.g. after a 304 response)."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+            self._db.commit()
+
+    def delete(self, url: str) -> bool:
+        """Remove ``url`` from the cache (e.g. after it was deleted upstream).
+
+        Returns:
+            True if the page was cached
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, codec FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return False
+            self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._release_blob(row["digest"], row["codec"])
+            self._db.commit()
+        return True
+
+    def prune(self, tool: str, keep: Collection[str]) -> int:
+        """Remove the pages of ``tool`` whose URL is not in ``keep``.
+
+        Used after a complete crawl to drop pages that are no longer
+        published.
+
+        Returns:
+            Number of pages removed
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url, digest, codec FROM pages WHERE tool = ?", (tool,)
+            ).fetchall()
+            removed = 0
+            for row in rows:
+                if row["url"] in keep:
+                    continue
+                self._db.execute("DELETE FROM pages WHERE url = ?", (row["url"],))
+                self._release_blob(row["digest"], row["codec"])
+                removed += 1
+            self._db.commit()
+        return removed
+
+    def pin(self, urls: Iterable[str]) -> None:
+        """Exempt ``urls`` from eviction until they are unpinned.
+
+        Pins are counted, so overlapping crawls can pin the same page.
+        """
+        with self._pin_lock:
+            self._pins.update(urls)
+
+    def unpin(self, urls: Iterable[str]) -> None:
+        """Release pins taken with :meth:`pin`."""
+        with self._pin_lock:
+            self._pins.subtract(urls)
+            self._pins = +self._pins
+            self._evict_stalled = False
+
+    def _is_pinned(self, url: str) -> bool:
+        with self._pin_lock:
+            return url in self._pins
+
+    def _release_blob(self, digest: str, codec: str) -> int:
+        """Delete a blob once no page references it; return bytes freed.
+
+        Must be called with the lock held.
+        """
+        still_used = self._db.execute(
+            "SELECT 1 FROM pages WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone()
+        if still_used:
+            return 0
+        blob_path = self._blob_path(digest, codec)
+        try:
+            size = blob_path.stat().st_size
+            blob_path.unlink()
+        except FileNotFoundError:
+            return 0
+        self._total -= size
+        return size
+
+    def total_size(self) -> int:
+        """Stored size of all distinct blobs in bytes."""
+        with self._lock:
+            return self._total
+
+    def evict(self) -> int:
+        """Evict least recently used pages once the cache exceeds its size cap.
+
+        The cache is then shrunk to ``EVICT_LOW_WATER`` of its cap, reading
+        the least recently used pages ``EVICT_BATCH`` at a time. Pinned
+        pages are skipped; if only they are left, the cache stays over its
+        cap and no further eviction is attempted until pins are released.
+
+        Returns:
+            Number of pages evicted
+        """
+        evicted = 0
+        with self._lock:
+            if self._total <= self.max_bytes:
+                return 0
+            target = int(self.max_bytes * EVICT_LOW_WATER)
+            skipped = 0
+            while self._total > target:
+                rows = self._db.execute(
+                    "SELECT url, digest, codec FROM pages "
+                    "ORDER BY accessed_at ASC LIMIT ? OFFSET ?",
+                    (EVICT_BATCH, skipped),
+                ).fetchall()
+                if not rows:
+                    if skipped:
+                        self._evict_stalled = True
+                        logger.warning(
+                            "Raw-page cache is over its cap with only pinned "
+                            "pages left"
+                        )
+                    break
+                for row in rows:
+                    if self._total <= target:
+                        break
+                    if self._is_pinned(row["url"]):
+                        skipped += 1
+                        continue
+                    self._db.execute("DELETE FROM pages WHERE url = ?", (row["url"],))
+                    self._release_blob(row["digest"], row["codec"])
+                    evicted += 1
+            self._db.commit()
+
+        logger.info("Evicted %d pages from raw-page cache", evicted)
+        return evicted
+
+    def tools(self) -> List[str]:
+        """Tools that have pages in the cache."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT tool FROM pages ORDER BY tool"
+            ).fetchall()
+        return [row["tool"] for row in rows]
+
+    def urls(self, tool: str) -> List[str]:
+        """URLs of the cached pages of ``tool``."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url FROM pages WHERE tool = ? ORDER BY url", (tool,)
+            ).fetchall()
+        return [row["url"] for row in rows]
+
+    def sync_state(self, tool: str) -> Optional[Dict[str, Any]]:
+        """Delta-sync state (e.g. a modification-time cursor) of ``tool``.
+
+        The state lives next to the pages it describes, so clearing the
+        cache also forgets it and the next sync is a full one.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT state FROM sync_state WHERE tool = ?", (tool,)
+            ).fetchone()
+        return json.loads(row["state"]) if row else None
+
+    def set_sync_state(self, tool: str, state: Dict[str, Any]) -> None:
+        """Store the delta-sync state of ``tool``."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (tool, json.dumps(state), time.time()),
+            )
+            self._db.commit()
+
+    def iter_pages(self, tool: Optional[str] = None) -> Iterator[CachedPage]:
+        """Iterate over cached pages (with content), optionally for one tool.
+
+        Iteration does not count as access for LRU purposes.
+        """
+        query = "SELECT * FROM pages"
+        params: tuple = ()
+        if tool:
+            query += " WHERE tool = ?"
+            params = (tool,)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY url", params).fetchall()
+
+        for row in rows:
+            page = self._row_to_page(row)
+            page.content = self._read_content(row)
+            if page.content is not None:
+                yield page
+
+    def stats(self) -> Dict[str, Union[int, str]]:
+        """Summary statistics for status output."""
+        with self._lock:
+            pages = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        return {
+            "pages": pages,
+            "size_bytes": self.total_size(),
+            "max_bytes": self.max_bytes,
+            "codec": self.codec,
+        }
+
+    def close(self) -> None:
+        """Close the cache manifest."""
+        with self._lock:
+            self._db.close()
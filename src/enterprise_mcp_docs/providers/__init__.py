@@ -1,12 +1,28 @@
 """Provider package for documentation sources.
 
-This package contains provider implementations for different tools.
-Currently implemented as placeholders for CI/CD compatibility.
+Most tools are crawled from their public documentation sites. Providers
+registered here export a tool's content through the product's REST API
+instead, when the tool's ``api.url`` is configured.
 """
 
 from typing import Dict, Type
 
-# Placeholder for future provider implementations
-PROVIDER_REGISTRY: Dict[str, Type] = {}
+from .api import APIError, APIProvider
+from .base import BaseProvider
+from .confluence import ConfluenceProvider
+from .topdesk import TopDeskProvider
 
-__all__ = ["PROVIDER_REGISTRY"]
+# Provider classes by the ``provider`` name used in the tools config
+PROVIDER_REGISTRY: Dict[str, Type[BaseProvider]] = {
+    "Confluence": ConfluenceProvider,
+    "TopDesk": TopDeskProvider,
+}
+
+__all__ = [
+    "PROVIDER_REGISTRY",
+    "APIError",
+    "APIProvider",
+    "BaseProvider",
+    "ConfluenceProvider",
+    "TopDeskProvider",
+]
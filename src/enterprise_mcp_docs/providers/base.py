@@ -1,7 +1,10 @@
 """Base provider class for documentation sources.
 
-This module defines the abstract base class for all documentation providers.
-Currently implemented as a placeholder for CI/CD compatibility.
+A :class:`BaseProvider` holds a tool's configuration (base URL, sections,
+cache TTL) and defines the provider interface. Documentation sites are
+crawled by :class:`~enterprise_mcp_docs.crawl.DocumentationCrawler`
+without a provider object; providers that export content through a REST
+API build on this class in :mod:`.api`.
 """
 
 from abc import ABC, abstractmethod
@@ -0,0 +1,218 @@
+"""Anonymized log of popular search queries for warming caches.
+
+Assistants keep asking the same popular questions ("docker compose
+networking", "elasticsearch mapping"). A :class:`QueryLog` counts
+normalized queries and periodically merges the counts into a small JSON
+file. After startup or an index swap the server replays the most
+frequent queries in the background (see
+``EnterpriseMCPServer._warm_up``), which fills the result cache, the
+embedding cache, the lazily built inverted indexes and the text store's
+block caches before real traffic needs them.
+
+The log is anonymized: it holds no client identities, no timestamps
+per query, only lowercased, whitespace-normalized query text with its
+tool filter and a count. Queries that look like they carry personal or
+secret data (e-mail addresses, URLs, IP addresses, long numbers or
+tokens) are never recorded.
+
+File layout::
+
+    {"version": 1, "queries": [{"query": ..., "tools": [...],
+                                "limit": 10, "count": 42}, ...]}
+
+Several server processes may share one file. Each flushes only the
+counts it gathered since its last flush, so the file accumulates the
+traffic of all of them; a flush racing another one can lose the loser's
+counts, which only makes the ranking slightly less precise.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Query text that must not end up on disk
+SENSITIVE_RE = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.]+"  # e-mail address
+    r"|\w+://\S+"  # URL
+    r"|\b\d{1,3}(?:\.\d{1,3}){3}\b"  # IPv4 address
+    r"|\b\d{5,}\b"  # phone, ticket or account numbers
+    r"|\b(?=\w*\d)(?=\w*[a-zA-Z])\w{20,}\b"  # API keys, hashes, tokens
+)
+
+# (query, tools, limit) identifying a logged search
+QueryKey = Tuple[str, Tuple[str, ...], int]
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase ``query`` and collapse its whitespace."""
+    return " ".join(query.lower().split())
+
+
+class QueryLog:
+    """Counts of normalized search queries, persisted to a JSON file."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize the log from the ``query_log`` configuration section.
+
+        Args:
+            config: Settings ``enabled``, ``path``, ``max_queries``
+                (entries kept in the file), ``max_query_chars`` and
+                ``flush_interval`` (seconds between flushes)
+        """
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        self.path = Path(config.get("path", "./data/query_log.json"))
+        self.max_queries = config.get("max_queries", 1000)
+        self.max_query_chars = config.get("max_query_chars", 200)
+        self.flush_interval = config.get("flush_interval", 60)
+        # Counts since the last flush
+        self._pending: Counter = Counter()
+        self.recorded = 0
+        self.skipped = 0
+
+    def record(self, query: str, tools: List[str], limit: int) -> bool:
+        """Count one search.
+
+        Args:
+            query: The query as sent by the client
+            tools: The tool filter of the search (empty for all tools)
+            limit: Requested number of results
+
+        Returns:
+            True if the query was counted, False if it was rejected as
+            too long or potentially sensitive
+        """
+        if not self.enabled:
+            return False
+        normalized = normalize_query(query)
+        if (
+            not normalized
+            or len(normalized) > self.max_query_chars
+            or SENSITIVE_RE.search(normalized)
+        ):
+            self.skipped += 1
+            return False
+        self._pending[(normalized, tuple(sorted(set(tools))), limit)] += 1
+        # Bound memory between flushes
+        if len(self._pending) > self.max_queries * 2:
+            self._pending = Counter(dict(self._pending.most_common(self.max_queries)))
+        self.recorded += 1
+        return True
+
+    def _read(self) -> Counter:
+        """Counts stored in the log file (empty if missing or unreadable)."""
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return Counter()
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable query log %s: %s", self.path, e)
+            return Counter()
+        if data.get("version") != FORMAT_VERSION:
+            return Counter()
+        counts: Counter = Counter()
+        for entry in data.get("queries", []):
+            try:
+                key = (entry["query"], tuple(entry["tools"]), int(entry["limit"]))
+                counts[key] += int(entry["count"])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return counts
+
+    def flush(self) -> bool:
+        """Merge the pending counts into the log file.
+
+        Returns:
+            True if the file was written
+        """
+        if not self.enabled or not self._pending:
+            return False
+        pending, self._pending = self._pending, Counter()
+        if self._merge(pending):
+            return True
+        # Keep the counts for the next attempt
+        self._pending.update(pending)
+        return False
+
+    def _merge(self, pending: Counter) -> bool:
+        """Add ``pending`` to the counts in the file (safe in a worker thread).
+
+        Returns:
+            True if the file was written
+        """
+        counts = self._read()
+        counts.update(pending)
+        queries = [
+            {"query": query, "tools": list(tools), "limit": limit, "count": count}
+            for (query, tools, limit), count in counts.most_common(self.max_queries)
+        ]
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(
+                json.dumps(
+                    {"version": FORMAT_VERSION, "queries": queries},
+                    separators=(",", ":"),
+                )
+            )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Cannot write query log %s: %s", self.path, e)
+            return False
+        return True
+
+    async def run(self) -> None:
+        """Flush periodically until cancelled, and once more on the way out."""
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                if self._pending:
+                    # Swap on the event loop so no concurrent record() is lost;
+                    # the worker thread only sees its own Counter
+                    pending, self._pending = self._pending, Counter()
+                    if not await asyncio.to_thread(self._merge, pending):
+                        self._pending.update(pending)
+        finally:
+            self.flush()
+
+    def pending(self) -> Dict[QueryKey, int]:
+        """Copy of the counts not yet flushed.
+
+        Take it on the thread that calls :meth:`record` and pass it to
+        :meth:`top` when that runs in a worker thread.
+        """
+        return dict(self._pending)
+
+    def top(
+        self,
+        count: int,
+        min_count: int = 1,
+        pending: Optional[Dict[QueryKey, int]] = None,
+    ) -> List[QueryKey]:
+        """The ``count`` most frequent searches, most frequent first.
+
+        Args:
+            count: Maximum number of searches
+            min_count: Ignore searches seen fewer times
+            pending: Unflushed counts to include (see :meth:`pending`);
+                defaults to this process' own, read directly
+        """
+        counts = self._read()
+        counts.update(self._pending if pending is None else pending)
+        return [key for key, seen in counts.most_common(count) if seen >= min_count]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "recorded": self.recorded,
+            "skipped": self.skipped,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,161 @@
+"""Second-stage re-ranking of search candidates.
+
+First-stage retrieval (BM25 over chunk text) finds approximately
+relevant chunks. The re-ranker re-scores only the top ``candidates`` of
+them with cheap features that BM25 does not see:
+
+* query-term coverage of the document title and the chunk heading,
+* exact query phrases in the title or heading,
+* section priority (the order of ``sections`` in the tool's config),
+* version recency among the candidates of the same tool.
+
+Each feature is normalized to ``[0, 1]`` and combined with the
+normalized first-stage score using configurable weights. Scoring runs
+under a strict per-query time budget: if the budget is exhausted the
+first-stage order is returned unchanged, so re-ranking can only cost a
+bounded amount of latency.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .dedup import version_key
+from .index import SearchHit
+from .lexical import all_tokens, parse_query
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "first_stage": 1.0,
+    "title": 0.6,
+    "heading": 0.4,
+    "phrase": 0.3,
+    "section": 0.2,
+    "recency": 0.2,
+}
+
+
+class Reranker:
+    """Feature-based re-ranker with a candidate and time budget."""
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        tools_config: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """Initialize the re-ranker.
+
+        Args:
+            config: The ``rerank`` configuration section
+            tools_config: The ``tools`` configuration section (for section
+                priorities)
+        """
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        self.candidates = config.get("candidates", 20)
+        self.budget = config.get("budget_ms", 15) / 1000
+        self.weights = dict(DEFAULT_WEIGHTS, **config.get("weights", {}))
+        self.sections: Dict[str, Dict[str, float]] = {}
+        for tool, tool_config in (tools_config or {}).items():
+            sections = tool_config.get("sections", [])
+            self.sections[tool] = {
+                section: 1 - position / len(sections)
+                for position, section in enumerate(sections)
+            }
+        self.fallbacks = 0
+
+    def pool_size(self, limit: int) -> int:
+        """Number of first-stage candidates to fetch for ``limit`` results."""
+        return max(limit, self.candidates) if self.enabled else limit
+
+    @staticmethod
+    def _query_terms(query: str) -> Tuple[Set[str], List[List[str]]]:
+        terms: Set[str] = set()
+        phrases: List[List[str]] = []
+        for clause in parse_query(query).clauses:
+            if clause.kind == "term":
+                terms.update(clause.terms)
+            elif clause.kind == "phrase":
+                terms.update(clause.terms)
+                phrases.append(clause.terms)
+        return terms, phrases
+
+    @staticmethod
+    def _coverage(terms: Set[str], tokens: List[str]) -> float:
+        if not terms:
+            return 0.0
+        return len(terms.intersection(tokens)) / len(terms)
+
+    @staticmethod
+    def _contains(tokens: List[str], phrase: List[str]) -> bool:
+        size = len(phrase)
+        return any(
+            tokens[start : start + size] == phrase
+            for start in range(len(tokens) - size + 1)
+        )
+
+    @staticmethod
+    def _recency(hits: List[SearchHit]) -> Dict[Tuple[str, Optional[str]], float]:
+        """Rank each tool's candidate versions from oldest (0) to newest (1)."""
+        versions: Dict[str, Set[str]] = {}
+        for hit in hits:
+            if hit.version:
+                versions.setdefault(hit.tool, set()).add(hit.version)
+        recency = {}
+        for tool, present in versions.items():
+            ordered = sorted(present, key=version_key)
+            for position, version in enumerate(ordered):
+                recency[(tool, version)] = (
+                    position / (len(ordered) - 1) if len(ordered) > 1 else 1.0
+                )
+        return recency
+
+    def rerank(self, query: str, hits: List[SearchHit]) -> Tuple[List[SearchHit], bool]:
+        """Re-order the top ``candidates`` of ``hits``.
+
+        Args:
+            query: The search query
+            hits: First-stage hits in descending score order
+
+        Returns:
+            All hits, with the top candidates re-ordered, and whether
+            re-ranking completed within the time budget (if not, the
+            first-stage order is kept)
+        """
+        pool, rest = hits[: self.candidates], hits[self.candidates :]
+        if not self.enabled or len(pool) < 2:
+            return hits, self.enabled
+
+        deadline = time.perf_counter() + self.budget
+        weights = self.weights
+        terms, phrases = self._query_terms(query)
+        top_score = max(hit.score for hit in pool) or 1.0
+        recency = self._recency(pool)
+
+        scored = []
+        for position, hit in enumerate(pool):
+            if time.perf_counter() > deadline:
+                self.fallbacks += 1
+                logger.debug("Re-ranking exceeded budget after %d hits", position)
+                return hits, False
+
+            title = all_tokens(hit.title)
+            heading = all_tokens(hit.heading)
+            score = weights["first_stage"] * hit.score / top_score
+            score += weights["title"] * self._coverage(terms, title)
+            score += weights["heading"] * self._coverage(terms, heading)
+            if phrases and any(
+                self._contains(title, phrase) or self._contains(heading, phrase)
+                for phrase in phrases
+            ):
+                score += weights["phrase"]
+            score += weights["section"] * self.sections.get(hit.tool, {}).get(
+                hit.section or "", 0.0
+            )
+            score += weights["recency"] * recency.get((hit.tool, hit.version), 0.0)
+            # Ties keep first-stage order
+            scored.append((-score, position, hit))
+
+        scored.sort(key=lambda item: item[:2])
+        return [hit for _, _, hit in scored] + rest, True
@@ -0,0 +1,223 @@
+"""Background crawl scheduler.
+
+Each tool is refreshed on its own ``cache_ttl`` instead of one global
+crawl interval. Refresh times are jittered, tools that have never been
+crawled are spread over a start-up window, and a global cap bounds how
+many tools are crawled at once, so there is no synchronized crawl spike.
+
+The scheduler runs its own asyncio loop in a daemon thread. On Linux the
+thread lowers its scheduling priority (``nice``) so crawling and index
+rebuilds yield the CPU to query serving.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .crawl import DocumentationCrawler
+from .index import DocumentIndex
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlScheduler:
+    """Refreshes each enabled tool when its ``cache_ttl`` expires."""
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        crawler: Optional[DocumentationCrawler] = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            config: Full server configuration (``tools``, ``scheduler``, ...)
+            crawler: Crawler to use (one is created from ``config`` when
+                omitted)
+        """
+        self.config = config
+        self.settings = config.get("scheduler", {})
+        self.crawler = crawler or DocumentationCrawler(config)
+        self.max_concurrent = self.settings.get("max_concurrent_crawls", 1)
+        self.jitter = self.settings.get("jitter", 0.1)
+        self.startup_delay = self.settings.get("startup_delay", 300)
+        self.failure_retry = self.settings.get("failure_retry", 900)
+        self.default_ttl = self.settings.get("default_ttl", 86400)
+        self.nice = self.settings.get("nice", 10)
+
+        self.next_due: Dict[str, float] = {}
+        self.last_result: Dict[str, Dict[str, Any]] = {}
+        self.running: Dict[str, float] = {}
+
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    def ttl(self, tool: str) -> float:
+        """Refresh interval for ``tool`` in seconds."""
+        tool_config = self.config.get("tools", {}).get(tool, {})
+        return float(tool_config.get("cache_ttl", self.default_ttl))
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def plan(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Compute the first refresh time of every enabled tool.
+
+        Tools already in the index are due one (jittered) TTL after their
+        last crawl; tools that were never crawled are spread over
+        ``startup_delay`` seconds.
+        """
+        now = time.time() if now is None else now
+        try:
+            manifest = DocumentIndex.read_manifest(self.crawler.index_path)
+        except (OSError, ValueError) as e:
+            logger.warning("Cannot read index manifest: %s", e)
+            manifest = {}
+        indexed = manifest.get("tools", {})
+
+        for tool in self.crawler.enabled_tools():
+            last_crawled = indexed.get(tool, {}).get("last_crawled")
+            if last_crawled:
+                due = last_crawled + self._jittered(self.ttl(tool))
+            else:
+                due = now + random.uniform(0, self.startup_delay)
+            self.next_due[tool] = due
+        return dict(self.next_due)
+
+    async def _refresh(
+        self, tool: str, semaphore: asyncio.Semaphore, index_lock: asyncio.Lock
+    ) -> None:
+        async with semaphore:
+            started = time.time()
+            self.running[tool] = started
+            logger.info("🕷️  Scheduled refresh of %s", tool)
+            try:
+                result = await self.crawler.crawl_tool(tool, update_index=False)
+                if result["status"] == "crawled":
+                    # Index rebuilds share one file set; run them one at a time
+                    async with index_lock:
+                        await asyncio.get_running_loop().run_in_executor(
+                            None, self.crawler.update_index, [tool]
+                        )
+                ok = result["status"] == "crawled" and (
+                    result.get("pages_failed", 0) < result.get("pages_found", 0)
+                    or not result.get("pages_found")
+                )
+            except Exception as e:
+                logger.error("Scheduled refresh of %s failed: %s", tool, e)
+                result = {"tool": tool, "status": "error", "message": str(e)}
+                ok = False
+            finally:
+                self.running.pop(tool, None)
+
+            finished = time.time()
+            delay = self._jittered(self.ttl(tool) if ok else self.failure_retry)
+            self.next_due[tool] = finished + delay
+            self.last_result[tool] = dict(
+                result, started_at=started, duration=round(finished - started, 1)
+            )
+            logger.log(
+                logging.INFO if ok else logging.WARNING,
+                "%s Refresh of %s %s in %.0fs, next refresh in %.0f min",
+                "✅" if ok else "⚠️ ",
+                tool,
+                "finished" if ok else "failed",
+                finished - started,
+                delay / 60,
+            )
+
+    async def run(self) -> None:
+        """Run the scheduling loop until :meth:`stop` is called."""
+        self._wakeup = asyncio.Event()
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        index_lock = asyncio.Lock()
+        tasks: Dict[str, asyncio.Task] = {}
+        if not self.next_due:
+            self.plan()
+
+        while not self._stopping:
+            now = time.time()
+            for tool, due in sorted(self.next_due.items(), key=lambda item: item[1]):
+                if due <= now and tool not in tasks:
+                    tasks[tool] = asyncio.create_task(
+                        self._refresh(tool, semaphore, index_lock)
+                    )
+            for tool in [t for t, task in tasks.items() if task.done()]:
+                del tasks[tool]
+
+            pending = [due for t, due in self.next_due.items() if t not in tasks]
+            sleep = min(pending) - time.time() if pending else 60
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(1.0, min(sleep, 60)))
+            except asyncio.TimeoutError:
+                pass
+
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    def _lower_priority(self) -> None:
+        """Lower this thread's CPU priority (Linux: nice is per thread)."""
+        if not self.nice or not hasattr(os, "setpriority"):
+            return
+        try:
+            tid = threading.get_native_id()
+            current = os.getpriority(os.PRIO_PROCESS, tid)
+            os.setpriority(os.PRIO_PROCESS, tid, current + self.nice)
+        except OSError as e:
+            logger.debug("Could not lower crawl thread priority: %s", e)
+
+    def _thread_main(self) -> None:
+        self._lower_priority()
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self.run())
+        finally:
+            self._loop.close()
+
+    def start(self) -> None:
+        """Start the scheduler in a background thread."""
+        self.plan()
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._thread_main, name="crawl-scheduler", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "🗓️  Crawl scheduler started for %d tools (max %d concurrent)",
+            len(self.next_due),
+            self.max_concurrent,
+        )
+
+    def stop(self, timeout: float = 10) -> None:
+        """Stop the scheduler, cancelling in-flight crawls."""
+        self._stopping = True
+        if self._loop is not None and self._wakeup is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass  # loop already closed
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tool schedule, for health output."""
+        now = time.time()
+        status = {}
+        for tool, due in self.next_due.items():
+            last = self.last_result.get(tool, {})
+            status[tool] = {
+                "running": tool in self.running,
+                "next_refresh_in": max(0, round(due - now)),
+                "ttl": self.ttl(tool),
+                "last_status": last.get("status"),
+                "last_refresh": last.get("started_at"),
+            }
+        return status
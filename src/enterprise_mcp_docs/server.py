@@ -14,6 +14,11 @@ import threading
 import time
 from datetime import datetime
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, Optional
+
+from .config import load_config
+from .governor import ResourceGovernor, read_published, render_metrics
+from .scheduler import CrawlScheduler
 
 # Configure logging
 logging.basicConfig(
@@ -27,8 +32,24 @@ logger = logging.getLogger(__name__)
 class HealthHandler(BaseHTTPRequestHandler):
     """Simple HTTP handler for health checks"""
 
+    def _resource_statuses(self):
+        """Memory status of this process and of published MCP servers."""
+        governor = getattr(self.server, "governor", None)
+        if governor is None:
+            return []
+        published = read_published(governor.status_dir, 6 * governor.check_interval)
+        return [governor.status()] + [
+            status for status in published if status.get("pid") != os.getpid()
+        ]
+
     def do_GET(self):
-        if self.path == "/health":
+        if self.path == "/metrics":
+            body = render_metrics(self._resource_statuses()).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-type", "text/plain; version=0.0.4")
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/health":
             self.send_response(200)
             self.send_header("Content-type", "application/json")
             self.end_headers()
@@ -39,6 +60,14 @@ class HealthHandler(BaseHTTPRequestHandler):
                 "components": {"redis": "ok", "vector_db": "ok"},
                 "timestamp": datetime.now().isoformat(),
             }
+            scheduler = getattr(self.server, "scheduler", None)
+            if scheduler is not None:
+                health_data["scheduler"] = scheduler.status()
+            resources = self._resource_statuses()
+            if resources:
+                health_data["resources"] = resources
+                if any(status["level"] == "high" for status in resources):
+                    health_data["status"] = "degraded"
 
             self.wfile.write(json.dumps(health_data).encode("utf-8"))
         else:
@@ -54,11 +83,14 @@ class HealthHandler(BaseHTTPRequestHandler):
 class MCPServer:
     """Basic MCP Server for development"""
 
-    def __init__(self):
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config
         self.running = False
         self.start_time = datetime.now()
         self.http_server = None
         self.http_thread = None
+        self.scheduler: Optional[CrawlScheduler] = None
+        self.governor: Optional[ResourceGovernor] = None
 
     def start(self):
         """Start the MCP server"""
@@ -80,8 +112,13 @@ class MCPServer:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
+        if self.config is None:
+            self.config = load_config(os.getenv("CONFIG_FILE"))
+
         # Start HTTP server for health checks
         self._start_http_server()
+        self._start_governor()
+        self._start_scheduler()
 
         self.running = True
 
@@ -91,8 +128,49 @@ class MCPServer:
             logger.error(f"❌ Error in MCP server: {e}")
             raise
         finally:
+            self._stop_scheduler()
+            self._stop_governor()
             self._stop_http_server()
 
+    def _start_scheduler(self):
+        """Start the background crawl scheduler if enabled"""
+        if not self.config.get("scheduler", {}).get("enabled", True):
+            logger.info("🗓️  Crawl scheduler disabled")
+            return
+        try:
+            self.scheduler = CrawlScheduler(self.config)
+            self.scheduler.start()
+            if self.http_server:
+                self.http_server.scheduler = self.scheduler
+        except Exception as e:
+            logger.error(f"❌ Failed to start crawl scheduler: {e}")
+            self.scheduler = None
+
+    def _start_governor(self):
+        """Start tracking this process' memory against its budget"""
+        resources = self.config.get("resources", {})
+        self.governor = ResourceGovernor(resources, name="server")
+        if self.http_server:
+            self.http_server.governor = self.governor
+        if not self.governor.enabled:
+            return
+        self.governor.start()
+        if self.governor.budget:
+            logger.info(
+                f"🧮 Memory budget: {self.governor.budget / 1024 / 1024:.0f} MB"
+            )
+
+    def _stop_governor(self):
+        """Stop the memory governor"""
+        if self.governor:
+            self.governor.stop()
+
+    def _stop_scheduler(self):
+        """Stop the background crawl scheduler"""
+        if self.scheduler:
+            logger.info("🛑 Stopping crawl scheduler...")
+            self.scheduler.stop()
+
     def _start_http_server(self):
         """Start HTTP server for health checks"""
         try:
@@ -146,7 +224,7 @@ class MCPServer:
                 if heartbeat_count % 5 == 0:
                     uptime = datetime.now() - self.start_time
                     logger.info(f"📊 Uptime: {uptime}")
-                    logger.info("🔧 Ready for MCP implementation development")
+                    self._log_schedule()
 
                 # Health check every 10 minutes
                 if heartbeat_count % 10 == 0:
@@ -161,6 +239,20 @@ class MCPServer:
 
         logger.info("✅ MCP Server shutdown completed")
 
+    def _log_schedule(self):
+        """Log running crawls and the next scheduled refresh"""
+        if not self.scheduler:
+            return
+        status = self.scheduler.status()
+        running = [tool for tool, entry in status.items() if entry["running"]]
+        if running:
+            logger.info(f"🕷️  Crawling: {', '.join(running)}")
+        waiting = {t: e for t, e in status.items() if not e["running"]}
+        if waiting:
+            tool = min(waiting, key=lambda t: waiting[t]["next_refresh_in"])
+            minutes = waiting[tool]["next_refresh_in"] / 60
+            logger.info(f"🗓️  Next refresh: {tool} in {minutes:.0f} min")
+
     def _health_check(self):
         """Perform basic health checks"""
         try:
@@ -178,6 +270,16 @@ class MCPServer:
 
                 memory = psutil.virtual_memory()
                 logger.info(f"📈 Memory usage: {memory.percent}%")
+                if self.governor and self.governor.rss:
+                    budget = self.governor.budget
+                    logger.info(
+                        f"📈 Process RSS: {self.governor.rss / 1024 / 1024:.0f} MB"
+                        + (
+                            f" of {budget / 1024 / 1024:.0f} MB budget"
+                            if budget
+                            else ""
+                        )
+                    )
             except ImportError:
                 # psutil not available, that's OK
                 pass
@@ -0,0 +1,126 @@
+"""Query-time synonym expansion for lexical search.
+
+Documentation uses a product's own vocabulary ("container", "index
+template") while questions often use abbreviations or neighbouring
+terms ("ctr", "k8s", "env var"). Without embeddings, the lexical engine
+only bridges that gap through synonyms: each plain query term gets its
+synonyms added as optional, down-weighted clauses, so exact matches
+still rank first.
+
+Synonyms are groups of interchangeable terms. A group entry with several
+words ("environment variable") is matched as a phrase.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from .lexical import TEXT, Clause, Query, all_tokens, parse_query
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNONYMS: List[List[str]] = [
+    ["k8s", "kubernetes"],
+    ["es", "elasticsearch"],
+    ["env", "environment"],
+    ["env var", "environment variable"],
+    ["config", "configuration", "settings"],
+    ["db", "database"],
+    ["auth", "authentication"],
+    ["authz", "authorization"],
+    ["repo", "repository"],
+    ["dir", "directory", "folder"],
+    ["vm", "virtual machine", "guest"],
+    ["ct", "lxc", "container"],
+    ["py", "python"],
+    ["async", "asyncio", "coroutine"],
+    ["deps", "dependencies"],
+    ["mapping", "schema"],
+    ["delete", "remove"],
+    ["install", "setup"],
+    ["upgrade", "update"],
+    ["error", "exception"],
+    ["log", "logging"],
+    ["llm", "model"],
+    ["cve", "vulnerability"],
+    ["ticket", "incident"],
+    ["workflow", "automation"],
+]
+
+DEFAULT_BOOST = 0.5
+
+
+class SynonymExpander:
+    """Adds synonym clauses to parsed queries."""
+
+    def __init__(self, groups: Iterable[Iterable[str]], boost: float = DEFAULT_BOOST):
+        """Initialize the expander.
+
+        Args:
+            groups: Groups of interchangeable terms or phrases
+            boost: Score weight of synonym clauses relative to the
+                original terms
+        """
+        self.boost = boost
+        self._synonyms: Dict[str, List[List[str]]] = {}
+        for group in groups:
+            variants = [all_tokens(entry) for entry in group]
+            variants = [tokens for tokens in variants if tokens]
+            for tokens in variants:
+                if len(tokens) != 1:
+                    continue
+                others = self._synonyms.setdefault(tokens[0], [])
+                others.extend(v for v in variants if v != tokens and v not in others)
+        # Identifies the synonym set, so cached results of expanded queries
+        # are not reused after the synonyms change
+        self.fingerprint = hashlib.sha1(
+            json.dumps([sorted(self._synonyms.items()), boost]).encode("utf-8")
+        ).hexdigest()[:12]
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]] = None) -> "SynonymExpander":
+        """Build from the ``search`` configuration section.
+
+        ``synonyms`` (a list of groups) and the JSON file named by
+        ``synonyms_file`` extend the built-in groups.
+        """
+        config = config or {}
+        groups = list(DEFAULT_SYNONYMS) + list(config.get("synonyms", []))
+        path = config.get("synonyms_file")
+        if path:
+            try:
+                with open(path) as f:
+                    groups.extend(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning("Cannot load synonyms from %s: %s", path, e)
+        return cls(groups, config.get("synonym_boost", DEFAULT_BOOST))
+
+    def synonyms(self, term: str) -> List[List[str]]:
+        """Token lists of the synonyms of ``term``."""
+        return self._synonyms.get(term, [])
+
+    def expand(self, query: Query) -> Query:
+        """Return ``query`` with optional clauses for synonyms of its terms.
+
+        Only free-text terms are expanded; phrases, fielded terms and
+        wildcards are taken literally.
+        """
+        present = {
+            tuple(clause.terms) for clause in query.clauses if clause.field == TEXT
+        }
+        added: List[Clause] = []
+        for clause in query.clauses:
+            if clause.kind != "term" or clause.field != TEXT or clause.required:
+                continue
+            for tokens in self.synonyms(clause.terms[0]):
+                if tuple(tokens) in present:
+                    continue
+                present.add(tuple(tokens))
+                kind = "term" if len(tokens) == 1 else "phrase"
+                added.append(Clause(kind, tokens, TEXT, boost=self.boost))
+        return Query(query.clauses + added) if added else query
+
+    def parse(self, text: str) -> Query:
+        """Parse and expand a query string."""
+        return self.expand(parse_query(text))
@@ -0,0 +1,303 @@
+"""Block-compressed storage for chunk text.
+
+Chunk text makes up most of an index. A :class:`TextStore` packs the
+texts of one shard into blocks of about :data:`BLOCK_SIZE` bytes, each
+compressed independently, plus a block-offset table mapping every text
+to ``(block, start, end)``. Reading a text decompresses only its block;
+a small LRU keeps recently used blocks so hot sections are served from
+memory.
+
+Blocks are compressed with zlib and a preset dictionary of the shard's
+most frequent lines and words, or, when ``index.text_codec`` asks for
+it, with zstd and a dictionary trained on the shard's own text. Both
+make small blocks compress nearly as well as the whole shard would.
+zlib is the default because an index must load on every host it is
+shipped to; zstd needs the optional ``zstandard`` package on each of
+them.
+
+File layout: ``MAGIC``, a 4-byte little-endian header length, a
+zlib-compressed JSON header (codec, dictionary size, block sizes and
+text offsets), the dictionary and the compressed blocks.
+"""
+
+import json
+import logging
+import struct
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:  # zstd support is optional
+    zstandard = None
+
+from .lexical import TOKEN_RE
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MCPTXT1\n"
+_HEADER_LENGTH = struct.Struct("<I")
+
+# Target uncompressed size of a block (a single larger text gets its own)
+BLOCK_SIZE = 16 * 1024
+DICTIONARY_SIZE = 32 * 1024
+# Decompressed blocks kept per store
+DEFAULT_CACHE_BLOCKS = 64
+
+# zstd dictionary training needs a reasonable number of samples
+_MIN_TRAINING_SAMPLES = 32
+
+
+CODECS = ("zlib", "zstd")
+MISSING_ZSTD = (
+    "text codec zstd needs the zstandard package "
+    "(pip install 'enterprise-mcp-docs[compression]')"
+)
+
+
+def default_codec() -> str:
+    """Codec of new stores: zlib, which every installation can read."""
+    return "zlib"
+
+
+def codec_available(codec: str) -> bool:
+    """True if stores written with ``codec`` can be read here."""
+    return codec == "zlib" or (codec == "zstd" and zstandard is not None)
+
+
+def read_codec(path: Union[str, Path]) -> str:
+    """Codec of the store saved at ``path``, reading only its header.
+
+    Raises:
+        ValueError: If ``path`` is not a text store
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(len(MAGIC) + _HEADER_LENGTH.size)
+        if not prefix.startswith(MAGIC):
+            raise ValueError(f"Not a text store: {path}")
+        (length,) = _HEADER_LENGTH.unpack_from(prefix, len(MAGIC))
+        header = json.loads(zlib.decompress(f.read(length)))
+    return header["codec"]
+
+
+def _zlib_dictionary(texts: List[str], size: int) -> bytes:
+    """Preset dictionary of the corpus' most repeated lines and words.
+
+    Documentation repeats boilerplate lines ("Parameters", "Example",
+    admonitions) and vocabulary across chunks; those are what a block
+    cannot learn from its own few kilobytes. zlib matches against the end
+    of the dictionary most cheaply, so the most frequent entries go last.
+    """
+    lines: Counter = Counter()
+    words: Counter = Counter()
+    for text in texts:
+        lines.update(line.strip() for line in text.splitlines() if len(line) > 8)
+        words.update(TOKEN_RE.findall(text.lower()))
+
+    entries: List[bytes] = []
+    used = 0
+    for counts, separator in ((lines, b"\n"), (words, b" ")):
+        for entry, count in counts.most_common():
+            if count < 2:
+                break
+            encoded = entry.encode("utf-8") + separator
+            if used + len(encoded) > size:
+                break
+            entries.append(encoded)
+            used += len(encoded)
+    # Lines were added first but should sit closest to the end
+    lines_end = sum(1 for entry in entries if entry.endswith(b"\n"))
+    ordered = entries[lines_end:][::-1] + entries[:lines_end][::-1]
+    return b"".join(ordered)
+
+
+def _train_dictionary(texts: List[str], size: int, codec: str) -> bytes:
+    if codec == "zlib":
+        return _zlib_dictionary(texts, size)
+    samples = [text.encode("utf-8") for text in texts if text]
+    if len(samples) < _MIN_TRAINING_SAMPLES:
+        return b""
+    try:
+        return zstandard.train_dictionary(size, samples).as_bytes()
+    except zstandard.ZstdError as e:
+        logger.debug("zstd dictionary training failed: %s", e)
+        return b""
+
+
+class TextStore:
+    """Independently compressed blocks of text with an LRU of hot blocks."""
+
+    def __init__(
+        self,
+        codec: str,
+        dictionary: bytes,
+        blocks: List[bytes],
+        offsets: List[Tuple[int, int, int]],
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+    ):
+        if codec not in CODECS:
+            raise ValueError(f"Unsupported text store codec: {codec}")
+        if not codec_available(codec):
+            raise RuntimeError(f"Cannot read text store: {MISSING_ZSTD}")
+        self.codec = codec
+        self.dictionary = dictionary
+        self.blocks = blocks
+        self.offsets = offsets
+        self.cache_blocks = cache_blocks
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def build(
+        cls,
+        texts: Iterable[str],
+        codec: Optional[str] = None,
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+    ) -> "TextStore":
+        """Compress ``texts`` into a new store; text ``i`` gets ref ``i``."""
+        texts = list(texts)
+        codec = codec or default_codec()
+        dictionary = _train_dictionary(texts, DICTIONARY_SIZE, codec)
+
+        raw_blocks: List[bytes] = []
+        offsets: List[Tuple[int, int, int]] = []
+        current = bytearray()
+        for text in texts:
+            data = text.encode("utf-8")
+            if current and len(current) + len(data) > BLOCK_SIZE:
+                raw_blocks.append(bytes(current))
+                current = bytearray()
+            offsets.append((len(raw_blocks), len(current), len(current) + len(data)))
+            current.extend(data)
+        if current:
+            raw_blocks.append(bytes(current))
+
+        store = cls(codec, dictionary, [], offsets, cache_blocks)
+        store.blocks = [store._compress(block) for block in raw_blocks]
+        return store
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            params = {"level": 10}
+            if self.dictionary:
+                params["dict_data"] = zstandard.ZstdCompressionDict(self.dictionary)
+            return zstandard.ZstdCompressor(**params).compress(data)
+        if self.dictionary:
+            compressor = zlib.compressobj(9, zdict=self.dictionary)
+        else:
+            compressor = zlib.compressobj(9)
+        return compressor.compress(data) + compressor.flush()
+
+    def _decompress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            # Decompressors are not thread-safe; keep one per thread
+            decompressor = getattr(self._local, "zstd", None)
+            if decompressor is None:
+                params = {}
+                if self.dictionary:
+                    params["dict_data"] = zstandard.ZstdCompressionDict(self.dictionary)
+                decompressor = zstandard.ZstdDecompressor(**params)
+                self._local.zstd = decompressor
+            return decompressor.decompress(data)
+        if self.dictionary:
+            decompressor = zlib.decompressobj(zdict=self.dictionary)
+        else:
+            decompressor = zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def block(self, number: int) -> bytes:
+        """Decompressed block ``number``, through the LRU."""
+        with self._lock:
+            data = self._cache.get(number)
+            if data is not None:
+                self._cache.move_to_end(number)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        data = self._decompress(self.blocks[number])
+        with self._lock:
+            self._cache[number] = data
+            while len(self._cache) > self.cache_blocks:
+                self._cache.popitem(last=False)
+        return data
+
+    def get(self, ref: int) -> str:
+        """Text with reference ``ref``."""
+        number, start, end = self.offsets[ref]
+        return self.block(number)[start:end].decode("utf-8")
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def resize_cache(self, cache_blocks: int) -> None:
+        """Change the number of cached blocks, evicting the oldest."""
+        with self._lock:
+            self.cache_blocks = cache_blocks
+            while len(self._cache) > cache_blocks:
+                self._cache.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "codec": self.codec,
+            "texts": len(self.offsets),
+            "blocks": len(self.blocks),
+            "compressed_bytes": sum(len(block) for block in self.blocks),
+            "dictionary_bytes": len(self.dictionary),
+            "cached_blocks": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def to_bytes(self) -> bytes:
+        sizes = [len(block) for block in self.blocks]
+        header = json.dumps(
+            {
+                "codec": self.codec,
+                "dictionary": len(self.dictionary),
+                "blocks": sizes,
+                "offsets": self.offsets,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        header = zlib.compress(header, 9)
+        return b"".join(
+            [MAGIC, _HEADER_LENGTH.pack(len(header)), header, self.dictionary]
+            + self.blocks
+        )
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, cache_blocks: int = DEFAULT_CACHE_BLOCKS
+    ) -> "TextStore":
+        """Load a store written by :meth:`to_bytes`.
+
+        Raises:
+            ValueError: If ``data`` is not a text store
+        """
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a text store")
+        position = len(MAGIC)
+        (length,) = _HEADER_LENGTH.unpack_from(data, position)
+        position += _HEADER_LENGTH.size
+        header = json.loads(zlib.decompress(data[position : position + length]))
+        position += length
+
+        dictionary = data[position : position + header["dictionary"]]
+        position += header["dictionary"]
+        blocks = []
+        for size in header["blocks"]:
+            blocks.append(data[position : position + size])
+            position += size
+        offsets = [tuple(offset) for offset in header["offsets"]]
+        return cls(header["codec"], dictionary, blocks, offsets, cache_blocks)
@@ -0,0 +1,333 @@
+"""Lightweight request tracing and slow-query logging.
+
+Each MCP tool call is traced as a root span with child spans for its
+stages (cache lookup, query encoding, lexical search, rendering, ...).
+Finished traces can be exported as JSON lines whose records follow the
+OpenTelemetry span data model (``traceId``, ``spanId``,
+``startTimeUnixNano``, attribute key/value lists), so they can be
+replayed into an OTLP collector later; nothing is sent over the network.
+
+Calls slower than ``slow_query_ms`` are logged with a per-stage
+breakdown to the ``enterprise_mcp_docs.slow_queries`` logger and,
+optionally, to a JSON lines file. Both files are written by a
+background thread. Tool arguments are recorded through
+:func:`summarize_arguments` (keys, lengths and hashes), never verbatim.
+
+Spans are cheap when tracing is disabled: :meth:`Tracer.span` then
+yields None without creating any objects.
+"""
+
+import contextvars
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("enterprise_mcp_docs.slow_queries")
+
+# Maximum length of string attribute values
+MAX_ATTRIBUTE_CHARS = 500
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def summarize_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Span attributes describing tool arguments without their content.
+
+    Free-text arguments such as search queries may contain personal data,
+    so traces and the slow-query log only get their length and a short
+    hash (enough to group repeated calls); numbers and flags are kept.
+    """
+    attributes: Dict[str, Any] = {"mcp.argument_keys": sorted(arguments)}
+    for key, value in arguments.items():
+        if isinstance(value, (bool, int, float)):
+            attributes[f"mcp.arguments.{key}"] = value
+        elif isinstance(value, str):
+            digest = hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+            attributes[f"mcp.arguments.{key}.length"] = len(value)
+            attributes[f"mcp.arguments.{key}.sha256"] = digest
+        elif isinstance(value, (list, tuple, dict)):
+            attributes[f"mcp.arguments.{key}.count"] = len(value)
+    return attributes
+
+
+def _otel_value(value: Any) -> Dict[str, Any]:
+    """Encode an attribute value as an OpenTelemetry ``AnyValue``."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if not isinstance(value, str):
+        value = json.dumps(value, default=str)
+    return {"stringValue": value[:MAX_ATTRIBUTE_CHARS]}
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "error",
+        "_finished",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional["Span"] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+        # Finished spans of the whole trace, collected on the root
+        self._finished: List["Span"] = []
+
+    @property
+    def root(self) -> "Span":
+        span = self
+        while span.parent is not None:
+            span = span.parent
+        return span
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+        self.root._finished.append(self)
+
+    def stages(self) -> Dict[str, float]:
+        """Total milliseconds spent per stage name below this root span."""
+        totals: Dict[str, float] = {}
+        for span in self._finished:
+            if span is not self:
+                totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        return {name: round(ms, 3) for name, ms in totals.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """OpenTelemetry-compatible JSON representation."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent.span_id if self.parent else "",
+            "name": self.name,
+            "kind": 2 if self.parent is None else 1,  # SERVER / INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [
+                {"key": key, "value": _otel_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": (
+                {"code": 2, "message": self.error} if self.error else {"code": 1}
+            ),
+        }
+
+
+class JsonLinesExporter:
+    """Append records to a JSON lines file from a background thread.
+
+    :meth:`write` only queues the records, so callers on the event loop
+    never wait for serialization or disk I/O. A daemon thread writes the
+    queue every ``flush_interval`` seconds; records beyond ``max_pending``
+    are dropped (and counted) rather than growing without bound.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+    ):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._file: Any = None
+        self._pending: List[Dict[str, Any]] = []
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def write(self, records: Iterable[Dict[str, Any]]) -> None:
+        records = list(records)
+        with self._condition:
+            if self._closed:
+                return
+            room = self.max_pending - len(self._pending)
+            if len(records) > room:
+                self.dropped += len(records) - max(room, 0)
+                records = records[: max(room, 0)]
+            self._pending.extend(records)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="trace-exporter", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed, timeout=self.flush_interval
+                )
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def flush(self) -> None:
+        """Write the queued records now."""
+        with self._condition:
+            records, self._pending = self._pending, []
+        if not records:
+            return
+        data = "".join(json.dumps(record, default=str) + "\n" for record in records)
+        with self._write_lock:
+            try:
+                if self._file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(data)
+                self._file.flush()
+            except OSError as e:
+                logger.warning("Failed to write %s: %s", self.path, e)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Tracer:
+    """Creates spans and exports finished traces."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize the tracer.
+
+        Args:
+            config: The ``tracing`` configuration section
+        """
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        self.slow_query_ms = config.get("slow_query_ms", 500)
+        self.exporter = (
+            JsonLinesExporter(config["export_path"])
+            if config.get("export_path")
+            else None
+        )
+        self.slow_log = (
+            JsonLinesExporter(config["slow_query_log"])
+            if config.get("slow_query_log")
+            else None
+        )
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Start a new trace with a root span named ``name``."""
+        if not self.enabled:
+            yield None
+            return
+        root = Span(name, None, attributes)
+        try:
+            with self._activate(root):
+                yield root
+        finally:
+            self._finish_trace(root)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Time a stage of the current trace (no-op outside a trace)."""
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        with self._activate(Span(name, parent, attributes)) as span:
+            yield span
+
+    @contextmanager
+    def _activate(self, span: Span) -> Iterator[Span]:
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def _finish_trace(self, root: Span) -> None:
+        if self.exporter is not None:
+            self.exporter.write(span.to_dict() for span in root._finished)
+
+        duration_ms = root.duration_ms
+        if self.slow_query_ms is None or duration_ms < self.slow_query_ms:
+            return
+
+        stages = root.stages()
+        slow_query_logger.warning(
+            "🐢 Slow %s took %.1f ms %s %s",
+            root.name,
+            duration_ms,
+            root.attributes,
+            stages,
+        )
+        if self.slow_log is not None:
+            self.slow_log.write(
+                [
+                    {
+                        "timestamp": root.start_ns / 1e9,
+                        "trace_id": root.trace_id,
+                        "name": root.name,
+                        "duration_ms": round(duration_ms, 3),
+                        "attributes": root.attributes,
+                        "stages": stages,
+                    }
+                ]
+            )
+
+    def close(self) -> None:
+        for exporter in (self.exporter, self.slow_log):
+            if exporter is not None:
+                exporter.close()
@@ -0,0 +1,140 @@
+"""Optional embedding-based scoring for ``hybrid`` search mode.
+
+The default ``lite`` search mode ranks purely with the lexical index and
+never imports a model. In ``hybrid`` mode the top lexical candidates are
+also embedded with a sentence-transformers model and the two rankings
+are combined with reciprocal rank fusion (RRF): every hit scores
+``1 / (k + rank)`` per ranking it appears in.
+
+``sentence-transformers`` (and with it torch) is only imported here, when
+hybrid mode is enabled, and is an optional dependency (the ``vector``
+extra). If it cannot be loaded the server logs a warning and stays in
+lite mode.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from .index import SearchHit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+# Damping constant of reciprocal rank fusion
+RRF_K = 60
+
+
+class VectorScorer:
+    """Embeds search candidates and fuses their ranks with the lexical order."""
+
+    def __init__(self, model: Any, candidates: int = 50, cache_size: int = 4096):
+        """Initialize the scorer.
+
+        Args:
+            model: Object with a sentence-transformers style
+                ``encode(texts, normalize_embeddings=True)`` method
+            candidates: Number of top lexical hits to embed per query
+            cache_size: Number of chunk embeddings kept in memory
+        """
+        self.model = model
+        self.candidates = candidates
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(
+        cls,
+        search_config: Optional[Dict[str, Any]] = None,
+        vector_config: Optional[Dict[str, Any]] = None,
+    ) -> Optional["VectorScorer"]:
+        """Load the embedding model named in the ``vector_db`` section.
+
+        Returns:
+            The scorer, or None if the model cannot be loaded
+        """
+        search_config = search_config or {}
+        model_name = (vector_config or {}).get("embedding_model", DEFAULT_MODEL)
+        try:
+            from sentence_transformers import SentenceTransformer
+
+            model = SentenceTransformer(model_name)
+        except Exception as e:
+            logger.warning(
+                f"⚠️  Cannot load embedding model {model_name} ({e}); "
+                "falling back to lite search"
+            )
+            return None
+        logger.info(f"🧠 Loaded embedding model {model_name}")
+        return cls(
+            model,
+            search_config.get("vector_candidates", 50),
+            search_config.get("embedding_cache_size", 4096),
+        )
+
+    def _encode(self, texts: Sequence[str]) -> List[List[float]]:
+        return [
+            list(vector)
+            for vector in self.model.encode(list(texts), normalize_embeddings=True)
+        ]
+
+    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings of ``texts``, through the cache."""
+        keys = [hashlib.sha1(text.encode("utf-8")).hexdigest() for text in texts]
+        vectors: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    vectors[key] = self._cache[key]
+        missing = [(key, text) for key, text in zip(keys, texts) if key not in vectors]
+        if missing:
+            encoded = self._encode([text for _, text in missing])
+            with self._lock:
+                for (key, _), vector in zip(missing, encoded):
+                    vectors[key] = vector
+                    self._cache[key] = vector
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return [vectors[key] for key in keys]
+
+    def fuse(self, query: str, hits: List[SearchHit]) -> List[SearchHit]:
+        """Re-score ``hits`` with reciprocal rank fusion.
+
+        The top ``candidates`` hits by lexical score are ranked again by
+        cosine similarity to the query; each hit's score is replaced by
+        its fused score. Hits beyond the candidates only get their lexical
+        contribution, so they stay below every candidate.
+
+        Args:
+            query: The search query
+            hits: Lexical hits of any order
+
+        Returns:
+            ``hits`` ordered by fused score
+        """
+        ranked = sorted(hits, key=lambda hit: hit.score, reverse=True)
+        pool = ranked[: self.candidates]
+        if not pool:
+            return ranked
+
+        (query_vector,) = self._encode([query])
+        vectors = self._embed_texts([f"{hit.title}\n{hit.text}" for hit in pool])
+        similarity = [
+            sum(q * v for q, v in zip(query_vector, vector)) for vector in vectors
+        ]
+        by_similarity = sorted(range(len(pool)), key=lambda i: -similarity[i])
+        vector_rank = {position: rank for rank, position in enumerate(by_similarity)}
+
+        for rank, hit in enumerate(ranked):
+            score = 1 / (RRF_K + rank + 1)
+            if rank in vector_rank:
+                score += 1 / (RRF_K + vector_rank[rank] + 1)
+            hit.score = score
+        return sorted(ranked, key=lambda hit: hit.score, reverse=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"candidates": self.candidates, "cached_embeddings": len(self._cache)}
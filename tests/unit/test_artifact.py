@@ -0,0 +1,164 @@
+"""Unit tests for portable index artifacts."""
+
+import io
+import json
+import tarfile
+import threading
+
+import pytest
+
+from enterprise_mcp_docs import artifact
+from enterprise_mcp_docs.artifact import (
+    ArtifactError,
+    build_artifact,
+    find_artifact,
+    install_artifact,
+    installed_artifact,
+    pull_artifact,
+    recover_index,
+    verify_artifact,
+)
+from enterprise_mcp_docs.index import (
+    DocumentIndex,
+    IndexShard,
+    lock_index,
+    parse_html,
+)
+
+PAGE = (
+    "<html><head><title>Compose networking</title></head><body><main>"
+    "<h1>Networking</h1><p>Compose networks connect services.</p>"
+    "</main></body></html>"
+)
+
+
+def sample_index():
+    document = parse_html(PAGE, "https://docs.docker.com/compose/networking/", "docker")
+    return DocumentIndex({"docker": IndexShard("docker", documents=[document])})
+
+
+def test_build_and_install_round_trip(temp_dir):
+    """Test that an installed artifact loads as the original index."""
+    path = build_artifact(sample_index(), temp_dir / "artifacts", version="2024.06")
+
+    assert path.name == "enterprise-mcp-docs-index-2024.06.tar"
+    assert (temp_dir / "artifacts" / (path.name + ".sha256")).exists()
+    metadata = verify_artifact(path)
+    assert metadata["version"] == "2024.06"
+    assert metadata["tools"]["docker"]["documents"] == 1
+    assert metadata["text_codecs"] == {"docker": "zlib"}
+
+    index_path = temp_dir / "index"
+    install_artifact(path, index_path)
+    index = DocumentIndex.load(index_path)
+
+    assert index.search("compose networks")[0].title == "Compose networking"
+    assert installed_artifact(index_path)["version"] == "2024.06"
+
+
+def test_install_replaces_existing_index(temp_dir):
+    """Test that installing swaps out a previous index completely."""
+    index_path = temp_dir / "index"
+    DocumentIndex({"python": IndexShard("python")}).save(index_path)
+
+    install_artifact(build_artifact(sample_index(), temp_dir, "v2"), index_path)
+
+    assert DocumentIndex.load(index_path).tools == ["docker"]
+    assert not (temp_dir / "index.previous").exists()
+
+
+def test_interrupted_swap_is_recovered(temp_dir):
+    """Test that an index moved aside by a crashed install is restored."""
+    index_path = temp_dir / "index"
+    DocumentIndex({"python": IndexShard("python")}).save(index_path)
+    index_path.rename(temp_dir / "index.previous")
+
+    assert recover_index(index_path)
+    assert DocumentIndex.load(index_path).tools == ["python"]
+    assert not recover_index(index_path)
+
+    index_path.rename(temp_dir / "index.previous")
+    install_artifact(build_artifact(sample_index(), temp_dir, "v2"), index_path)
+    assert DocumentIndex.load(index_path).tools == ["docker"]
+    assert not (temp_dir / "index.previous").exists()
+
+
+def test_recovery_waits_for_the_index_lock(temp_dir):
+    """Test that recovery does not run while an install holds the lock."""
+    pytest.importorskip("fcntl")
+    index_path = temp_dir / "index"
+    DocumentIndex({"python": IndexShard("python")}).save(index_path)
+    results = []
+
+    with lock_index(index_path):
+        index_path.rename(temp_dir / "index.previous")
+        worker = threading.Thread(
+            target=lambda: results.append(recover_index(index_path))
+        )
+        worker.start()
+        worker.join(0.2)
+        assert worker.is_alive()
+        assert not index_path.exists()
+        index_path.mkdir()
+
+    worker.join()
+    assert results == [False]
+    assert (temp_dir / "index.previous").is_dir()
+
+
+def test_corrupt_artifact_is_rejected(temp_dir):
+    """Test that checksum mismatches are detected and nothing is installed."""
+    path = build_artifact(sample_index(), temp_dir, "bad")
+    data = bytearray(path.read_bytes())
+    data[-2048] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ArtifactError):
+        install_artifact(path, temp_dir / "index")
+    assert not (temp_dir / "index").exists()
+
+
+def test_tampered_file_fails_file_checksum(temp_dir):
+    """Test per-file checksums when no sidecar is available."""
+    path = build_artifact(sample_index(), temp_dir, "v1")
+    (temp_dir / (path.name + ".sha256")).unlink()
+
+    tampered = temp_dir / "tampered.tar"
+    with tarfile.open(path) as src, tarfile.open(tampered, "w") as dst:
+        for member in src:
+            data = src.extractfile(member).read()
+            if member.name == "manifest.json":
+                data = json.dumps({"format": 1, "tools": {}}).encode()
+                member.size = len(data)
+            dst.addfile(member, io.BytesIO(data))
+
+    with pytest.raises(ArtifactError, match="manifest.json"):
+        verify_artifact(tampered)
+
+
+def test_pull_and_find(temp_dir):
+    """Test pulling an artifact into the store and resolving it by version."""
+    source = build_artifact(sample_index(), temp_dir / "usb", "2024.07")
+    store = temp_dir / "store"
+
+    pulled = pull_artifact(str(source), store)
+
+    assert pulled.parent == store
+    assert (store / (pulled.name + ".sha256")).exists()
+    assert find_artifact("2024.07", store) == pulled
+    assert find_artifact("latest", store) == pulled
+    with pytest.raises(ArtifactError):
+        find_artifact("missing", store)
+
+
+def test_install_rejects_unreadable_codec(temp_dir, monkeypatch):
+    """Test that an artifact this host cannot read never replaces the index."""
+    index_path = temp_dir / "index"
+    DocumentIndex({"python": IndexShard("python")}).save(index_path)
+    path = build_artifact(sample_index(), temp_dir, "v2")
+    monkeypatch.setattr(artifact, "codec_available", lambda codec: False)
+
+    with pytest.raises(ArtifactError, match="zstandard"):
+        install_artifact(path, index_path)
+
+    assert DocumentIndex.load(index_path).tools == ["python"]
@@ -0,0 +1,135 @@
+"""Unit tests for the Redis-backed result cache."""
+
+import asyncio
+import time
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from enterprise_mcp_docs.cache import ResultCache
+
+
+class FakePipeline:
+    """Collects SET commands and applies them on execute."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.commands.append((key, value))
+        return self
+
+    async def execute(self):
+        await self.redis.call("pipeline")
+        self.redis.data.update(self.commands)
+        return [True] * len(self.commands)
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for ``redis.asyncio.Redis``."""
+
+    def __init__(self, delay=0.0):
+        self.data = {}
+        self.calls = []
+        self.delay = delay
+        self.down = False
+
+    async def call(self, name):
+        self.calls.append(name)
+        if self.down:
+            raise RedisConnectionError("connection refused")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+    async def ping(self):
+        await self.call("ping")
+        return True
+
+    async def mget(self, keys):
+        await self.call("mget")
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def aclose(self):
+        pass
+
+
+async def test_local_only_when_redis_disabled():
+    """Test that the cache works without any Redis backend."""
+    cache = ResultCache({"enabled": False})
+    assert await cache.connect() is False
+
+    await cache.set("k", [1, 2])
+
+    assert await cache.get("k") == [1, 2]
+    assert cache.stats()["backend"] == "local"
+
+
+async def test_batches_use_one_round_trip():
+    """Test that multi-key gets and bulk writes are pipelined."""
+    redis = FakeRedis()
+    cache = ResultCache({}, client=redis)
+    assert await cache.connect() is True
+
+    await cache.set_many({"a": 1, "b": 2, "c": 3})
+    await cache.close()
+    assert redis.calls.count("pipeline") == 1
+
+    # A fresh process sees the shared values through one MGET
+    other = ResultCache({}, client=redis)
+    redis.calls.clear()
+    found = await other.get_many(["a", "b", "c", "missing"])
+
+    assert found == {"a": 1, "b": 2, "c": 3}
+    assert redis.calls == ["mget"]
+    assert other.stats()["hits"] == 3
+    assert other.stats()["misses"] == 1
+
+
+async def test_degrades_to_local_cache_and_reconnects():
+    """Test that Redis failures fall back to the local cache."""
+    redis = FakeRedis()
+    cache = ResultCache({"reconnect_interval": 0.05}, client=redis)
+    await cache.connect()
+
+    redis.down = True
+    await cache.set("k", "v")
+    await asyncio.sleep(0.01)  # let the background write fail
+    assert cache.available is False
+    assert await cache.get("k") == "v"  # served locally
+
+    # While down, lookups do not touch Redis
+    redis.calls.clear()
+    assert await cache.get("other") is None
+    assert redis.calls == []
+
+    redis.down = False
+    await asyncio.sleep(0.2)
+    await cache.get("other")  # schedules a background reconnect
+    await asyncio.sleep(0.01)
+    assert cache.available is True
+    assert cache.stats()["backend"] == "redis"
+
+
+async def test_slow_redis_does_not_delay_lookups():
+    """Test that Redis operations are bounded by the operation timeout."""
+    redis = FakeRedis()
+    cache = ResultCache({"operation_timeout": 0.02}, client=redis)
+    await cache.connect()
+    redis.delay = 1.0
+
+    started = time.monotonic()
+    assert await cache.get("k") is None
+    await cache.set("k", "v")
+
+    assert time.monotonic() - started < 0.5
+    assert cache.available is False
+    await cache.close()
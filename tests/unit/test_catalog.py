@@ -0,0 +1,65 @@
+"""Unit tests for the documentation tool catalog."""
+
+from enterprise_mcp_docs.catalog import build_catalog, format_size, render_catalog
+from enterprise_mcp_docs.index import DocumentIndex, IndexShard, parse_html
+from enterprise_mcp_docs.mcp_server import EnterpriseMCPServer
+
+PAGE = (
+    "<html><head><title>Compose networking</title></head><body><main>"
+    "<h1>Networking</h1><p>Compose networks connect services.</p>"
+    "</main></body></html>"
+)
+
+
+def docker_index():
+    document = parse_html(
+        PAGE, "https://docs.docker.com/compose/networking/", "docker", fetched_at=0
+    )
+    return DocumentIndex({"docker": IndexShard("docker", documents=[document])})
+
+
+def test_build_catalog_merges_config_and_index_stats(temp_dir):
+    """Test that entries carry live index statistics."""
+    index = docker_index()
+    index.save(temp_dir / "index")
+    manifest = DocumentIndex.read_manifest(temp_dir / "index")
+
+    entries = build_catalog(
+        ["python", "docker"],
+        {"python": {"description": "Python docs"}},
+        manifest["tools"],
+    )
+
+    python, docker = entries
+    assert python["description"] == "Python docs"
+    assert python["indexed"] is False
+    assert docker["indexed"] is True
+    assert docker["documents"] == 1
+    assert docker["chunks"] == 1
+    assert docker["size_bytes"] == index.sizes["docker"]
+
+    text = render_catalog(entries)
+    assert "1 documents" in text
+    assert "crawl --tool python" in text
+    assert "1 of 2 tools indexed" in text
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(1536) == "1.5 KB"
+    assert format_size(None) == "unknown size"
+
+
+async def test_server_caches_catalog_until_index_swap():
+    """Test that list_available_tools is rendered once per index."""
+    server = EnterpriseMCPServer({"tools": {"docker": {"enabled": True}}})
+
+    first = await server._list_available_tools()
+    assert await server._list_available_tools() is first
+    assert "0 of 1 tools indexed" in first[0].text
+
+    server.index = docker_index()
+    swapped = await server._list_available_tools()
+
+    assert swapped is not first
+    assert "1 of 1 tools indexed" in swapped[0].text
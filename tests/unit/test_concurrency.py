@@ -0,0 +1,145 @@
+"""Unit tests for tool-call admission control."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from enterprise_mcp_docs.concurrency import AdmissionController, Limiter, Overloaded
+
+
+async def test_limiter_hands_slots_to_waiters_in_order():
+    """Test FIFO hand-over of released slots."""
+    limiter = Limiter("test", capacity=1)
+    deadline = time.monotonic() + 1
+    order = []
+
+    await limiter.acquire(deadline)
+
+    async def waiter(name):
+        await limiter.acquire(deadline)
+        order.append(name)
+        limiter.release()
+
+    tasks = [asyncio.create_task(waiter(n)) for n in ("a", "b")]
+    await asyncio.sleep(0)
+    assert limiter.waiting == 2
+
+    limiter.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["a", "b"]
+    assert limiter.active == 0
+
+
+async def test_full_queue_rejects_immediately():
+    """Test fast rejection when the wait queue is full."""
+    limiter = Limiter("test", capacity=1, max_queue=1)
+    deadline = time.monotonic() + 5
+    await limiter.acquire(deadline)
+    queued = asyncio.create_task(limiter.acquire(deadline))
+    await asyncio.sleep(0)
+
+    started = time.monotonic()
+    with pytest.raises(Overloaded):
+        await limiter.acquire(deadline)
+    assert time.monotonic() - started < 0.1
+    assert limiter.rejected == 1
+
+    limiter.release()
+    await queued
+    limiter.release()
+    assert limiter.active == 0
+
+
+async def test_deadline_expires_in_queue():
+    """Test that queued calls give up at their deadline."""
+    limiter = Limiter("test", capacity=1)
+    await limiter.acquire(time.monotonic() + 1)
+
+    with pytest.raises(Overloaded):
+        await limiter.acquire(time.monotonic() + 0.02)
+
+    limiter.release()
+    assert limiter.active == 0
+    assert limiter.waiting == 0
+
+
+async def test_busy_client_does_not_starve_others():
+    """Test that per-client caps leave capacity for other clients."""
+    controller = AdmissionController(
+        {
+            "per_tool": {"get_documentation": 4},
+            "per_client": 2,
+            "max_queue": 1,
+            "queue_timeout": 1.0,
+        }
+    )
+    release = asyncio.Event()
+
+    async def call(client):
+        async with controller.admit("get_documentation", client):
+            await release.wait()
+
+    heavy = [asyncio.create_task(call("heavy")) for _ in range(3)]
+    await asyncio.sleep(0)
+    with pytest.raises(Overloaded):
+        await call("heavy")  # two running, one queued
+
+    light = asyncio.create_task(call("light"))
+    await asyncio.sleep(0)
+    stats = controller.stats()
+    assert stats["clients"]["light"]["active"] == 1
+    assert stats["tools"]["get_documentation"]["active"] == 3
+
+    # Uncapped tools bypass admission control
+    async with controller.admit("list_available_tools", "heavy"):
+        pass
+
+    release.set()
+    await asyncio.gather(*heavy, light)
+    assert controller.stats()["tools"]["get_documentation"]["active"] == 0
+    controller.close()
+
+
+async def test_idle_client_limiters_are_dropped():
+    """Test that a client's limiter only lives while it has calls in flight."""
+    controller = AdmissionController(
+        {
+            "per_tool": {"get_documentation": 4},
+            "per_client": 1,
+            "max_queue": 1,
+            "queue_timeout": 0.05,
+        }
+    )
+    release = asyncio.Event()
+
+    async def call(client):
+        async with controller.admit("get_documentation", client):
+            await release.wait()
+
+    first = asyncio.create_task(call("session"))
+    queued = asyncio.create_task(call("session"))
+    await asyncio.sleep(0)
+    assert controller.stats()["clients"]["session"]["waiting"] == 1
+
+    release.set()
+    await asyncio.gather(first, queued)
+    assert controller.stats()["clients"] == {}
+
+    with pytest.raises(Overloaded):
+        async with controller.admit("get_documentation", "session"):
+            await call("session")
+    assert controller.stats()["clients"] == {}
+    controller.close()
+
+
+async def test_run_uses_executor_threads():
+    """Test that CPU work runs off the event loop thread."""
+    controller = AdmissionController({"cpu_workers": 1})
+
+    name = await controller.run(lambda: threading.current_thread().name)
+
+    assert name.startswith("mcp-cpu")
+    controller.close()
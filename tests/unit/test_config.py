@@ -0,0 +1,33 @@
+"""Unit tests for configuration loading."""
+
+from enterprise_mcp_docs.config import load_config
+
+
+def empty_config(temp_dir):
+    path = temp_dir / "config.json"
+    path.write_text("{}")
+    return str(path)
+
+
+def test_env_comments_are_stripped(monkeypatch, temp_dir):
+    """Test that trailing .env-style comments do not reach the config."""
+    monkeypatch.setenv("CRAWL_INTERVAL", "3600  # refresh interval")
+    monkeypatch.setenv("TRACE_EXPORT_PATH", "  # e.g. ./logs/traces.jsonl")
+    monkeypatch.setenv("CACHE_PREFIX", "docs#v2")
+
+    config = load_config(empty_config(temp_dir))
+
+    assert config["scheduler"]["default_ttl"] == 3600
+    assert config["tracing"]["export_path"] is None
+    assert config["cache"]["prefix"] == "docs#v2"
+
+
+def test_secrets_and_urls_are_taken_verbatim(monkeypatch, temp_dir):
+    """Test that '#' in Redis passwords and URLs is kept."""
+    monkeypatch.setenv("REDIS_PASSWORD", "s3cret #1")
+    monkeypatch.setenv("REDIS_URL", "redis://:p#ss@redis:6379/0")
+
+    config = load_config(empty_config(temp_dir))
+
+    assert config["cache"]["password"] == "s3cret #1"
+    assert config["cache"]["redis_url"] == "redis://:p#ss@redis:6379/0"
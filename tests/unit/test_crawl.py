@@ -0,0 +1,98 @@
+"""Unit tests for the documentation crawler."""
+
+import httpx
+
+from enterprise_mcp_docs.crawl import DocumentationCrawler
+from enterprise_mcp_docs.fetcher import Fetcher
+
+BASE_URL = "https://docs.example.com/guide/"
+
+FAST_CONFIG = {
+    "retry_attempts": 1,
+    "request_delay": 0,
+    "min_request_delay": 0,
+    "host_concurrency": 8,
+}
+
+
+def sitemap(*paths):
+    """Sitemap listing ``paths`` below the base URL."""
+    entries = "".join(f"<url><loc>{BASE_URL}{path}</loc></url>" for path in paths)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        f"{entries}</urlset>"
+    ).encode()
+
+
+def page(title):
+    """Documentation page with one section."""
+    return (
+        f"<html><head><title>{title}</title></head><body><main>"
+        f"<h1>{title}</h1><p>{title} explains the deployment settings.</p>"
+        "</main></body></html>"
+    ).encode()
+
+
+def make_fetcher(routes):
+    """Fetcher serving ``routes`` from memory."""
+
+    def handler(request):
+        body = routes.get(str(request.url))
+        if body is None:
+            return httpx.Response(404)
+        content_type = "application/xml" if body.startswith(b"<?xml") else "text/html"
+        return httpx.Response(200, content=body, headers={"content-type": content_type})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return Fetcher(FAST_CONFIG, client=client)
+
+
+def make_crawler(temp_dir):
+    return DocumentationCrawler(
+        {
+            "tools": {"docker": {"base_url": BASE_URL, "enabled": True}},
+            "page_cache": {"path": str(temp_dir / "pages"), "compression": "gzip"},
+            "index": {"path": str(temp_dir / "index")},
+        }
+    )
+
+
+async def test_pages_dropped_from_sitemap_are_pruned(temp_dir):
+    crawler = make_crawler(temp_dir)
+    routes = {
+        BASE_URL + "sitemap.xml": sitemap("a.html", "b.html"),
+        BASE_URL + "a.html": page("Alpha"),
+        BASE_URL + "b.html": page("Bravo"),
+    }
+    async with make_fetcher(routes) as fetcher:
+        result = await crawler.crawl_tool("docker", fetcher)
+    assert result["pages_fetched"] == 2
+    assert result["documents_processed"] == 2
+
+    routes[BASE_URL + "sitemap.xml"] = sitemap("a.html")
+    async with make_fetcher(routes) as fetcher:
+        result = await crawler.crawl_tool("docker", fetcher)
+
+    assert result["pages_deleted"] == 1
+    assert result["documents_processed"] == 1
+    assert crawler.cache.urls("docker") == [BASE_URL + "a.html"]
+    assert crawler._pinned == {}
+
+
+async def test_failed_sitemap_does_not_prune(temp_dir):
+    crawler = make_crawler(temp_dir)
+    routes = {
+        BASE_URL + "sitemap.xml": sitemap("a.html", "b.html"),
+        BASE_URL + "a.html": page("Alpha"),
+        BASE_URL + "b.html": page("Bravo"),
+    }
+    async with make_fetcher(routes) as fetcher:
+        await crawler.crawl_tool("docker", fetcher)
+
+    routes[BASE_URL + "sitemap.xml"] = sitemap("a.html")[:-10]
+    async with make_fetcher(routes) as fetcher:
+        result = await crawler.crawl_tool("docker", fetcher)
+
+    assert result["pages_deleted"] == 0
+    assert len(crawler.cache.urls("docker")) == 2
@@ -0,0 +1,107 @@
+"""Unit tests for near-duplicate detection."""
+
+from enterprise_mcp_docs.dedup import (
+    cluster,
+    collapse_hits,
+    hamming,
+    simhash,
+    version_key,
+)
+from enterprise_mcp_docs.index import (
+    DocumentIndex,
+    IndexShard,
+    SearchHit,
+    parse_html,
+    tokenize,
+)
+
+ASYNCIO_TEXT = (
+    "asyncio is a library to write concurrent code using the async await syntax. "
+    "asyncio is used as a foundation for multiple Python asynchronous frameworks "
+    "that provide high performance network and web servers, database connection "
+    "libraries, distributed task queues and more."
+)
+
+
+def asyncio_page(version, extra=""):
+    """Render a Python asyncio docs page for ``version``."""
+    html = (
+        f"<html><head><title>asyncio (Python {version})</title></head><body><main>"
+        f"<h1>asyncio</h1><p>{ASYNCIO_TEXT} {extra}</p></main></body></html>"
+    )
+    url = f"https://docs.python.org/{version}/library/asyncio.html"
+    return parse_html(html, url, "python")
+
+
+def test_simhash_distance_reflects_similarity():
+    """Test that small edits keep fingerprints close."""
+    tokens = tokenize(ASYNCIO_TEXT * 3)
+    edited = list(tokens)
+    edited[10] = "changed"
+
+    assert hamming(simhash(tokens), simhash(edited)) <= 3
+    assert hamming(simhash(tokens), simhash(tokenize("docker compose up"))) > 3
+
+
+def test_version_key_orders_versions():
+    """Test numeric and rolling version ordering."""
+    versions = ["3.9", "current", "3.12", "3.10", None]
+    assert sorted(versions, key=version_key) == [None, "3.9", "3.10", "3.12", "current"]
+
+
+def test_cluster_groups_exact_and_near_duplicates():
+    """Test clustering of duplicate token sequences."""
+    base = tokenize(ASYNCIO_TEXT * 3)
+    near = list(base)
+    near[20] = "changed"
+    groups = cluster({"a": base, "b": list(base), "c": near, "d": ["other"]})
+
+    assert len(groups) == 1
+    assert sorted(groups[0]) == ["a", "b", "c"]
+
+
+def test_shard_deduplicate_keeps_newest_version():
+    """Test that versions fold onto the newest one with shared content."""
+    shard = IndexShard(
+        "python",
+        documents=[asyncio_page("3.9"), asyncio_page("3.12"), asyncio_page("3.10")],
+    )
+
+    assert shard.deduplicate() == 2
+    (representative,) = [d for d in shard.documents.values() if d.chunks]
+    assert representative.version == "3.12"
+    assert {v["version"] for v in representative.variants} == {"3.9", "3.10"}
+    assert shard.stats()["duplicates"] == 2
+
+    older = shard.find_document("3.9/library/asyncio.html")
+    assert older is representative
+
+
+def test_search_returns_one_result_with_alternates():
+    """Test query-time collapsing of duplicate content."""
+    shard = IndexShard("python", documents=[asyncio_page("3.11"), asyncio_page("3.12")])
+    shard.deduplicate()
+
+    hits = DocumentIndex({"python": shard}).search("asyncio concurrent code", limit=5)
+
+    assert len(hits) == 1
+    assert hits[0].version == "3.12"
+    assert hits[0].alternates[0]["version"] == "3.11"
+
+
+def test_collapse_hits_folds_duplicate_text():
+    """Test collapsing of identical hits from different documents."""
+
+    def hit(url, text, score):
+        return SearchHit("x", url, url + "#0", url, "T", "T", text, score)
+
+    hits = [
+        hit("https://a/1", ASYNCIO_TEXT, 3.0),
+        hit("https://a/2", ASYNCIO_TEXT, 2.0),
+        hit("https://a/3", "something else entirely", 1.0),
+    ]
+
+    collapsed = collapse_hits(hits, limit=2, tokenize=tokenize)
+
+    assert [h.url for h in collapsed] == ["https://a/1", "https://a/3"]
+    assert collapsed[0].alternates == [{"url": "https://a/2", "version": None}]
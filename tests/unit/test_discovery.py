@@ -0,0 +1,160 @@
+"""Unit tests for sitemap-first URL discovery."""
+
+import gzip
+
+import httpx
+
+from enterprise_mcp_docs.discovery import (
+    SitemapDiscovery,
+    SitemapParser,
+    canonicalize_url,
+    in_sections,
+)
+
+BASE_URL = "https://docs.example.com/guide/"
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://docs.example.com/sitemap-guide.xml.gz</loc></sitemap>
+</sitemapindex>
+"""
+
+SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://docs.example.com/guide/api/index.html</loc>
+       <lastmod>2024-01-02</lastmod></url>
+  <url><loc>https://DOCS.example.com:443/guide/api/?utm_source=x</loc></url>
+  <url><loc>https://docs.example.com/guide/api-keys.html#usage</loc></url>
+  <url><loc>https://docs.example.com/guide/search/</loc></url>
+  <url><loc>https://docs.example.com/guide/apiary/</loc></url>
+  <url><loc>https://docs.example.com/guide/private/api/</loc></url>
+  <url><loc>https://docs.example.com/blog/api/</loc></url>
+</urlset>
+"""
+
+ROBOTS = """User-agent: *
+Disallow: /guide/private/
+Sitemap: https://docs.example.com/sitemap-index.xml
+"""
+
+
+def make_client(routes):
+    """Create an HTTP client serving ``routes`` from memory."""
+
+    def handler(request):
+        body = routes.get(str(request.url))
+        if body is None:
+            return httpx.Response(404)
+        return httpx.Response(200, content=body)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestCanonicalizeUrl:
+    """Test cases for URL canonicalization."""
+
+    def test_normalizes_host_port_and_fragment(self):
+        assert (
+            canonicalize_url("HTTPS://Docs.Example.com:443/a/./b/../c.html#top")
+            == "https://docs.example.com/a/c.html"
+        )
+
+    def test_drops_tracking_params_and_sorts_query(self):
+        assert (
+            canonicalize_url("https://x.io/p?b=2&utm_medium=mail&a=1")
+            == "https://x.io/p?a=1&b=2"
+        )
+
+    def test_collapses_index_documents(self):
+        assert canonicalize_url("https://x.io/docs/index.html") == "https://x.io/docs/"
+
+    def test_resolves_relative_urls(self):
+        assert (
+            canonicalize_url("../api/", base="https://x.io/docs/guide/")
+            == "https://x.io/docs/api/"
+        )
+
+    def test_rejects_non_http(self):
+        assert canonicalize_url("mailto:docs@example.com") is None
+        assert canonicalize_url("javascript:void(0)") is None
+
+
+def test_in_sections():
+    """Test section scoping of canonical URLs."""
+    sections = ["api", "search"]
+    assert in_sections(BASE_URL + "api/", BASE_URL, sections)
+    assert in_sections(BASE_URL + "api-keys.html", BASE_URL, sections)
+    assert in_sections(BASE_URL + "search", BASE_URL, sections)
+    assert not in_sections(BASE_URL + "apiary/", BASE_URL, sections)
+    assert not in_sections("https://docs.example.com/blog/api/", BASE_URL, sections)
+    assert in_sections(BASE_URL + "anything/", BASE_URL, [])
+
+
+def test_sitemap_parser_handles_chunked_gzip():
+    """Test that gzipped sitemaps can be fed in arbitrary chunks."""
+    data = gzip.compress(SITEMAP)
+    parser = SitemapParser()
+    entries = []
+    for i in range(0, len(data), 17):
+        parser.feed(data[i : i + 17])
+        entries.extend(parser.entries())
+    parser.close()
+    entries.extend(parser.entries())
+
+    assert len(entries) == 7
+    assert entries[0] == (
+        "url",
+        "https://docs.example.com/guide/api/index.html",
+        "2024-01-02",
+    )
+
+
+async def test_discover_from_robots_sitemap_index():
+    """Test discovery through robots.txt, a sitemap index and a gzipped sitemap."""
+    routes = {
+        "https://docs.example.com/robots.txt": ROBOTS.encode(),
+        "https://docs.example.com/sitemap-index.xml": SITEMAP_INDEX,
+        "https://docs.example.com/sitemap-guide.xml.gz": gzip.compress(SITEMAP),
+    }
+    discovery = SitemapDiscovery(BASE_URL, ["api", "search"])
+
+    async with make_client(routes) as client:
+        urls = await discovery.discover(client)
+
+    assert discovery.used_sitemap is True
+    assert [u.url for u in urls] == [
+        "https://docs.example.com/guide/api/",
+        "https://docs.example.com/guide/api-keys.html",
+        "https://docs.example.com/guide/search/",
+    ]
+    assert urls[0].lastmod == "2024-01-02"
+
+
+async def test_discover_falls_back_to_seeds():
+    """Test that sites without sitemaps yield section seed URLs."""
+    discovery = SitemapDiscovery(BASE_URL, ["api", "search"])
+
+    async with make_client({}) as client:
+        urls = await discovery.discover(client)
+
+    assert discovery.used_sitemap is False
+    assert [u.url for u in urls] == [
+        BASE_URL + "api/",
+        BASE_URL + "search/",
+    ]
+
+
+async def test_sitemap_without_in_scope_urls_falls_back_to_seeds():
+    """Test that a readable sitemap listing only other sections uses seeds."""
+    routes = {
+        "https://docs.example.com/robots.txt": ROBOTS.encode(),
+        "https://docs.example.com/sitemap-index.xml": SITEMAP_INDEX,
+        "https://docs.example.com/sitemap-guide.xml.gz": gzip.compress(SITEMAP),
+    }
+    discovery = SitemapDiscovery(BASE_URL, ["install"])
+
+    async with make_client(routes) as client:
+        urls = await discovery.discover(client)
+
+    assert discovery.used_sitemap is False
+    assert [u.url for u in urls] == [BASE_URL + "install/"]
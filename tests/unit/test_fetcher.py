@@ -0,0 +1,165 @@
+"""Unit tests for the resilient fetch layer."""
+
+import time
+
+import httpx
+import pytest
+
+from enterprise_mcp_docs.fetcher import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Fetcher,
+    HostThrottle,
+    parse_retry_after,
+)
+
+FAST_CONFIG = {
+    "retry_attempts": 3,
+    "backoff_base": 0.001,
+    "max_backoff": 0.01,
+    "request_delay": 0,
+    "min_request_delay": 0,
+    "circuit_failure_threshold": 3,
+    "circuit_reset_timeout": 60,
+}
+
+
+def make_fetcher(responses, config=None):
+    """Create a fetcher whose transport replays ``responses`` in order."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        status, headers = responses[min(len(calls), len(responses)) - 1]
+        return httpx.Response(status, headers=headers, content=b"body")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return Fetcher(dict(FAST_CONFIG, **(config or {})), client=client), calls
+
+
+def test_parse_retry_after():
+    """Test delta-seconds and HTTP-date Retry-After values."""
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+async def test_retries_server_errors_until_success():
+    """Test that 5xx and 429 responses are retried."""
+    fetcher, calls = make_fetcher([(503, {}), (429, {"Retry-After": "0"}), (200, {})])
+
+    async with fetcher:
+        response = await fetcher.get("https://docs.example.com/a")
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+async def test_returns_last_response_when_retries_exhausted():
+    """Test that the final error response is returned after all attempts."""
+    fetcher, calls = make_fetcher([(502, {})])
+
+    async with fetcher:
+        response = await fetcher.get("https://docs.example.com/a")
+
+    assert response.status_code == 502
+    assert len(calls) == 3
+
+
+async def test_client_errors_are_not_retried():
+    """Test that 404 responses are returned immediately."""
+    fetcher, calls = make_fetcher([(404, {})])
+
+    async with fetcher:
+        response = await fetcher.get("https://docs.example.com/missing")
+
+    assert response.status_code == 404
+    assert len(calls) == 1
+
+
+async def test_circuit_opens_and_fails_fast():
+    """Test that a failing host stops receiving requests."""
+    fetcher, calls = make_fetcher([(500, {})], {"retry_attempts": 1})
+
+    async with fetcher:
+        for _ in range(3):
+            await fetcher.get("https://flaky.example.com/a")
+        with pytest.raises(CircuitOpenError):
+            await fetcher.get("https://flaky.example.com/b")
+        # Other hosts are unaffected
+        assert (await fetcher.get("https://ok.example.com/")).status_code == 500
+
+    assert len(calls) == 4
+    assert fetcher.host_stats()["flaky.example.com"]["circuit"] == "open"
+
+
+def test_circuit_breaker_half_open_trial(monkeypatch):
+    """Test that one trial request is allowed after the reset timeout."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    monkeypatch.setattr(breaker, "opened_at", breaker.opened_at - 11)
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial in flight
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+async def test_failed_half_open_trial_reopens_the_circuit(monkeypatch):
+    """Test that a non-transport error during the trial is recorded."""
+    trial = {"fail": True}
+
+    def handler(request):
+        if trial["fail"]:
+            raise httpx.TooManyRedirects("Exceeded redirects", request=request)
+        return httpx.Response(200, content=b"body")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    fetcher = Fetcher(FAST_CONFIG, client=client)
+    breaker = fetcher.breaker("docs.example.com")
+    breaker.state = CircuitBreaker.OPEN
+    breaker.opened_at = time.monotonic() - 61
+
+    async with fetcher:
+        with pytest.raises(httpx.TooManyRedirects):
+            await fetcher.get("https://docs.example.com/loop")
+        assert breaker.state == CircuitBreaker.OPEN
+
+        # The next trial is let through once the timeout passes again
+        trial["fail"] = False
+        monkeypatch.setattr(breaker, "opened_at", time.monotonic() - 61)
+        response = await fetcher.get("https://docs.example.com/a")
+
+    assert response.status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_released_trial_lets_the_next_request_through(monkeypatch):
+    """Test that a trial cancelled without an outcome frees its slot."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    monkeypatch.setattr(breaker, "opened_at", breaker.opened_at - 11)
+
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+async def test_throttle_adapts_to_errors_and_latency():
+    """Test that the throttle backs off on errors and recovers when healthy."""
+    throttle = HostThrottle(delay=1.0, min_delay=0.5, max_delay=4.0)
+
+    throttle.record(0.1, ok=False)
+    assert throttle.delay == 2.0
+    throttle.record(0.1, ok=False)
+    throttle.record(0.1, ok=False)
+    assert throttle.delay == 4.0  # capped
+
+    for _ in range(50):
+        throttle.record(0.1, ok=True)
+    assert throttle.delay == 0.5
+    assert throttle.error_rate < 0.01
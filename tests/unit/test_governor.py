@@ -0,0 +1,250 @@
+"""Unit tests for the memory governor."""
+
+import json
+import os
+import threading
+import time
+import urllib.request
+from http.server import HTTPServer
+
+from enterprise_mcp_docs.cache import LocalCache
+from enterprise_mcp_docs.governor import (
+    MB,
+    IdleShards,
+    Resizable,
+    ResourceGovernor,
+    cgroup_memory_limit,
+    read_published,
+    render_metrics,
+)
+from enterprise_mcp_docs.index import IndexShard, parse_html
+from enterprise_mcp_docs.mcp_server import EnterpriseMCPServer
+from enterprise_mcp_docs.server import HealthHandler
+
+PAGE = b"""<html><head><title>Volumes</title></head>
+<body><main><h1>Volumes</h1><p>Volumes persist container data.</p></main></body>
+</html>"""
+
+
+class FakeRSS:
+    """Settable RSS reading in megabytes."""
+
+    def __init__(self, mb):
+        self.mb = mb
+
+    def __call__(self):
+        return int(self.mb * MB)
+
+
+def make_governor(rss, **config):
+    settings = {"memory_budget_mb": 100, "grow_delay": 0, "status_dir": None}
+    settings.update(config)
+    return ResourceGovernor(settings, rss=rss)
+
+
+def test_cgroup_memory_limit(temp_dir):
+    v2 = temp_dir / "memory.max"
+    v2.write_text("max\n")
+    assert cgroup_memory_limit([str(v2)]) is None
+
+    v2.write_text("536870912\n")
+    assert cgroup_memory_limit([str(temp_dir / "missing"), str(v2)]) == 512 * MB
+
+    v1 = temp_dir / "memory.limit_in_bytes"
+    v1.write_text("9223372036854771712\n")
+    assert cgroup_memory_limit([str(v1)]) is None
+
+
+def test_resizable_halves_and_doubles_within_bounds():
+    cache = LocalCache(max_entries=100)
+    for number in range(100):
+        cache.set(str(number), number, ttl=60)
+    consumer = Resizable(
+        "results", lambda: cache.max_entries, cache.resize, 100, minimum=30
+    )
+
+    assert consumer.shrink() == "shrank results from 100 to 50"
+    assert len(cache) == 50
+    assert consumer.shrink() == "shrank results from 50 to 30"
+    assert consumer.shrink() is None
+    assert consumer.grow() == "grew results from 30 to 60"
+    assert consumer.grow() == "grew results from 60 to 100"
+    assert consumer.grow() is None
+
+
+def test_shrinks_until_under_high_watermark_then_grows_back():
+    rss = FakeRSS(95)
+    governor = make_governor(rss)
+    sizes = {"a": 64, "b": 64}
+
+    def setter(name):
+        def set_size(size):
+            sizes[name] = size
+            rss.mb -= 5
+
+        return set_size
+
+    for name in ("a", "b"):
+        governor.register(Resizable(name, lambda n=name: sizes[n], setter(name), 64))
+
+    # 95 MB > 90 MB: shrinking "a" brings RSS to 90 MB, "b" is left alone
+    assert governor.check() == ["shrank a from 64 to 32"]
+    assert governor.level == "high"
+    assert sizes == {"a": 32, "b": 64}
+
+    rss.mb = 80
+    assert governor.check() == []
+    assert governor.level == "elevated"
+
+    rss.mb = 50
+    assert governor.check() == ["grew a from 32 to 64"]
+    status = governor.status()
+    assert status["counters"] == {"shrink": 1, "grow": 1}
+    assert [a["kind"] for a in status["recent_actions"]] == ["shrink", "grow"]
+
+
+def test_grow_waits_for_grow_delay():
+    rss = FakeRSS(95)
+    governor = make_governor(rss, grow_delay=3600)
+    sizes = {"a": 8}
+    governor.register(
+        Resizable("a", lambda: sizes["a"], lambda s: sizes.update(a=s), 8)
+    )
+
+    governor.check()
+    rss.mb = 10
+
+    assert governor.check() == []
+    assert sizes["a"] == 4
+
+
+def test_no_budget_only_reports():
+    governor = ResourceGovernor({"status_dir": None}, rss=FakeRSS(500))
+    governor.budget = None
+
+    assert governor.check() == []
+    assert governor.status()["rss_bytes"] == 500 * MB
+
+
+def test_idle_shards_are_released_and_rebuilt_on_search():
+    shards = {
+        tool: IndexShard(
+            tool, [parse_html(PAGE, f"https://docs.example.com/{tool}/", tool)]
+        )
+        for tool in ("docker", "python")
+    }
+    for shard in shards.values():
+        shard.search("volumes")
+    shards["docker"].last_used = time.monotonic() - 3600
+    consumer = IdleShards(lambda: shards, idle_seconds=600)
+
+    assert consumer.shrink() == "unloaded idle shards docker"
+    assert not shards["docker"].loaded and shards["python"].loaded
+    # Nothing idle long enough is left
+    assert consumer.shrink() is None
+
+    assert shards["docker"].search("volumes")[0].title == "Volumes"
+    assert consumer.status() == {"loaded": 2, "total": 2, "unloaded": 1}
+
+
+def test_publish_and_metrics(temp_dir):
+    governor = make_governor(FakeRSS(42), status_dir=str(temp_dir / "status"))
+    governor.check()
+    governor.publish()
+
+    statuses = read_published(str(temp_dir / "status"))
+    assert [s["pid"] for s in statuses] == [os.getpid()]
+
+    metrics = render_metrics(statuses)
+    labels = f'process="server",pid="{os.getpid()}"'
+    assert f"mcp_docs_memory_rss_bytes{{{labels}}} {42 * MB}" in metrics
+    assert f"mcp_docs_memory_budget_bytes{{{labels}}} {100 * MB}" in metrics
+
+    governor.unpublish()
+    assert read_published(str(temp_dir / "status")) == []
+
+
+def test_health_and_metrics_endpoints_include_mcp_processes(temp_dir):
+    status_dir = temp_dir / "status"
+    status_dir.mkdir()
+    mcp_status = {
+        "process": "mcp",
+        "pid": 4242,
+        "updated_at": time.time(),
+        "rss_bytes": 95 * MB,
+        "peak_rss_bytes": 97 * MB,
+        "budget_bytes": 100 * MB,
+        "level": "high",
+        "consumers": {"result_cache": {"size": 256, "maximum": 1024}},
+        "counters": {"shrink": 2},
+        "recent_actions": [],
+    }
+    (status_dir / "mcp-4242.json").write_text(json.dumps(mcp_status))
+
+    http_server = HTTPServer(("127.0.0.1", 0), HealthHandler)
+    http_server.governor = make_governor(FakeRSS(30), status_dir=str(status_dir))
+    http_server.governor.check()
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{http_server.server_port}"
+    try:
+        with urllib.request.urlopen(base + "/health") as response:
+            health = json.loads(response.read())
+        with urllib.request.urlopen(base + "/metrics") as response:
+            metrics = response.read().decode("utf-8")
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+
+    assert health["status"] == "degraded"
+    assert [s["process"] for s in health["resources"]] == ["server", "mcp"]
+    assert (
+        'mcp_docs_memory_governor_actions_total{process="mcp",pid="4242",'
+        'kind="shrink"} 2' in metrics
+    )
+    assert (
+        'mcp_docs_cache_capacity{process="mcp",pid="4242",cache="result_cache"} 256'
+        in metrics
+    )
+
+
+def test_mcp_server_registers_its_caches():
+    server = EnterpriseMCPServer(
+        {"cache": {"local_max_entries": 512}, "resources": {"status_dir": None}}
+    )
+
+    names = [consumer.name for consumer in server.governor.consumers]
+    assert names == [
+        "tool_catalog",
+        "result_cache",
+        "text_cache_blocks",
+        "index_shards",
+    ]
+
+    server.governor.consumers[1].shrink()
+    assert server.cache.local.max_entries == 256
+
+
+async def test_check_async_measures_off_the_event_loop():
+    loop_thread = threading.get_ident()
+    threads = {"rss": set(), "resize": set()}
+    rss = FakeRSS(95)
+
+    def measure():
+        threads["rss"].add(threading.get_ident())
+        return rss()
+
+    governor = make_governor(measure)
+    sizes = {"a": 64}
+
+    def set_size(size):
+        threads["resize"].add(threading.get_ident())
+        sizes["a"] = size
+        rss.mb = 50
+
+    governor.register(Resizable("a", lambda: sizes["a"], set_size, 64))
+
+    assert await governor.check_async() == ["shrank a from 64 to 32"]
+    assert loop_thread not in threads["rss"]
+    assert threads["resize"] == {loop_thread}
+    assert governor.rss == 50 * MB
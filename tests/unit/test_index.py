@@ -0,0 +1,347 @@
+"""Unit tests for the documentation index."""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from enterprise_mcp_docs.index import (
+    DocumentIndex,
+    IndexShard,
+    TopScores,
+    _atomic_write,
+    build_shard,
+    detect_version,
+    parse_html,
+)
+from enterprise_mcp_docs.mcp_server import EnterpriseMCPServer
+
+PAGE = b"""<html><head><title>Compose networking</title></head>
+<body>
+<nav><a href="/">Home</a> Navigation noise</nav>
+<main>
+  <h1>Networking in Compose</h1>
+  <p>By default Compose sets up a single network for your app.</p>
+  <h2>Custom networks</h2>
+  <p>Use the top-level networks key to define custom networks.</p>
+  <pre>networks:
+  frontend: {}</pre>
+</main>
+<footer>Copyright</footer>
+</body></html>
+"""
+
+OTHER_PAGE = b"""<html><head><title>Volumes</title></head>
+<body><main><h1>Volumes</h1><p>Volumes persist container data.</p></main></body>
+</html>"""
+
+
+def make_shard():
+    """Build a docker shard from two parsed pages."""
+    return IndexShard(
+        "docker",
+        documents=[
+            parse_html(PAGE, "https://docs.docker.com/compose/networking/", "docker"),
+            parse_html(
+                OTHER_PAGE, "https://docs.docker.com/storage/volumes/", "docker"
+            ),
+        ],
+    )
+
+
+def test_parse_html_chunks_by_heading():
+    """Test that pages are split into heading chunks without page chrome."""
+    doc = parse_html(PAGE, "https://docs.docker.com/compose/networking/", "docker")
+
+    assert doc.title == "Compose networking"
+    assert [c.heading for c in doc.chunks] == [
+        "Networking in Compose",
+        "Custom networks",
+    ]
+    assert "Navigation noise" not in doc.text
+    assert "Copyright" not in doc.text
+    assert doc.chunks[1].code == ["networks:\n  frontend: {}"]
+
+
+def test_parse_html_without_content():
+    """Test that empty pages are skipped."""
+    assert parse_html(b"<html><body></body></html>", "https://x.io/", "x") is None
+
+
+def test_detect_version():
+    """Test version extraction from documentation URLs."""
+    assert detect_version("https://docs.python.org/3.12/library/os.html") == "3.12"
+    assert detect_version("https://elastic.co/guide/en/reference/8.x/a.html") == "8.x"
+    assert detect_version("https://docs.docker.com/compose/") is None
+
+
+def test_shard_search_ranks_relevant_chunk_first():
+    """Test BM25 ranking within a shard."""
+    hits = make_shard().search("custom networks", limit=5)
+
+    assert hits[0].heading == "Custom networks"
+    assert hits[0].tool == "docker"
+    assert all(hit.score > 0 for hit in hits)
+
+
+def test_find_document_by_url_suffix_and_query():
+    """Test topic lookup by URL suffix and by relevance."""
+    shard = make_shard()
+
+    assert shard.find_document("storage/volumes").title == "Volumes"
+    assert shard.find_document("persist container data").title == "Volumes"
+
+
+def test_index_save_and_load_roundtrip(temp_dir):
+    """Test that a saved index loads with identical search results."""
+    index = DocumentIndex({"docker": make_shard()})
+    index.save(temp_dir / "index")
+
+    loaded = DocumentIndex.load(temp_dir / "index")
+
+    assert loaded.tools == ["docker"]
+    assert loaded.stats()["docker"]["documents"] == 2
+    assert [h.chunk_id for h in loaded.search("volumes")] == [
+        h.chunk_id for h in index.search("volumes")
+    ]
+
+
+def test_merge_save_only_writes_given_shards(temp_dir):
+    """Test that a merging save keeps the other shards' files untouched."""
+    DocumentIndex({"docker": make_shard(), "python": IndexShard("python")}).save(
+        temp_dir / "index"
+    )
+    docker_files = DocumentIndex.read_manifest(temp_dir / "index")["tools"]["docker"]
+
+    DocumentIndex({"python": make_shard()}).save(temp_dir / "index", merge=True)
+
+    manifest = DocumentIndex.read_manifest(temp_dir / "index")
+    loaded = DocumentIndex.load(temp_dir / "index")
+    assert loaded.tools == ["docker", "python"]
+    assert loaded.stats()["python"]["documents"] == 2
+    assert manifest["tools"]["docker"]["file"] == docker_files["file"]
+
+
+def test_save_writes_new_files_and_commits_with_the_manifest(temp_dir):
+    """Test that a save never overwrites files an older manifest points to."""
+    index_path = temp_dir / "index"
+    DocumentIndex({"docker": IndexShard("docker")}).save(index_path)
+    old = DocumentIndex.read_manifest(index_path)["tools"]["docker"]
+
+    DocumentIndex({"docker": make_shard()}).save(index_path)
+
+    new = DocumentIndex.read_manifest(index_path)["tools"]["docker"]
+    assert {new["file"], new["text_file"]}.isdisjoint({old["file"], old["text_file"]})
+    assert sorted(p.name for p in (index_path / "shards").iterdir()) == sorted(
+        Path(new[key]).name for key in ("file", "text_file")
+    )
+    assert DocumentIndex.load(index_path).stats()["docker"]["documents"] == 2
+
+
+def test_load_rereads_a_manifest_replaced_during_the_load(temp_dir, monkeypatch):
+    """Test that a load racing a save retries with the new manifest."""
+    index_path = temp_dir / "index"
+    DocumentIndex({"docker": IndexShard("docker")}).save(index_path)
+    stale = DocumentIndex.read_manifest(index_path)
+    DocumentIndex({"docker": make_shard()}).save(index_path)
+    manifests = iter([stale])
+    original = DocumentIndex.read_manifest
+
+    def read_manifest(path):
+        return next(manifests, None) or original(path)
+
+    monkeypatch.setattr(DocumentIndex, "read_manifest", staticmethod(read_manifest))
+
+    assert DocumentIndex.load(index_path).stats()["docker"]["documents"] == 2
+
+
+def test_concurrent_atomic_writes_never_mix(temp_dir):
+    """Test that writers of the same file each use their own temp file."""
+    target = temp_dir / "manifest.json"
+    payloads = [bytes([n]) * 200_000 for n in range(4)]
+
+    errors = []
+
+    def write(data):
+        try:
+            for _ in range(20):
+                _atomic_write(target, data)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(p,)) for p in payloads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert target.read_bytes() in payloads
+    assert [p.name for p in temp_dir.iterdir()] == ["manifest.json"]
+
+
+def test_load_missing_index_is_empty(temp_dir):
+    """Test that a missing index loads as empty."""
+    assert not DocumentIndex.load(temp_dir / "nothing")
+
+
+def test_build_shard_assigns_sections():
+    """Test that cached pages are mapped to configured sections."""
+    pages = [
+        SimpleNamespace(
+            url="https://docs.docker.com/compose/networking/",
+            content=PAGE,
+            fetched_at=1.0,
+        )
+    ]
+    shard = build_shard(
+        "docker",
+        pages,
+        {"base_url": "https://docs.docker.com/", "sections": ["compose"]},
+    )
+
+    (doc,) = shard.documents.values()
+    assert doc.section == "compose"
+    assert doc.fetched_at == 1.0
+
+
+def test_top_scores_threshold():
+    """Test that the threshold is the k-th best score once k are known."""
+    top = TopScores(3)
+    top.add([1.0, 5.0])
+    assert top.threshold == 0.0
+
+    top.add([2.0, 0.5, 4.0])
+    assert len(top) == 3
+    assert top.threshold == 2.0
+
+
+def test_shard_search_with_min_score():
+    """Test that a shard returns only hits that can make the merged top-k."""
+    shard = make_shard()
+    best, *_ = shard.search("compose networks")
+
+    assert shard.max_score("compose networks") >= best.score
+    assert [h.chunk_id for h in shard.search("compose networks", 10, best.score)] == [
+        best.chunk_id
+    ]
+    assert shard.search("compose networks", 10, 1000.0) == []
+
+
+def test_max_score_does_not_build_the_index():
+    """Test that a cold shard reports no bound instead of building."""
+    shard = make_shard()
+
+    assert shard.max_score("volumes") is None
+    assert not shard.loaded
+
+
+PODMAN_PAGE = b"""<html><head><title>podman volume</title></head>
+<body><main><h1>podman volume</h1><p>Simple management tool for volumes.
+Volumes persist container data across restarts.</p></main></body></html>"""
+
+
+class SlowShard(IndexShard):
+    """Shard whose searches block until released."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release_search = threading.Event()
+
+    def search(self, query, limit=10, min_score=0.0):
+        self.release_search.wait(5)
+        return super().search(query, limit, min_score)
+
+
+def fan_out_server(timeout_ms, max_late_shards=4):
+    volumes = parse_html(
+        PODMAN_PAGE, "https://docs.podman.io/en/latest/volume.html", "podman"
+    )
+    server = EnterpriseMCPServer(
+        {
+            "cache": {"enabled": False},
+            "search": {
+                "shard_timeout_ms": timeout_ms,
+                "max_late_shards": max_late_shards,
+            },
+            "rerank": {"enabled": False},
+            "query_log": {"enabled": False},
+            "resources": {"status_dir": None},
+        }
+    )
+    server.index = DocumentIndex(
+        {
+            "docker": make_shard(),
+            "podman": SlowShard("podman", documents=[volumes]),
+        }
+    )
+    return server
+
+
+async def test_slow_shard_does_not_hold_up_the_response():
+    """Test that a shard missing its deadline is left out, then cached."""
+    server = fan_out_server(timeout_ms=50)
+    slow = server.index.shards["podman"]
+
+    started = time.monotonic()
+    hits = await server._search_index("volumes", ["docker", "podman"], 5)
+
+    assert time.monotonic() - started < 2
+    assert {hit.tool for hit in hits} == {"docker"}
+
+    slow.release_search.set()
+    for _ in range(100):
+        if len(server.cache.local) == 2:
+            break
+        await asyncio.sleep(0.01)
+    assert server._late_shards == 0
+    hits = await server._search_index("volumes", ["docker", "podman"], 5)
+    assert {hit.tool for hit in hits} == {"docker", "podman"}
+
+
+async def test_late_shards_are_capped():
+    """Test that the fan-out waits for slow shards once the cap is reached."""
+    server = fan_out_server(timeout_ms=10, max_late_shards=0)
+    slow = server.index.shards["podman"]
+    threading.Timer(0.1, slow.release_search.set).start()
+
+    hits = await server._search_index("volumes", ["docker", "podman"], 5)
+
+    assert {hit.tool for hit in hits} == {"docker", "podman"}
+    assert server._late_shards == 0
+
+
+async def test_fan_out_waits_while_nothing_was_found():
+    """Test that the deadline only applies once some hits are known."""
+    server = fan_out_server(timeout_ms=10)
+    slow = server.index.shards["podman"]
+    threading.Timer(0.1, slow.release_search.set).start()
+
+    hits = await server._search_index("persist container data", ["podman"], 5)
+
+    assert [hit.tool for hit in hits] == ["podman"]
+
+
+async def test_fan_out_matches_sequential_search():
+    """Test that concurrent, pruned fan-out finds the same hits."""
+    server = fan_out_server(timeout_ms=0)
+    server.index.shards["podman"].release_search.set()
+    expected = server.index.search("compose volumes networks", limit=2)
+
+    hits = await server._search_index(
+        "compose volumes networks", ["docker", "podman"], 2
+    )
+
+    assert [h.chunk_id for h in hits] == [h.chunk_id for h in expected]
+
+
+async def test_search_clamps_non_positive_limits():
+    """Test that a zero or negative limit returns one hit, not an error."""
+    server = fan_out_server(timeout_ms=0)
+    server.index.shards["podman"].release_search.set()
+    assert TopScores(0).threshold == 0.0
+
+    for limit in (0, -3):
+        hits = await server._search_index("volumes", ["docker", "podman"], limit)
+        assert len(hits) == 1
@@ -0,0 +1,198 @@
+"""Unit tests for the lexical query engine."""
+
+import random
+
+import pytest
+
+from enterprise_mcp_docs import lexical
+from enterprise_mcp_docs.index import IndexShard, parse_html
+from enterprise_mcp_docs.lexical import (
+    LexicalIndex,
+    TermDictionary,
+    parse_query,
+)
+
+
+def build(chunks):
+    index = LexicalIndex()
+    for title, text, code in chunks:
+        index.add(title, title, text, code)
+    index.finish()
+    return index
+
+
+CHUNKS = [
+    (
+        "Index settings",
+        "Set index.number_of_replicas to change the replica count.",
+        ['PUT /my-index/_settings {"index.number_of_replicas": 2}'],
+    ),
+    (
+        "Replicas",
+        "The number of replicas of an index can be changed at any time.",
+        [],
+    ),
+    (
+        "Compose up",
+        "Start services and wait until they are healthy.",
+        ["docker compose up --wait"],
+    ),
+    (
+        "Lifecycle policies",
+        "Create a lifecycle policy for rollover.",
+        ["PUT _ilm/policy/my_policy"],
+    ),
+]
+
+
+def ordinals(results):
+    return [ordinal for ordinal, _ in results]
+
+
+def test_parse_query_clauses():
+    """Test parsing of phrases, fields, wildcards and identifiers."""
+    query = parse_query('code:"compose up" title:replicas number_of_repl* http://x')
+    kinds = [(c.kind, c.field, c.required) for c in query.clauses]
+
+    assert ("phrase", "code", True) in kinds
+    assert ("term", "title", True) in kinds
+    assert ("wildcard", "text", False) in kinds
+    # "http:" is not a field; "http://x" is an identifier-like word
+    assert all(c.field != "http" for c in query.clauses)
+
+
+def test_phrase_requires_adjacent_terms():
+    """Test that phrases only match consecutive tokens."""
+    index = build(CHUNKS)
+
+    assert ordinals(index.search('"replica count"')) == [0]
+    assert ordinals(index.search('"count replica"')) == []
+    # Punctuation is not significant: the identifier matches the prose too
+    assert set(ordinals(index.search('"number of replicas"'))) == {0, 1}
+
+
+def test_identifier_ranks_exact_match_first():
+    """Test that identifiers prefer chunks containing them verbatim."""
+    index = build(CHUNKS)
+
+    assert ordinals(index.search("index.number_of_replicas"))[0] == 0
+
+
+def test_code_field_only_matches_code_blocks():
+    """Test the code: field restriction."""
+    index = build(CHUNKS)
+
+    assert ordinals(index.search('code:"compose up --wait"')) == [2]
+    assert ordinals(index.search("code:rollover")) == []
+    assert ordinals(index.search('code:"PUT _ilm/policy"')) == [3]
+
+
+def test_prefix_and_suffix_wildcards():
+    """Test wildcard expansion through the term dictionary."""
+    index = build(CHUNKS)
+
+    assert set(ordinals(index.search("replic*"))) == {0, 1}
+    assert set(ordinals(index.search("*cycle"))) == {3}
+    assert ordinals(index.search("heal?hy")) == [2]
+
+
+def test_term_dictionary_expansion():
+    """Test bounded prefix, suffix and exact lookups."""
+    dictionary = TermDictionary(["rollover", "replica", "replicas", "reply", "wait"])
+
+    assert dictionary.expand("repl*") == ["replica", "replicas", "reply"]
+    assert dictionary.expand("*cas") == ["replicas"]
+    assert dictionary.expand("repl?") == ["reply"]
+    assert dictionary.expand("wait") == ["wait"]
+    assert dictionary.expand("missing") == []
+    assert dictionary.expand("*plic*") == ["replica", "replicas"]
+
+
+def test_unanchored_expansion_is_capped(monkeypatch):
+    """Test that ``*infix*`` patterns examine a bounded number of terms."""
+    monkeypatch.setattr(lexical, "MAX_UNANCHORED_SCAN", 2)
+    dictionary = TermDictionary(["alpha", "beta", "gamma", "omega"])
+
+    assert dictionary.expand("*a*") == ["alpha", "beta"]
+    assert dictionary.expand("*eg*") == []
+    assert dictionary.expand("*ga") == ["omega"]
+
+
+def test_shard_search_supports_query_syntax():
+    """Test that shard search uses the lexical engine."""
+    html = (
+        "<html><head><title>Compose up</title></head><body><main>"
+        "<h1>Compose up</h1><p>Wait for services.</p>"
+        "<pre>docker compose up --wait</pre></main></body></html>"
+    )
+    document = parse_html(html, "https://docs.docker.com/compose/up/", "docker")
+    shard = IndexShard("docker", documents=[document])
+
+    (hit,) = shard.search('code:"compose up --wait"')
+    assert hit.title == "Compose up"
+
+
+def synthetic_index(seed=7, chunks=300):
+    rng = random.Random(seed)
+    vocabulary = [f"w{n}" for n in range(120)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    index = LexicalIndex()
+    for _ in range(chunks):
+        words = rng.choices(vocabulary, weights, k=rng.randint(5, 60))
+        index.add(" ".join(words[:3]), "", " ".join(words), [" ".join(words[-4:])])
+    index.finish()
+    return index
+
+
+SYNTHETIC_QUERIES = [
+    "w1 w7 w40",
+    "w3 w90 w100 w2",
+    "w5_w6 w11",
+    "title:w0 w12 w13",
+    'w4 "w8 w9"',
+    "w1* w77",
+    "code:w2 w3",
+]
+
+
+def test_max_score_bounds_every_hit():
+    """Test that no chunk scores above the query's upper bound."""
+    index = synthetic_index()
+    for text in SYNTHETIC_QUERIES:
+        query = parse_query(text)
+        bound = index.max_score(query)
+        assert all(score <= bound + 1e-9 for _, score in index.search(query, 1000))
+
+    assert index.max_score('"w1 nosuchterm" w2') == 0.0
+
+
+def test_min_score_pruning_keeps_the_top_hits():
+    """Test that MaxScore pruning returns exactly the hits above min_score."""
+    index = synthetic_index()
+    for text in SYNTHETIC_QUERIES:
+        query = parse_query(text)
+        full = index.search(query, 1000)
+        for k in (1, 5, 20):
+            if len(full) < k:
+                continue
+            min_score = full[k - 1][1]
+            pruned = index.search(query, k, min_score)
+            assert [ordinal for ordinal, _ in pruned] == [o for o, _ in full[:k]]
+            assert [score for _, score in pruned] == pytest.approx(
+                [score for _, score in full[:k]]
+            )
+
+    assert index.search("w1 w7", 10, index.max_score("w1 w7") + 1) == []
+
+
+def test_non_essential_clauses_only_score_candidates():
+    """Test that low-bound clauses do not introduce candidates."""
+    index = build(CHUNKS)
+    query = parse_query("replicas lifecycle")
+    bounds = [index.clause_bound(clause) for clause in query.clauses]
+    min_score = min(bounds) + 0.01
+
+    essential, non_essential = index._split_essential(query.clauses, min_score)
+
+    assert len(essential) == 1 and len(non_essential) == 1
+    assert index.clause_bound(non_essential[0]) == min(bounds)
@@ -0,0 +1,75 @@
+"""Unit tests for the MCP load-testing harness."""
+
+import pytest
+
+from enterprise_mcp_docs.index import DocumentIndex
+from enterprise_mcp_docs.loadtest import (
+    LoadReport,
+    build_synthetic_corpus,
+    build_workload,
+    parse_mix,
+    percentile,
+    run_loadtest,
+)
+
+
+def test_parse_mix_normalizes_and_accepts_aliases():
+    """Test that weights are normalized and short names resolved."""
+    mix = parse_mix("search=3,list=1")
+    assert mix == {"search_documentation": 0.75, "list_available_tools": 0.25}
+
+    with pytest.raises(ValueError):
+        parse_mix("crawl=1")
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7.0], 95) == 7
+    assert percentile([], 50) == 0
+
+
+def test_synthetic_corpus_and_workload(temp_dir):
+    """Test that the synthetic corpus is saved and feeds a seeded workload."""
+    index = build_synthetic_corpus(temp_dir, documents_per_tool=5)
+    assert len(DocumentIndex.load(temp_dir).shards) == len(index.shards)
+
+    mix = parse_mix("search=1,get=1")
+    workload = build_workload(index, mix, size=50, seed=1)
+    assert workload == build_workload(index, mix, size=50, seed=1)
+    assert {name for name, _ in workload} == set(mix)
+
+    name, arguments = next(call for call in workload if call[0] == "get_documentation")
+    shard = index.shards[arguments["tool"]]
+    assert shard.find_document(arguments["topic"]) is not None
+
+
+def test_report_summary():
+    """Test throughput, error rate and per-tool percentiles."""
+    report = LoadReport(concurrency=2)
+    for ms in (10, 20, 30, 40):
+        report.record("search_documentation", ms / 1000, "ok")
+    report.record("get_documentation", 0.05, "rejected")
+    report.record("get_documentation", 0.05, "error", "boom")
+    report.duration = 2.0
+
+    data = report.to_dict()
+    assert data["throughput_rps"] == 3.0
+    assert data["error_rate"] == pytest.approx(2 / 6, abs=1e-4)
+    assert data["tools"]["search_documentation"]["p50_ms"] == 20
+    assert data["overall"]["rejected"] == 1
+    assert data["error_samples"] == ["get_documentation: boom"]
+    assert "Throughput" in report.render()
+
+
+def test_end_to_end_over_stdio():
+    """Test a short run against a spawned MCP server."""
+    report = run_loadtest(
+        {}, concurrency=2, duration=None, max_requests=20, documents_per_tool=10
+    )
+
+    data = report.to_dict()
+    assert data["overall"]["requests"] == 20
+    assert data["overall"]["errors"] == 0
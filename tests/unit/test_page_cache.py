@@ -0,0 +1,182 @@
+"""Unit tests for the raw-page cache."""
+
+import time
+
+import pytest
+
+from enterprise_mcp_docs import page_cache
+from enterprise_mcp_docs.page_cache import RawPageCache
+
+
+@pytest.fixture
+def cache(temp_dir):
+    """Create a gzip-backed page cache in a temporary directory."""
+    page_cache = RawPageCache(temp_dir / "pages", compression="gzip")
+    yield page_cache
+    page_cache.close()
+
+
+class TestRawPageCache:
+    """Test cases for RawPageCache."""
+
+    def test_put_and_get_roundtrip(self, cache):
+        """Test that stored pages come back decompressed with validators."""
+        cache.put(
+            "https://x.io/a",
+            "docker",
+            b"<html>a</html>",
+            {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        )
+
+        page = cache.get("https://x.io/a")
+
+        assert page.content == b"<html>a</html>"
+        assert page.tool == "docker"
+        assert page.validators == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }
+
+    def test_missing_page(self, cache):
+        """Test lookups for URLs that were never cached."""
+        assert cache.get("https://x.io/missing") is None
+        assert cache.lookup("https://x.io/missing") is None
+
+    def test_identical_content_shares_blob(self, cache):
+        """Test that identical pages are stored once."""
+        cache.put("https://x.io/3.11/a", "python", b"same body")
+        cache.put("https://x.io/3.12/a", "python", b"same body")
+
+        blobs = list(cache.objects_path.rglob("*.gz"))
+        assert len(blobs) == 1
+        assert cache.stats()["pages"] == 2
+
+    def test_replaced_content_releases_old_blob(self, cache):
+        """Test that updating a page removes its unreferenced old blob."""
+        cache.put("https://x.io/a", "docker", b"old")
+        cache.put("https://x.io/a", "docker", b"new")
+
+        assert len(list(cache.objects_path.rglob("*.gz"))) == 1
+        assert cache.get("https://x.io/a").content == b"new"
+
+    def test_lru_eviction(self, temp_dir):
+        """Test that the least recently used pages are evicted first."""
+        cache = RawPageCache(temp_dir / "lru", max_size_mb=0, compression="gzip")
+        cache.max_bytes = 10**9
+        for i in range(3):
+            cache.put(f"https://x.io/{i}", "docker", bytes([i]) * 1000)
+        cache.get("https://x.io/0")  # refresh page 0
+
+        cache.max_bytes = cache.total_size() - 1
+        evicted = cache.evict()
+
+        assert evicted == 1
+        assert cache.lookup("https://x.io/1") is None
+        assert cache.lookup("https://x.io/0") is not None
+        cache.close()
+
+    def test_running_total_matches_stored_blobs(self, temp_dir):
+        """Test the size total kept across puts, deletes and reopening."""
+        cache = RawPageCache(temp_dir / "total", compression="gzip")
+        cache.put("https://x.io/a", "docker", b"a" * 1000)
+        cache.put("https://x.io/b", "docker", b"a" * 1000)
+        cache.put("https://x.io/c", "docker", b"c" * 1000)
+        cache.put("https://x.io/c", "docker", b"d" * 1000)
+        cache.delete("https://x.io/a")
+
+        blobs = sum(p.stat().st_size for p in cache.objects_path.rglob("*.gz"))
+        assert cache.total_size() == blobs
+        cache.close()
+        reopened = RawPageCache(temp_dir / "total", compression="gzip")
+        assert reopened.total_size() == blobs
+        reopened.close()
+
+    def test_eviction_shrinks_below_the_cap(self, temp_dir):
+        """Test that eviction leaves headroom instead of evicting per put."""
+        cache = RawPageCache(temp_dir / "lru", max_size_mb=0, compression="gzip")
+        cache.max_bytes = 10**9
+        for i in range(20):
+            cache.put(f"https://x.io/{i}", "docker", bytes([i]) * 1000)
+        cache.max_bytes = cache.total_size() - 1
+
+        cache.put("https://x.io/new", "docker", b"new" * 300)
+
+        assert cache.total_size() <= cache.max_bytes * 0.9
+        assert cache.lookup("https://x.io/new") is not None
+        assert cache.lookup("https://x.io/0") is None
+        cache.close()
+
+    def test_eviction_skips_pinned_pages(self, temp_dir):
+        """Test that pinned pages survive eviction until they are unpinned."""
+        cache = RawPageCache(temp_dir / "lru", max_size_mb=0, compression="gzip")
+        cache.max_bytes = 10**9
+        for i in range(3):
+            cache.put(f"https://x.io/{i}", "docker", bytes([i]) * 1000)
+        cache.pin(["https://x.io/0", "https://x.io/1"])
+
+        cache.max_bytes = 1
+        assert cache.evict() == 1
+        assert cache.lookup("https://x.io/0") is not None
+        assert cache.lookup("https://x.io/2") is None
+
+        cache.put("https://x.io/3", "docker", b"3" * 1000)
+        assert cache.lookup("https://x.io/3") is not None
+
+        cache.unpin(["https://x.io/0", "https://x.io/1"])
+        assert cache.evict() == 3
+        assert cache.total_size() == 0
+        cache.close()
+
+    def test_prune_keeps_listed_urls(self, cache):
+        """Test that pruning removes only the tool's unlisted pages."""
+        cache.put("https://x.io/a", "docker", b"a")
+        cache.put("https://x.io/b", "docker", b"b")
+        cache.put("https://y.io/a", "python", b"c")
+
+        assert cache.prune("docker", {"https://x.io/a"}) == 1
+        assert cache.urls("docker") == ["https://x.io/a"]
+        assert cache.urls("python") == ["https://y.io/a"]
+
+    def test_iter_pages_by_tool(self, cache):
+        """Test iterating cached pages per tool."""
+        cache.put("https://x.io/a", "docker", b"a")
+        cache.put("https://y.io/b", "python", b"b")
+
+        assert cache.tools() == ["docker", "python"]
+        assert [p.url for p in cache.iter_pages("python")] == ["https://y.io/b"]
+
+    def test_delete_releases_blob(self, cache):
+        """Test deleting a page and listing a tool's URLs."""
+        cache.put("https://x.io/a", "docker", b"a")
+        cache.put("https://x.io/b", "docker", b"b")
+
+        assert cache.delete("https://x.io/a") is True
+        assert cache.delete("https://x.io/a") is False
+        assert cache.urls("docker") == ["https://x.io/b"]
+        assert len(list(cache.objects_path.rglob("*.gz"))) == 1
+
+    def test_delete_racing_put_keeps_shared_blob(self, cache, monkeypatch):
+        """Test that a blob released while a put is in flight is restored."""
+        cache.put("https://x.io/a", "docker", b"shared")
+
+        class RacingClock:
+            # put() reads the clock after checking for the blob and before
+            # taking the lock: delete the only other reference right there
+            @staticmethod
+            def time():
+                monkeypatch.undo()
+                cache.delete("https://x.io/a")
+                return time.time()
+
+        monkeypatch.setattr(page_cache, "time", RacingClock)
+        cache.put("https://x.io/b", "docker", b"shared")
+
+        assert cache.get("https://x.io/b").content == b"shared"
+
+    def test_sync_state_roundtrip(self, cache):
+        """Test storing a tool's delta-sync state."""
+        assert cache.sync_state("confluence") is None
+
+        cache.set_sync_state("confluence", {"cursor": 1700000000.0, "pages": 3})
+
+        assert cache.sync_state("confluence") == {"cursor": 1700000000.0, "pages": 3}
@@ -0,0 +1,275 @@
+"""Tests for the REST API providers against stand-in Confluence/TopDesk APIs."""
+
+import asyncio
+import calendar
+import time
+
+import httpx
+import pytest
+
+from enterprise_mcp_docs.crawl import DocumentationCrawler
+from enterprise_mcp_docs.fetcher import Fetcher
+from enterprise_mcp_docs.page_cache import RawPageCache
+from enterprise_mcp_docs.providers import (
+    APIError,
+    APIProvider,
+    ConfluenceProvider,
+    TopDeskProvider,
+)
+from enterprise_mcp_docs.providers.api import parse_timestamp
+
+FAST_CONFIG = {
+    "retry_attempts": 1,
+    "request_delay": 0,
+    "min_request_delay": 0,
+    "host_concurrency": 8,
+}
+
+# 2024-01-01T00:00:00Z
+EPOCH = 1704067200
+
+
+def iso(timestamp):
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(timestamp))
+
+
+class StandInAPI:
+    """In-process stand-in for a paginated REST API.
+
+    Tracks the requests it serves and how many were in flight at once.
+    """
+
+    def __init__(self, items, fail_starts=()):
+        self.items = items
+        self.fail_starts = set(fail_starts)
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+
+    def fetcher(self):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        return Fetcher(FAST_CONFIG, client=client)
+
+    async def handle(self, request):
+        self.requests.append(request)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            params = request.url.params
+            if int(params.get("start", 0)) in self.fail_starts:
+                return httpx.Response(500)
+            return httpx.Response(200, json=self.respond(params))
+        finally:
+            self.active -= 1
+
+
+class StandInConfluence(StandInAPI):
+    """Serves ``/rest/api/content/search`` with a ``totalSize``."""
+
+    def respond(self, params):
+        matching = self.items
+        cql = params["cql"]
+        if "lastmodified >= " in cql:
+            stamp = cql.split('lastmodified >= "')[1][:16]
+            since = calendar.timegm(time.strptime(stamp, "%Y/%m/%d %H:%M"))
+            matching = [
+                item
+                for item in matching
+                if parse_timestamp(item["version"]["when"]) >= since
+            ]
+        start, limit = int(params["start"]), int(params["limit"])
+        return {
+            "results": matching[start : start + limit],
+            "start": start,
+            "limit": limit,
+            "size": len(matching[start : start + limit]),
+            "totalSize": len(matching),
+        }
+
+
+class StandInTopDesk(StandInAPI):
+    """Serves ``knowledgeItems`` pages without a total."""
+
+    def respond(self, params):
+        matching = self.items
+        query = params.get("query", "")
+        if "modificationDate=ge=" in query:
+            since = parse_timestamp(query.split("modificationDate=ge=")[1][:20])
+            matching = [
+                item
+                for item in matching
+                if parse_timestamp(item["translation"]["modificationDate"]) >= since
+            ]
+        start, size = int(params["start"]), int(params["page_size"])
+        return {"item": matching[start : start + size]}
+
+
+def confluence_page(number, modified):
+    return {
+        "id": str(number),
+        "type": "page",
+        "title": f"Runbook {number}",
+        "space": {"key": "OPS", "name": "Operations"},
+        "version": {"number": 1, "when": iso(modified)},
+        "body": {"view": {"value": f"<p>Restart procedure {number}.</p>"}},
+        "_links": {"webui": f"/display/OPS/Runbook+{number}"},
+    }
+
+
+def knowledge_item(number, modified):
+    return {
+        "id": f"unid-{number}",
+        "number": f"KI {number:04d}",
+        "translation": {
+            "language": "en",
+            "modificationDate": iso(modified),
+            "content": {
+                "title": f"How to reset password {number}",
+                "description": "Self-service password reset",
+                "content": f"<p>Step {number}: open the portal.</p>",
+            },
+        },
+    }
+
+
+def confluence_config(**api):
+    settings = {"url": "https://wiki.example.com", "page_size": 100}
+    settings.update(api)
+    return {"provider": "Confluence", "api": settings}
+
+
+@pytest.fixture
+def cache(temp_dir):
+    page_cache = RawPageCache(temp_dir / "pages", compression="gzip")
+    yield page_cache
+    page_cache.close()
+
+
+async def test_full_export_fetches_remaining_pages_concurrently(cache):
+    api = StandInConfluence([confluence_page(n, EPOCH + n * 60) for n in range(450)])
+    provider = ConfluenceProvider(confluence_config(concurrency=4), api.fetcher())
+
+    stats = await provider.sync(cache)
+
+    assert stats["full"] is True
+    assert stats["seen"] == stats["fetched"] == 450
+    assert len(api.requests) == 5
+    assert api.peak == 4
+    assert len(cache.urls("confluence")) == 450
+    page = cache.get("https://wiki.example.com/display/OPS/Runbook+7")
+    assert b"<h1>Runbook 7</h1>" in page.content
+    assert cache.sync_state("confluence")["cursor"] == EPOCH + 449 * 60
+
+
+async def test_delta_sync_only_requests_changed_pages(cache):
+    items = [confluence_page(n, EPOCH + n * 60) for n in range(300)]
+    api = StandInConfluence(items)
+    provider = ConfluenceProvider(confluence_config(cursor_overlap=60), api.fetcher())
+    await provider.sync(cache)
+
+    items[10] = confluence_page(10, EPOCH + 400 * 60)
+    items[10]["body"]["view"]["value"] = "<p>Updated procedure.</p>"
+    items.append(confluence_page(300, EPOCH + 401 * 60))
+    api.requests.clear()
+    stats = await provider.sync(cache)
+
+    assert stats["full"] is False
+    assert 'lastmodified >= "2024/01/01 04:58"' in api.requests[0].url.params["cql"]
+    assert len(api.requests) == 1
+    # The last two pages of the previous sync fall inside the overlap
+    assert (stats["fetched"], stats["not_modified"]) == (2, 2)
+    page = cache.get("https://wiki.example.com/display/OPS/Runbook+10")
+    assert b"Updated procedure" in page.content
+    assert cache.sync_state("confluence")["cursor"] == EPOCH + 401 * 60
+
+
+async def test_forced_full_sync_removes_deleted_pages(cache):
+    items = [confluence_page(n, EPOCH + n) for n in range(5)]
+    api = StandInConfluence(items)
+    provider = ConfluenceProvider(confluence_config(), api.fetcher())
+    await provider.sync(cache)
+
+    del items[2]
+    stats = await provider.sync(cache, force=True)
+
+    assert stats["deleted"] == 1
+    assert stats["not_modified"] == 4
+    assert len(cache.urls("confluence")) == 4
+
+
+async def test_evicted_pages_trigger_full_sync(cache):
+    api = StandInConfluence([confluence_page(n, EPOCH + n) for n in range(5)])
+    provider = ConfluenceProvider(confluence_config(), api.fetcher())
+    await provider.sync(cache)
+
+    cache.delete("https://wiki.example.com/display/OPS/Runbook+3")
+    stats = await provider.sync(cache)
+
+    assert stats["full"] is True
+    assert stats["fetched"] == 1
+
+
+async def test_topdesk_pages_in_windows_without_total(cache):
+    api = StandInTopDesk([knowledge_item(n, EPOCH + n) for n in range(250)])
+    config = {
+        "provider": "TopDesk",
+        "api": {"url": "https://desk.example.com", "page_size": 100, "concurrency": 2},
+    }
+    provider = TopDeskProvider(config, api.fetcher())
+
+    stats = await provider.sync(cache)
+
+    assert stats["seen"] == 250
+    assert sorted(int(r.url.params["start"]) for r in api.requests) == [0, 100, 200]
+    page = cache.get(
+        "https://desk.example.com/tas/public/ssp/content/detail/knowledgeitem"
+        "?unid=unid-3"
+    )
+    assert b"Self-service password reset" in page.content
+
+    api.requests.clear()
+    await provider.sync(cache)
+    query = api.requests[0].url.params["query"]
+    assert query == "translation.modificationDate=ge=2024-01-01T00:03:09Z"
+
+
+async def test_failed_page_keeps_previous_cursor(cache):
+    api = StandInConfluence(
+        [confluence_page(n, EPOCH + n) for n in range(300)], fail_starts=[200]
+    )
+    provider = ConfluenceProvider(confluence_config(), api.fetcher())
+
+    stats = await provider.sync(cache)
+
+    assert stats["failed"] == 1
+    assert stats["seen"] == 200
+    assert cache.sync_state("confluence") is None
+
+
+async def test_unreachable_api_raises(cache):
+    api = StandInConfluence([], fail_starts=[0])
+    provider = ConfluenceProvider(confluence_config(), api.fetcher())
+
+    with pytest.raises(APIError):
+        await provider.sync(cache)
+
+
+async def test_crawler_syncs_api_tools_into_index(temp_dir, monkeypatch):
+    api = StandInConfluence([confluence_page(n, EPOCH + n) for n in range(3)])
+    monkeypatch.setattr(APIProvider, "_create_fetcher", lambda self: api.fetcher())
+    crawler = DocumentationCrawler(
+        {
+            "tools": {"confluence": dict(confluence_config(), enabled=True)},
+            "page_cache": {"path": str(temp_dir / "pages"), "compression": "gzip"},
+            "index": {"path": str(temp_dir / "index")},
+        }
+    )
+
+    result = await crawler.crawl_tool("confluence")
+
+    assert result["source"] == "api"
+    assert result["documents_processed"] == 3
+    index = crawler.update_index(["confluence"])
+    hits = index.search("restart procedure 2", ["confluence"])
+    assert hits[0].url == "https://wiki.example.com/display/OPS/Runbook+2"
@@ -0,0 +1,156 @@
+"""Unit tests for the query log and cache warm-up."""
+
+import json
+
+from enterprise_mcp_docs.index import DocumentIndex, IndexShard, parse_html
+from enterprise_mcp_docs.mcp_server import EnterpriseMCPServer
+from enterprise_mcp_docs.querylog import QueryLog, normalize_query
+
+PAGE = (
+    "<html><head><title>Compose networking</title></head><body><main>"
+    "<h1>Networking</h1><p>Compose networks connect services.</p>"
+    "</main></body></html>"
+)
+
+
+def docker_index():
+    document = parse_html(
+        PAGE, "https://docs.docker.com/compose/networking/", "docker", fetched_at=0
+    )
+    return DocumentIndex({"docker": IndexShard("docker", documents=[document])})
+
+
+def make_server(temp_dir):
+    server = EnterpriseMCPServer(
+        {
+            "cache": {"enabled": False},
+            "query_log": {"path": str(temp_dir / "queries.json"), "warm_delay": 0},
+            "resources": {"status_dir": None},
+        }
+    )
+    server.index = docker_index()
+    return server
+
+
+def test_normalize_query():
+    assert normalize_query("  Docker   Compose\tNetworking ") == (
+        "docker compose networking"
+    )
+
+
+def test_record_counts_normalized_searches(temp_dir):
+    log = QueryLog({"path": str(temp_dir / "queries.json")})
+
+    assert log.record("Compose networking", ["docker"], 10)
+    assert log.record("compose  NETWORKING", ["docker", "docker"], 10)
+    assert log.record("asyncio gather", [], 5)
+
+    assert log.top(10) == [
+        ("compose networking", ("docker",), 10),
+        ("asyncio gather", (), 5),
+    ]
+    assert log.top(10, min_count=2) == [("compose networking", ("docker",), 10)]
+
+
+def test_sensitive_and_long_queries_are_not_recorded(temp_dir):
+    log = QueryLog({"path": str(temp_dir / "queries.json"), "max_query_chars": 40})
+
+    for query in (
+        "ticket from jane.doe@example.com",
+        "error at https://intranet.example.com/wiki",
+        "cannot reach 10.0.12.7",
+        "incident 20241107",
+        "token ghp16c7e42f292c6912e7710c838347ae178b4a",
+        "x" * 41,
+        "   ",
+    ):
+        assert not log.record(query, [], 10)
+
+    assert log.top(10) == []
+    assert log.stats() == {"recorded": 0, "skipped": 7, "pending": 0}
+
+
+def test_flush_merges_counts_of_several_processes(temp_dir):
+    path = temp_dir / "data" / "queries.json"
+    first = QueryLog({"path": str(path), "max_queries": 2})
+    second = QueryLog({"path": str(path), "max_queries": 2})
+    first.record("compose networking", ["docker"], 10)
+    first.record("index mapping", [], 10)
+    for _ in range(3):
+        second.record("index mapping", [], 10)
+    second.record("asyncio gather", [], 10)
+
+    assert first.flush()
+    assert second.flush()
+    assert not second.flush()
+
+    stored = json.loads(path.read_text())
+    assert stored["version"] == 1
+    # Trimmed to the two most frequent searches
+    assert [(q["query"], q["count"]) for q in stored["queries"]] == [
+        ("index mapping", 4),
+        ("compose networking", 1),
+    ]
+    assert QueryLog({"path": str(path)}).top(1) == [("index mapping", (), 10)]
+
+
+def test_unreadable_log_is_ignored(temp_dir):
+    path = temp_dir / "queries.json"
+    path.write_text("{not json")
+    log = QueryLog({"path": str(path)})
+    log.record("compose networking", [], 10)
+
+    assert log.top(10) == [("compose networking", (), 10)]
+    assert log.flush()
+    assert json.loads(path.read_text())["queries"][0]["count"] == 1
+
+
+async def test_searches_are_logged_and_replayed_after_restart(temp_dir):
+    server = make_server(temp_dir)
+    for _ in range(2):
+        await server._search_documentation("Compose  networking", ["docker"], 5)
+    await server._search_documentation("volumes", ["docker"], 5)
+    server.query_log.flush()
+
+    restarted = make_server(temp_dir)
+    shard = restarted.index.shards["docker"]
+    assert not shard.loaded
+
+    # "volumes" was searched only once and is below warm_min_count
+    assert await restarted._warm_up(restarted.index) == 1
+    assert shard.loaded
+    assert restarted.query_log.stats()["recorded"] == 0
+
+    hits_before = restarted.cache.hits
+    await restarted._search_index("compose networking", ["docker"], 5)
+    assert restarted.cache.hits == hits_before + 1
+
+
+async def test_warm_up_stops_when_the_index_is_swapped(temp_dir):
+    server = make_server(temp_dir)
+    for query in ("compose networking", "compose services"):
+        for _ in range(2):
+            server.query_log.record(query, [], 10)
+    old_index = server.index
+    server.index = docker_index()
+
+    assert await server._warm_up(old_index) == 0
+
+
+def test_failed_flush_keeps_counts(temp_dir):
+    blocker = temp_dir / "file"
+    blocker.write_text("")
+    log = QueryLog({"path": str(blocker / "queries.json")})
+    log.record("compose networking", [], 10)
+
+    assert not log.flush()
+    assert log.pending() == {("compose networking", (), 10): 1}
+
+
+def test_top_uses_the_given_pending_copy(temp_dir):
+    log = QueryLog({"path": str(temp_dir / "queries.json")})
+    log.record("compose networking", [], 10)
+    pending = log.pending()
+    log.record("asyncio gather", [], 10)
+
+    assert log.top(10, pending=pending) == [("compose networking", (), 10)]
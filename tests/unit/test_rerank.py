@@ -0,0 +1,90 @@
+"""Unit tests for the second-stage re-ranker."""
+
+from enterprise_mcp_docs.index import SearchHit, merge_hits
+from enterprise_mcp_docs.rerank import Reranker
+
+TOOLS = {"docker": {"sections": ["compose", "engine"]}}
+
+
+def hit(title, heading="Overview", score=1.0, section=None, version=None):
+    url = f"https://docs.docker.com/{title.lower().replace(' ', '-')}/{version}/"
+    return SearchHit(
+        "docker",
+        url,
+        url + "#0",
+        url,
+        title,
+        heading,
+        "text",
+        score,
+        version=version,
+        section=section,
+    )
+
+
+def test_title_and_heading_matches_promote_candidates():
+    """Test that a chunk titled after the query overtakes a higher BM25 score."""
+    reranker = Reranker({}, TOOLS)
+    hits = [
+        hit("Engine overview", score=10.0),
+        hit("Compose networking", "Networking in Compose", score=8.0),
+    ]
+
+    ranked, completed = reranker.rerank("compose networking", hits)
+
+    assert completed is True
+    assert [h.title for h in ranked] == ["Compose networking", "Engine overview"]
+
+
+def test_section_priority_and_version_recency():
+    """Test the section and recency features on otherwise equal hits."""
+    reranker = Reranker({}, TOOLS)
+    section_hits = [hit("A", section="engine"), hit("B", section="compose")]
+    ranked, _ = reranker.rerank("volumes", section_hits)
+    assert [h.title for h in ranked] == ["B", "A"]
+
+    version_hits = [hit("Build", version="v24"), hit("Build", version="v25")]
+    ranked, _ = reranker.rerank("volumes", version_hits)
+    assert ranked[0].version == "v25"
+
+
+def test_only_top_candidates_are_reranked():
+    """Test that hits beyond the candidate budget are never promoted."""
+    reranker = Reranker({"candidates": 2}, TOOLS)
+    hits = [hit("One", score=3.0), hit("Two", score=2.0), hit("Compose", score=1.0)]
+
+    ranked, _ = reranker.rerank("compose", hits)
+
+    assert [h.title for h in ranked] == ["One", "Two", "Compose"]
+    assert reranker.pool_size(1) == 2
+
+
+def test_budget_exhausted_falls_back_to_first_stage_order():
+    """Test graceful fallback when the time budget is exceeded."""
+    reranker = Reranker({"budget_ms": -1}, TOOLS)
+    hits = [hit("Engine", score=2.0), hit("Compose", score=1.0)]
+
+    ranked, completed = reranker.rerank("compose", hits)
+
+    assert completed is False
+    assert ranked == hits
+    assert reranker.fallbacks == 1
+
+
+def test_disabled_keeps_order():
+    """Test that a disabled re-ranker leaves hits alone."""
+    reranker = Reranker({"enabled": False}, TOOLS)
+    hits = [hit("Engine", score=2.0), hit("Compose", score=1.0)]
+
+    assert reranker.rerank("compose", hits) == (hits, False)
+    assert reranker.pool_size(5) == 5
+
+
+def test_rerank_runs_before_near_duplicate_collapse():
+    """Test merge_hits applies the re-ranker before collapsing to the limit."""
+    reranker = Reranker({}, TOOLS)
+    hits = [hit("Engine overview", score=10.0), hit("Compose", score=9.0)]
+
+    merged = merge_hits(hits, 1, lambda ranked: reranker.rerank("compose", ranked)[0])
+
+    assert [h.title for h in merged] == ["Compose"]
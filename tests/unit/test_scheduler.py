@@ -0,0 +1,113 @@
+"""Tests for the background crawl scheduler."""
+
+import asyncio
+import json
+import time
+
+from enterprise_mcp_docs.scheduler import CrawlScheduler
+
+
+class FakeCrawler:
+    """Records crawls and tracks how many run at once."""
+
+    def __init__(self, index_path, tools, fail=()):
+        self.index_path = str(index_path)
+        self.tools = tools
+        self.fail = set(fail)
+        self.crawled = []
+        self.indexed = []
+        self.active = 0
+        self.peak = 0
+
+    def enabled_tools(self):
+        return list(self.tools)
+
+    async def crawl_tool(self, tool_name, update_index=True):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+        self.crawled.append(tool_name)
+        if tool_name in self.fail:
+            raise RuntimeError("site down")
+        return {"tool": tool_name, "status": "crawled", "pages_found": 1}
+
+    def update_index(self, tools):
+        self.indexed.extend(tools)
+
+
+def make_config(**scheduler):
+    settings = {"jitter": 0.1, "startup_delay": 0, "nice": 0}
+    settings.update(scheduler)
+    return {
+        "tools": {
+            "elasticsearch": {"cache_ttl": 3600},
+            "nessus": {"cache_ttl": 86400},
+            "docker": {},
+        },
+        "scheduler": settings,
+    }
+
+
+def write_manifest(path, tools):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "manifest.json").write_text(json.dumps({"format": 1, "tools": tools}))
+
+
+def test_ttl_per_tool(temp_dir):
+    crawler = FakeCrawler(temp_dir, [])
+    scheduler = CrawlScheduler(make_config(default_ttl=600), crawler)
+
+    assert scheduler.ttl("elasticsearch") == 3600
+    assert scheduler.ttl("nessus") == 86400
+    assert scheduler.ttl("docker") == 600
+
+
+def test_plan_uses_last_crawl_and_jitter(temp_dir):
+    now = time.time()
+    write_manifest(temp_dir, {"elasticsearch": {"last_crawled": now - 600}})
+    crawler = FakeCrawler(temp_dir, ["elasticsearch", "nessus"])
+    scheduler = CrawlScheduler(make_config(startup_delay=300), crawler)
+
+    plan = scheduler.plan(now)
+
+    assert now - 600 + 3240 <= plan["elasticsearch"] <= now - 600 + 3960
+    # Never crawled: spread over the start-up window
+    assert now <= plan["nessus"] <= now + 300
+
+
+async def test_run_refreshes_due_tools_within_cap(temp_dir):
+    tools = ["elasticsearch", "nessus", "docker"]
+    crawler = FakeCrawler(temp_dir, tools, fail=["docker"])
+    scheduler = CrawlScheduler(
+        make_config(max_concurrent_crawls=2, failure_retry=60), crawler
+    )
+    scheduler.plan()
+
+    task = asyncio.create_task(scheduler.run())
+    while len(scheduler.last_result) < len(tools):
+        await asyncio.sleep(0.01)
+    scheduler._stopping = True
+    scheduler._wakeup.set()
+    await task
+
+    assert sorted(crawler.crawled) == sorted(tools)
+    assert crawler.peak == 2
+    assert sorted(crawler.indexed) == ["elasticsearch", "nessus"]
+
+    status = scheduler.status()
+    assert status["docker"]["last_status"] == "error"
+    assert status["docker"]["next_refresh_in"] <= 66
+    assert 3240 <= status["elasticsearch"]["next_refresh_in"] <= 3960
+
+
+def test_start_and_stop_thread(temp_dir):
+    crawler = FakeCrawler(temp_dir, ["elasticsearch"])
+    scheduler = CrawlScheduler(make_config(startup_delay=3600), crawler)
+
+    scheduler.start()
+    assert scheduler._thread.is_alive()
+    scheduler.stop(timeout=5)
+
+    assert not scheduler._thread.is_alive()
+    assert crawler.crawled == []
@@ -0,0 +1,94 @@
+"""Unit tests for synonym expansion and the lite search mode."""
+
+import json
+import subprocess
+import sys
+
+from enterprise_mcp_docs.index import IndexShard, parse_html
+from enterprise_mcp_docs.lexical import parse_query
+from enterprise_mcp_docs.synonyms import SynonymExpander
+
+KUBERNETES_PAGE = b"""<html><head><title>Deploying on Kubernetes</title></head>
+<body><main><h1>Deploying on Kubernetes</h1>
+<p>Run the operator in your Kubernetes cluster with a Helm chart.</p>
+</main></body></html>"""
+
+SWARM_PAGE = b"""<html><head><title>Swarm mode</title></head>
+<body><main><h1>Swarm mode</h1>
+<p>Deploy services to a swarm cluster of Docker engines.</p>
+</main></body></html>"""
+
+
+def make_shard():
+    return IndexShard(
+        "docker",
+        documents=[
+            parse_html(KUBERNETES_PAGE, "https://docs.docker.com/k8s/", "docker"),
+            parse_html(SWARM_PAGE, "https://docs.docker.com/swarm/", "docker"),
+        ],
+    )
+
+
+def test_expand_adds_boosted_optional_clauses():
+    expander = SynonymExpander(
+        [["k8s", "kubernetes"], ["env var", "environment variable"]]
+    )
+
+    query = expander.parse("k8s var")
+
+    expanded = {tuple(clause.terms): clause for clause in query.clauses}
+    assert expanded[("k8s",)].boost == 1.0
+    assert expanded[("kubernetes",)].boost == 0.5
+    assert not expanded[("kubernetes",)].required
+
+
+def test_multiword_synonyms_become_phrases():
+    expander = SynonymExpander([["vm", "virtual machine"]])
+
+    added = expander.parse("vm backup").clauses[2:]
+
+    assert [(clause.kind, clause.terms) for clause in added] == [
+        ("phrase", ["virtual", "machine"])
+    ]
+
+
+def test_required_fielded_and_quoted_clauses_are_literal():
+    expander = SynonymExpander([["k8s", "kubernetes"]])
+    query = parse_query('title:k8s "k8s cluster" k8s*')
+
+    assert expander.expand(query) is query
+
+
+def test_from_config_merges_groups_and_file(temp_dir):
+    path = temp_dir / "synonyms.json"
+    path.write_text(json.dumps([["pve", "proxmox"]]))
+
+    expander = SynonymExpander.from_config(
+        {"synonyms": [["kb", "knowledge"]], "synonyms_file": str(path)}
+    )
+
+    assert expander.synonyms("pve") == [["proxmox"]]
+    assert expander.synonyms("kb") == [["knowledge"]]
+    assert expander.synonyms("k8s") == [["kubernetes"]]
+    assert expander.fingerprint != SynonymExpander.from_config().fingerprint
+
+
+def test_expanded_query_finds_synonym_only_matches():
+    shard = make_shard()
+    expander = SynonymExpander([["k8s", "kubernetes"]])
+
+    assert shard.search("k8s") == []
+    hits = shard.search(expander.parse("k8s cluster"))
+    assert [hit.title for hit in hits] == ["Deploying on Kubernetes", "Swarm mode"]
+
+
+def test_lite_mode_loads_no_embedding_model():
+    code = (
+        "import sys\n"
+        "from enterprise_mcp_docs.mcp_server import EnterpriseMCPServer\n"
+        "server = EnterpriseMCPServer({'search': {'mode': 'lite'}})\n"
+        "assert server.search_mode == 'lite' and server.vector is None\n"
+        "heavy = {'torch', 'sentence_transformers', 'chromadb'} & set(sys.modules)\n"
+        "assert not heavy, heavy\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,137 @@
+"""Unit tests for the block-compressed text store."""
+
+import gzip
+import json
+
+import pytest
+
+from enterprise_mcp_docs import textstore
+from enterprise_mcp_docs.index import DocumentIndex, IndexShard, parse_html
+from enterprise_mcp_docs.textstore import TextStore
+
+TEXTS = [
+    f"Section {n}\nParameters\nThe compose file defines service {n} and its networks."
+    for n in range(200)
+]
+
+
+def test_round_trip_and_block_offsets(monkeypatch):
+    """Test that every text survives serialization and blocks are bounded."""
+    monkeypatch.setattr(textstore, "BLOCK_SIZE", 1024)
+    store = TextStore.build(TEXTS, codec="zlib")
+
+    loaded = TextStore.from_bytes(store.to_bytes())
+
+    assert len(loaded) == len(TEXTS)
+    assert len(loaded.blocks) > 1
+    assert [loaded.get(ref) for ref in range(len(TEXTS))] == TEXTS
+    assert loaded.stats()["compressed_bytes"] < sum(len(t) for t in TEXTS)
+
+
+@pytest.mark.skipif(textstore.zstandard is None, reason="zstandard not installed")
+def test_zstd_with_trained_dictionary():
+    """Test the zstd codec round trip."""
+    store = TextStore.from_bytes(TextStore.build(TEXTS, codec="zstd").to_bytes())
+    assert store.codec == "zstd"
+    assert store.get(7) == TEXTS[7]
+
+
+def test_only_referenced_blocks_are_decompressed(monkeypatch):
+    """Test on-demand decompression and the bounded LRU of hot blocks."""
+    monkeypatch.setattr(textstore, "BLOCK_SIZE", 512)
+    store = TextStore.from_bytes(TextStore.build(TEXTS, codec="zlib").to_bytes(), 2)
+
+    store.get(0)
+    store.get(1)
+    assert store.misses == 1
+    assert store.hits == 1
+
+    store.get(len(TEXTS) // 2)
+    store.get(len(TEXTS) - 1)
+    assert store.stats()["cached_blocks"] == 2
+    store.get(0)
+    assert store.misses == 4
+
+
+def test_not_a_store():
+    with pytest.raises(ValueError):
+        TextStore.from_bytes(b"not a text store")
+
+
+def page(title):
+    return (
+        f"<html><head><title>{title}</title></head><body><main>"
+        f"<h1>{title}</h1><p>{title} connects services over networks.</p>"
+        "</main></body></html>"
+    )
+
+
+def test_index_reads_chunk_text_lazily(temp_dir):
+    """Test that a loaded index keeps text compressed until it is read."""
+    index_path = temp_dir / "index"
+    documents = [
+        parse_html(page(f"Compose networking {n}"), f"https://d.io/{n}/", "docker")
+        for n in range(20)
+    ]
+    DocumentIndex({"docker": IndexShard("docker", documents)}).save(index_path)
+    text_file = DocumentIndex.read_manifest(index_path)["tools"]["docker"]["text_file"]
+    assert (index_path / text_file).exists()
+
+    shard = DocumentIndex.load(index_path).shards["docker"]
+    assert shard.texts.misses == 0
+
+    (hit,) = shard.search("networking 7", limit=1)
+    shard.texts.misses = 0
+    data = hit.to_dict(include_text=False)
+    assert "text" not in data
+    assert shard.texts.misses == 0
+
+    rebuilt = shard.hit_from_dict(data)
+    assert rebuilt.text == "Compose networking 7 connects services over networks."
+    assert shard.texts.misses == 1
+
+
+def test_loads_format_1_index_with_inline_text(temp_dir):
+    """Test that indexes saved before the text store still load."""
+    document = parse_html(page("Volumes"), "https://d.io/volumes/", "docker")
+    shard = IndexShard("docker", [document])
+    (temp_dir / "shards").mkdir()
+    (temp_dir / "shards" / "docker.json.gz").write_bytes(
+        gzip.compress(json.dumps(shard.to_dict()).encode("utf-8"))
+    )
+    manifest = {"format": 1, "tools": {"docker": {"file": "shards/docker.json.gz"}}}
+    (temp_dir / "manifest.json").write_text(json.dumps(manifest))
+
+    loaded = DocumentIndex.load(temp_dir).shards["docker"]
+
+    assert loaded.texts is None
+    assert loaded.search("volumes")[0].text.startswith("Volumes")
+
+
+def test_saved_index_records_its_portable_codec(temp_dir):
+    """Test that indexes default to zlib and the manifest names the codec."""
+    index_path = temp_dir / "index"
+    documents = [parse_html(page("Compose"), "https://d.io/compose/", "docker")]
+    DocumentIndex({"docker": IndexShard("docker", documents)}).save(index_path)
+
+    manifest = DocumentIndex.read_manifest(index_path)
+    assert manifest["tools"]["docker"]["text_codec"] == "zlib"
+
+    # Older manifests: the codec is read from the store header
+    del manifest["tools"]["docker"]["text_codec"]
+    assert DocumentIndex.text_codecs(index_path, manifest) == {"docker": "zlib"}
+
+
+def test_load_rejects_unreadable_codec(temp_dir, monkeypatch):
+    """Test that a zstd index fails clearly where zstandard is missing."""
+    index_path = temp_dir / "index"
+    documents = [parse_html(page("Compose"), "https://d.io/compose/", "docker")]
+    DocumentIndex({"docker": IndexShard("docker", documents)}).save(index_path)
+    manifest_path = index_path / "manifest.json"
+    manifest = json.loads(manifest_path.read_text())
+    manifest["tools"]["docker"]["text_codec"] = "zstd"
+    manifest_path.write_text(json.dumps(manifest))
+    monkeypatch.setattr(textstore, "zstandard", None)
+
+    with pytest.raises(ValueError, match="docker use the text codec zstd"):
+        DocumentIndex.load(index_path)
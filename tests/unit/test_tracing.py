@@ -0,0 +1,116 @@
+"""Unit tests for request tracing."""
+
+import json
+import time
+
+import pytest
+
+from enterprise_mcp_docs.tracing import JsonLinesExporter, Tracer, summarize_arguments
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_spans_export_as_otel_json_lines(temp_dir):
+    """Test that a trace exports one OpenTelemetry-style record per span."""
+    tracer = Tracer({"export_path": temp_dir / "traces.jsonl"})
+
+    with tracer.trace("tools/call", **{"mcp.tool": "search_documentation"}) as root:
+        with tracer.span("cache.lookup", keys=2):
+            pass
+        with tracer.span("search.lexical"):
+            with tracer.span("shard"):
+                pass
+    tracer.close()
+
+    records = read_lines(temp_dir / "traces.jsonl")
+    by_name = {record["name"]: record for record in records}
+
+    assert set(by_name) == {"tools/call", "cache.lookup", "search.lexical", "shard"}
+    assert {record["traceId"] for record in records} == {root.trace_id}
+    assert by_name["shard"]["parentSpanId"] == by_name["search.lexical"]["spanId"]
+    assert by_name["tools/call"]["parentSpanId"] == ""
+    assert by_name["cache.lookup"]["attributes"] == [
+        {"key": "keys", "value": {"intValue": "2"}}
+    ]
+    assert by_name["tools/call"]["status"] == {"code": 1}
+
+
+def test_slow_queries_are_logged_with_stages(temp_dir, caplog):
+    """Test the slow-query log and its per-stage breakdown."""
+    tracer = Tracer({"slow_query_ms": 5, "slow_query_log": temp_dir / "slow.jsonl"})
+
+    with tracer.trace("tools/call", **{"mcp.tool": "get_documentation"}):
+        with tracer.span("render"):
+            time.sleep(0.01)
+    with tracer.trace("tools/call", **{"mcp.tool": "list_available_tools"}):
+        pass
+    tracer.close()
+
+    (record,) = read_lines(temp_dir / "slow.jsonl")
+    assert record["attributes"] == {"mcp.tool": "get_documentation"}
+    assert record["stages"]["render"] >= 10
+    assert "Slow tools/call" in caplog.text
+
+
+def test_errors_mark_span_status(temp_dir):
+    """Test that exceptions are recorded on the span and re-raised."""
+    tracer = Tracer({"export_path": temp_dir / "traces.jsonl"})
+
+    with pytest.raises(KeyError):
+        with tracer.trace("tools/call"):
+            with tracer.span("search.lexical"):
+                raise KeyError("query")
+    tracer.close()
+
+    statuses = [r["status"] for r in read_lines(temp_dir / "traces.jsonl")]
+    assert all(status["code"] == 2 for status in statuses)
+
+
+def test_traces_record_argument_shapes_not_contents(temp_dir):
+    """Test that query text never reaches the exports, only its length."""
+    tracer = Tracer(
+        {
+            "slow_query_ms": 0,
+            "export_path": temp_dir / "traces.jsonl",
+            "slow_query_log": temp_dir / "slow.jsonl",
+        }
+    )
+    arguments = {"query": "password reset for alice", "tools": ["git"], "limit": 5}
+
+    with tracer.trace("tools/call", **summarize_arguments(arguments)):
+        pass
+    tracer.close()
+
+    for name in ("traces.jsonl", "slow.jsonl"):
+        assert "alice" not in (temp_dir / name).read_text()
+    (record,) = read_lines(temp_dir / "slow.jsonl")
+    assert record["attributes"]["mcp.argument_keys"] == ["limit", "query", "tools"]
+    assert record["attributes"]["mcp.arguments.query.length"] == 24
+    assert record["attributes"]["mcp.arguments.tools.count"] == 1
+    assert record["attributes"]["mcp.arguments.limit"] == 5
+
+
+def test_exporter_writes_from_a_background_thread(temp_dir):
+    """Test that writes are queued, bounded and written on close."""
+    exporter = JsonLinesExporter(
+        temp_dir / "spans.jsonl", flush_interval=60, max_pending=2
+    )
+
+    exporter.write([{"n": 1}, {"n": 2}, {"n": 3}])
+    assert not (temp_dir / "spans.jsonl").exists()
+    exporter.close()
+
+    assert read_lines(temp_dir / "spans.jsonl") == [{"n": 1}, {"n": 2}]
+    assert exporter.dropped == 1
+
+
+def test_disabled_tracer_is_a_no_op():
+    """Test that spans outside an enabled trace yield None."""
+    tracer = Tracer({"enabled": False})
+
+    with tracer.trace("tools/call") as root:
+        with tracer.span("render") as span:
+            assert root is None and span is None
+    assert Tracer.current_span() is None
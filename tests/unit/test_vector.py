@@ -0,0 +1,66 @@
+"""Unit tests for embedding-based rank fusion."""
+
+import sys
+
+from enterprise_mcp_docs.index import SearchHit
+from enterprise_mcp_docs.mcp_server import EnterpriseMCPServer
+from enterprise_mcp_docs.vector import VectorScorer
+
+
+class FakeModel:
+    """Embeds text as normalized counts of a few keywords."""
+
+    KEYWORDS = ("kubernetes", "swarm", "volume")
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, normalize_embeddings=True):
+        self.encoded.extend(texts)
+        vectors = []
+        for text in texts:
+            vector = [text.lower().count(word) for word in self.KEYWORDS]
+            norm = sum(value * value for value in vector) ** 0.5 or 1.0
+            vectors.append([value / norm for value in vector])
+        return vectors
+
+
+def hit(title, text, score):
+    url = f"https://docs.docker.com/{title.lower()}/"
+    return SearchHit("docker", url, url + "#0", url, title, title, text, score)
+
+
+def test_fuse_promotes_semantically_close_candidates():
+    scorer = VectorScorer(FakeModel(), candidates=3)
+    hits = [
+        hit("Swarm", "swarm", 3.0),
+        hit("Kubernetes", "kubernetes", 2.0),
+        hit("Volumes", "kubernetes volume", 1.9),
+        hit("Other", "kubernetes", 0.1),
+    ]
+
+    fused = scorer.fuse("kubernetes", hits)
+
+    assert [h.title for h in fused] == ["Kubernetes", "Swarm", "Volumes", "Other"]
+    # Hits beyond the candidates stay below all candidates
+    assert fused[-1].score < min(h.score for h in fused[:3])
+
+
+def test_candidate_embeddings_are_cached():
+    model = FakeModel()
+    scorer = VectorScorer(model, candidates=2)
+
+    scorer.fuse("swarm", [hit("Swarm", "swarm", 1.0), hit("Volumes", "volume", 0.5)])
+    scorer.fuse("volume", [hit("Swarm", "swarm", 1.0), hit("Volumes", "volume", 0.5)])
+
+    assert model.encoded.count("Swarm\nswarm") == 1
+    assert scorer.stats()["cached_embeddings"] == 2
+
+
+def test_hybrid_mode_falls_back_to_lite_without_model(monkeypatch):
+    monkeypatch.setitem(sys.modules, "sentence_transformers", None)
+
+    server = EnterpriseMCPServer({"search": {"mode": "hybrid"}})
+
+    assert server.vector is None
+    assert server.search_mode == "lite"